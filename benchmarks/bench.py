@@ -0,0 +1,405 @@
+"""
+Benchmark-Suite für Solver und Befehls-Pipeline.
+
+Läuft ohne Home Assistant gegen FakeHass (siehe fake_hass.py) mit
+synthetischen Gruppen von 2 bis 200 Lampen und typischen
+Helligkeitsverteilungen. Gemessen werden:
+
+  * calculate_new_brightness (ein Schritt für eine Lampe)
+  * adjust_brightness_until_match pro Solver (ops/s, Iterationen bis zur
+    Konvergenz, Restabweichung, Speicher-Peak)
+  * der komplette async_turn_on-Pfad inkl. Scheduler, Helligkeits-Cache,
+    Filter, Bündelung und Rate-Limiter (Befehle/s, Service-Calls,
+    adressierte Lampen, Gruppen-Schreibvorgänge)
+
+Das Ergebnis wird als JSON gespeichert; mit --compare wird gegen einen
+früheren Lauf verglichen (Exit-Code 1 bei Regressionen).
+
+    python benchmarks/bench.py
+    python benchmarks/bench.py --quick --output /tmp/neu.json --compare /tmp/alt.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import fake_hass
+from fake_hass import DOMAIN, FakeHass
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SIZES = (2, 5, 10, 25, 50, 100, 200)
+QUICK_SIZES = (5, 50, 200)
+SOLVERS = ("iterative", "scaling")
+# Zielhelligkeiten für die Solver-Messung (255 ist ein Sonderfall ohne Rechnung)
+TARGETS = (5, 40, 96, 128, 180, 240)
+# Ziel für die Speicher-Messung (tracemalloc bremst stark, daher nur ein Lauf)
+ALLOC_TARGET = 128
+# Slider-Fahrt für den Pipeline-Durchlauf: hoch und wieder runter
+DRAG = (20, 60, 100, 140, 180, 220, 240, 200, 150, 90, 30)
+# Befehle der Slider-Fahrt, die für die Speicher-Messung laufen
+ALLOC_COMMANDS = 3
+
+# Kennzahlen für --compare: (Name, True = größer ist besser)
+COMPARED_METRICS = (
+    ("ops_per_sec", True),
+    ("commands_per_sec", True),
+    ("iterations_mean", False),
+    ("alloc_peak_kib", False),
+    ("service_calls_per_command", False),
+    ("targets_per_command", False),
+    ("group_writes_per_command", False),
+)
+
+
+# ----------------------------------------------------------
+#   Helligkeitsverteilungen
+# ----------------------------------------------------------
+def _uniform(rng, count):
+    """Unabhängige Werte 1..255 (schlechtester Fall: jede Lampe eigene Teilgruppe)."""
+    return [rng.randint(1, 255) for _ in range(count)]
+
+
+def _scene(rng, count):
+    """2–4 Szenenwerte, alle Lampen einer Szene gleich hell (typische Hue-Szene)."""
+    levels = rng.sample(range(20, 255), rng.randint(2, 4))
+    return [rng.choice(levels) for _ in range(count)]
+
+
+def _partial(rng, count):
+    """Wie _scene, aber etwa ein Viertel der Lampen ist aus."""
+    values = [0 if rng.random() < 0.25 else value for value in _scene(rng, count)]
+    if not any(values):
+        values[0] = 128
+    return values
+
+
+def _night(rng, count):
+    """Überwiegend dunkle Lampen mit wenigen hellen Ausreißern."""
+    return [max(1, int(255 * rng.random() ** 3)) for _ in range(count)]
+
+
+DISTRIBUTIONS = {
+    "uniform": _uniform,
+    "scene": _scene,
+    "partial": _partial,
+    "night": _night,
+}
+
+
+# ----------------------------------------------------------
+#   Hilfsfunktionen
+# ----------------------------------------------------------
+async def _async_new_hass(brightnesses, **settings):
+    """FakeHass mit eingerichteter Integration, Lampen und einer Gruppe."""
+    hass = FakeHass()
+    await fake_hass.async_setup_integration(hass, **settings)
+    fake_hass.register_instant_lights(hass)
+    entity_ids = fake_hass.add_lamps(hass, brightnesses)
+    group = await fake_hass.async_add_group(hass, "Bench", entity_ids)
+    return hass, group, entity_ids
+
+
+async def _async_teardown(hass, group):
+    await group.async_remove()
+    hass.data[DOMAIN]["cache_expiry"].async_shutdown()
+    hass.data[DOMAIN]["limiter"].cancel()
+    hass.data[DOMAIN]["state_dispatcher"].async_shutdown()
+
+
+async def _async_timed(run, min_time):
+    """Führt run() so oft aus, bis min_time verstrichen ist; liefert (Läufe, Sekunden)."""
+    rounds = 0
+    started = time.perf_counter()
+    while True:
+        await run()
+        rounds += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return rounds, elapsed
+
+
+def _active_mean(brightnesses):
+    active = [value for value in brightnesses.values() if value > 0]
+    return sum(active) / len(active) if active else 0.0
+
+
+def _mean(result):
+    """Gruppenhelligkeit wie im Solver: Mittel über alle anfangs aktiven Lampen."""
+    return sum(result.values()) / len(result) if result else 0.0
+
+
+# ----------------------------------------------------------
+#   Solver
+# ----------------------------------------------------------
+async def async_bench_calculate(size, distribution, brightnesses, min_time):
+    hass, group, entity_ids = await _async_new_hass(brightnesses)
+    lamps = {entity_id: float(value) for entity_id, value in zip(entity_ids, brightnesses)}
+    lamp_id = next(entity_id for entity_id, value in lamps.items() if value > 0)
+    old_group = _active_mean(lamps)
+
+    async def run():
+        for target in TARGETS:
+            group.calculate_new_brightness(old_group, target, lamps[lamp_id], lamps, lamp_id)
+
+    rounds, elapsed = await _async_timed(run, min_time)
+    await _async_teardown(hass, group)
+    return {
+        "name": f"calculate_new_brightness/{distribution}/{size}",
+        "benchmark": "calculate_new_brightness",
+        "distribution": distribution,
+        "lamps": size,
+        "ops_per_sec": round(rounds * len(TARGETS) / elapsed, 1),
+    }
+
+
+async def async_bench_solver(size, distribution, brightnesses, solver, min_time):
+    hass, group, entity_ids = await _async_new_hass(brightnesses, solver=solver)
+    lamps = dict(zip(entity_ids, brightnesses))
+    # Iterationen und Restabweichung pro Ziel (aus dem ersten Lauf)
+    iterations = {}
+    deviations = {}
+
+    async def run():
+        for target in TARGETS:
+            result = await group.adjust_brightness_until_match(dict(lamps), target)
+            if target not in iterations:
+                iterations[target] = group._last_solve_iterations
+                deviations[target] = abs(_mean(result) - target)
+
+    rounds, elapsed = await _async_timed(run, min_time)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        await group.adjust_brightness_until_match(dict(lamps), ALLOC_TARGET)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    await _async_teardown(hass, group)
+    return {
+        "name": f"solver/{solver}/{distribution}/{size}",
+        "benchmark": "adjust_brightness_until_match",
+        "solver": solver,
+        "distribution": distribution,
+        "lamps": size,
+        "ops_per_sec": round(rounds * len(TARGETS) / elapsed, 1),
+        "iterations_mean": round(sum(iterations.values()) / len(iterations), 2),
+        "iterations_max": max(iterations.values()),
+        "deviation_max": round(max(deviations.values()), 3),
+        "alloc_peak_kib": round(peak / 1024, 2),
+    }
+
+
+# ----------------------------------------------------------
+#   async_turn_on-Pfad
+# ----------------------------------------------------------
+async def _async_drag(hass, group, iterations, steps=DRAG):
+    """Fährt den Slider einmal ab; sammelt die Solver-Iterationen pro Befehl."""
+    for brightness in steps:
+        await group.async_turn_on(brightness=brightness)
+        await hass.async_block_till_done()
+        iterations.append(group._last_solve_iterations)
+
+
+async def async_bench_pipeline(size, distribution, brightnesses, solver, repeats):
+    elapsed = 0.0
+    iterations = []
+    peak = 0
+    counters = {"calls": 0, "targets": 0, "group_writes": 0}
+    solver_cache = {}
+    for repeat in range(repeats + 1):
+        hass, group, _ = await _async_new_hass(brightnesses, solver=solver)
+        writes = []
+        hass.bus.async_track_state(group.entity_id, writes.append)
+        hass.services.reset_counters()
+
+        if repeat == 0:
+            # Erster Durchlauf nur für den Speicher-Peak (tracemalloc bremst stark)
+            tracemalloc.start()
+            try:
+                await _async_drag(hass, group, [], DRAG[:ALLOC_COMMANDS])
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        else:
+            started = time.perf_counter()
+            await _async_drag(hass, group, iterations)
+            elapsed += time.perf_counter() - started
+            counters["calls"] += sum(hass.services.calls.values())
+            counters["targets"] += sum(hass.services.targets.values())
+            counters["group_writes"] += len(writes)
+            solver_cache = hass.data[DOMAIN]["solver_cache"].stats()
+        await _async_teardown(hass, group)
+
+    commands = len(DRAG) * repeats
+    return {
+        "name": f"turn_on/{solver}/{distribution}/{size}",
+        "benchmark": "async_turn_on",
+        "solver": solver,
+        "distribution": distribution,
+        "lamps": size,
+        "commands": commands,
+        "commands_per_sec": round(commands / elapsed, 1),
+        "ms_per_command": round(elapsed / commands * 1000, 3),
+        "iterations_mean": round(sum(iterations) / len(iterations), 2),
+        "service_calls_per_command": round(counters["calls"] / commands, 2),
+        "targets_per_command": round(counters["targets"] / commands, 2),
+        "group_writes_per_command": round(counters["group_writes"] / commands, 2),
+        "solver_cache": solver_cache,
+        "alloc_peak_kib": round(peak / 1024, 2),
+    }
+
+
+# ----------------------------------------------------------
+#   Ablauf, Ausgabe, Vergleich
+# ----------------------------------------------------------
+async def async_run(args):
+    results = []
+    for size in args.sizes:
+        for distribution in args.distributions:
+            # Pro Größe/Verteilung fester Seed => vergleichbare Läufe
+            rng = random.Random(f"{args.seed}/{distribution}/{size}")
+            brightnesses = DISTRIBUTIONS[distribution](rng, size)
+            rows = [await async_bench_calculate(size, distribution, brightnesses, args.min_time)]
+            for solver in args.solvers:
+                rows.append(
+                    await async_bench_solver(size, distribution, brightnesses, solver, args.min_time)
+                )
+                rows.append(
+                    await async_bench_pipeline(size, distribution, brightnesses, solver, args.repeats)
+                )
+            for row in rows:
+                _print_row(row)
+            results.extend(rows)
+    return results
+
+
+def _print_row(row):
+    if row["benchmark"] == "async_turn_on":
+        detail = (
+            f"{row['commands_per_sec']:>10.1f} cmd/s  {row['iterations_mean']:>6.1f} it  "
+            f"{row['service_calls_per_command']:>5.2f} calls  {row['targets_per_command']:>6.2f} lamps  "
+            f"{row['alloc_peak_kib']:>8.1f} KiB"
+        )
+    elif row["benchmark"] == "adjust_brightness_until_match":
+        detail = (
+            f"{row['ops_per_sec']:>10.1f} op/s   {row['iterations_mean']:>6.1f} it  "
+            f"max dev {row['deviation_max']:.3f}  {row['alloc_peak_kib']:>8.1f} KiB"
+        )
+    else:
+        detail = f"{row['ops_per_sec']:>10.1f} op/s"
+    print(f"{row['name']:<42} {detail}", flush=True)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=fake_hass.REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """Vergleicht zwei Läufe; liefert die Liste der Regressionen."""
+    previous = {row["name"]: row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get(row["name"])
+        if old is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            if metric not in row or metric not in old or not old[metric]:
+                continue
+            change = (row[metric] - old[metric]) / old[metric]
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append((row["name"], metric, old[metric], row[metric], change))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=None, help="Gruppengrößen")
+    parser.add_argument(
+        "--distributions", nargs="+", choices=sorted(DISTRIBUTIONS), default=list(DISTRIBUTIONS)
+    )
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    parser.add_argument("--min-time", type=float, default=0.5, help="Sekunden pro Messung")
+    parser.add_argument("--repeats", type=int, default=3, help="Slider-Fahrten pro Pipeline-Messung")
+    parser.add_argument("--seed", default="light_group_dimmer")
+    parser.add_argument("--quick", action="store_true", help="wenige Größen, kurze Messungen")
+    parser.add_argument("--output", type=Path, help="JSON-Datei (Standard: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="früherer Lauf (JSON) zum Vergleich")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="erlaubte Verschlechterung (0.15 = 15 %%)"
+    )
+    args = parser.parse_args(argv)
+    if args.sizes is None:
+        args.sizes = list(QUICK_SIZES if args.quick else SIZES)
+    if args.quick:
+        args.min_time = min(args.min_time, 0.1)
+        args.repeats = min(args.repeats, 1)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Warnungen des Solvers (ausgereizte Iterationen) landen in den Kennzahlen
+    logging.basicConfig(level=logging.ERROR)
+    fake_hass.load_integration()
+
+    started = time.time()
+    results = asyncio.run(async_run(args))
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+            "duration": round(time.time() - started, 1),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "min_time": args.min_time,
+            "repeats": args.repeats,
+            "targets": list(TARGETS),
+            "alloc_target": ALLOC_TARGET,
+            "drag": list(DRAG),
+        },
+        "results": results,
+    }
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"bench-{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nErgebnis: {output}")
+
+    if args.compare is None:
+        return 0
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+    regressions = compare(report, baseline, args.threshold)
+    if not regressions:
+        print(f"Keine Regression gegenüber {args.compare} (Schwelle {args.threshold:.0%}).")
+        return 0
+    print(f"\n{len(regressions)} Regression(en) gegenüber {args.compare}:")
+    for name, metric, old, new, change in regressions:
+        print(f"  {name:<42} {metric:<26} {old} -> {new} ({change:+.1%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
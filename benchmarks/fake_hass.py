@@ -0,0 +1,523 @@
+"""
+Minimale Home-Assistant-Umgebung für Benchmarks und Lasttests.
+
+Die Integration wird hier ohne Home Assistant geladen: install_stubs()
+legt schlanke Ersatz-Module für die wenigen genutzten homeassistant.*-APIs
+in sys.modules ab, FakeHass stellt States, Bus, Services, Entity-Registry
+und Event-Loop bereit. Gemessen wird damit ausschließlich der Code der
+Integration – nicht der HA-Core (Recorder, Schema-Prüfung, Entity-Registry
+auf der Platte ...). Die Stubs gelten nur im Benchmark-Prozess.
+"""
+
+import asyncio
+import enum
+import sys
+import time
+import types
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "light_group_dimmer"
+
+
+# ----------------------------------------------------------
+#   Ersatz für homeassistant.core
+# ----------------------------------------------------------
+def callback(func):
+    """Wie homeassistant.core.callback: markiert eine Funktion als Loop-sicher."""
+    setattr(func, "_hass_callback", True)
+    return func
+
+
+class HassJob:
+    __slots__ = ("target",)
+
+    def __init__(self, target):
+        self.target = target
+
+
+class SupportsResponse(enum.Enum):
+    NONE = "none"
+    OPTIONAL = "optional"
+    ONLY = "only"
+
+
+class ServiceCall:
+    def __init__(self, domain, service, data=None, return_response=False):
+        self.domain = domain
+        self.service = service
+        self.data = dict(data or {})
+        self.return_response = return_response
+
+
+class State:
+    """Wie homeassistant.core.State (nur die Felder, die die Integration liest)."""
+
+    __slots__ = ("entity_id", "state", "attributes", "last_changed", "last_updated")
+
+    def __init__(self, entity_id, state, attributes=None, last_changed=None):
+        now = time.time()
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = types.MappingProxyType(dict(attributes or {}))
+        self.last_updated = now
+        self.last_changed = last_changed or now
+
+    @property
+    def domain(self):
+        return self.entity_id.split(".", 1)[0]
+
+    def __repr__(self):
+        return f"<State {self.entity_id}={self.state}>"
+
+
+class Event:
+    __slots__ = ("event_type", "data", "time_fired")
+
+    def __init__(self, event_type, data):
+        self.event_type = event_type
+        self.data = data
+        self.time_fired = time.monotonic()
+
+
+# ----------------------------------------------------------
+#   FakeHass
+# ----------------------------------------------------------
+class FakeStates:
+    """State-Machine: async_set erzeugt ein state_changed-Event wie in HA."""
+
+    def __init__(self, bus):
+        self._bus = bus
+        self._states = {}
+        self.writes = 0
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def async_all(self, domain=None):
+        if domain is None:
+            return list(self._states.values())
+        prefix = f"{domain}."
+        return [state for entity_id, state in self._states.items() if entity_id.startswith(prefix)]
+
+    def async_set(self, entity_id, new_state, attributes=None):
+        old = self._states.get(entity_id)
+        attributes = dict(attributes or {})
+        if old is not None and old.state == new_state and dict(old.attributes) == attributes:
+            return  # wie HA: identischer Zustand => kein Event
+        last_changed = old.last_changed if old is not None and old.state == new_state else None
+        state = State(entity_id, new_state, attributes, last_changed)
+        self._states[entity_id] = state
+        self.writes += 1
+        self._bus.async_fire(
+            "state_changed", {"entity_id": entity_id, "old_state": old, "new_state": state}
+        )
+
+
+class FakeBus:
+    """Event-Bus mit Index entity_id -> Listener (wie async_track_state_change_event)."""
+
+    def __init__(self):
+        self._listeners = {}  # {event_type: [callback]}
+        self._state_listeners = {}  # {entity_id: [callback]}
+        self.fired = {}
+
+    def async_listen(self, event_type, listener):
+        listeners = self._listeners.setdefault(event_type, [])
+        listeners.append(listener)
+        return lambda: listeners.remove(listener)
+
+    def async_track_state(self, entity_ids, action):
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        entity_ids = list(entity_ids)
+        for entity_id in entity_ids:
+            self._state_listeners.setdefault(entity_id, []).append(action)
+
+        def _unsub():
+            for entity_id in entity_ids:
+                listeners = self._state_listeners.get(entity_id)
+                if listeners and action in listeners:
+                    listeners.remove(action)
+
+        return _unsub
+
+    def async_fire(self, event_type, event_data=None):
+        self.fired[event_type] = self.fired.get(event_type, 0) + 1
+        event = Event(event_type, event_data or {})
+        if event_type == "state_changed":
+            for action in list(self._state_listeners.get(event.data["entity_id"], ())):
+                action(event)
+        for listener in list(self._listeners.get(event_type, ())):
+            listener(event)
+
+
+class FakeServices:
+    """Service-Registry; zählt jeden Aufruf und die adressierten Entities."""
+
+    def __init__(self):
+        self._handlers = {}
+        self.calls = {}  # {"domain.service": Anzahl}
+        self.targets = {}  # {"domain.service": Anzahl adressierter entity_ids}
+
+    def async_register(self, domain, service, handler, schema=None, supports_response=None):
+        self._handlers[(domain, service)] = handler
+
+    def has_service(self, domain, service):
+        return (domain, service) in self._handlers
+
+    async def async_call(self, domain, service, service_data=None, blocking=False, return_response=False):
+        key = f"{domain}.{service}"
+        service_data = service_data or {}
+        entity_ids = service_data.get("entity_id") or ()
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        self.calls[key] = self.calls.get(key, 0) + 1
+        self.targets[key] = self.targets.get(key, 0) + len(entity_ids)
+        handler = self._handlers.get((domain, service))
+        if handler is None:
+            return None
+        result = handler(ServiceCall(domain, service, service_data, return_response))
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.targets.clear()
+
+
+class RegistryEntry:
+    __slots__ = ("entity_id", "platform", "config_entry_id")
+
+    def __init__(self, entity_id, platform, config_entry_id):
+        self.entity_id = entity_id
+        self.platform = platform
+        self.config_entry_id = config_entry_id
+
+
+class FakeEntityRegistry:
+    def __init__(self):
+        self._entries = {}
+
+    def async_get(self, entity_id):
+        return self._entries.get(entity_id)
+
+    def register(self, entity_id, platform, config_entry_id=None):
+        self._entries[entity_id] = RegistryEntry(entity_id, platform, config_entry_id)
+
+
+class _FakeFlow:
+    async def async_init(self, domain, context=None, data=None):
+        return None
+
+
+class FakeConfigEntries:
+    def __init__(self):
+        self.flow = _FakeFlow()
+
+    def async_entries(self, domain=None):
+        return []
+
+
+class FakeHass:
+    """Gerade genug hass für die Integration: data, states, bus, services, loop."""
+
+    def __init__(self, loop=None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.data = {}
+        self.bus = FakeBus()
+        self.states = FakeStates(self.bus)
+        self.services = FakeServices()
+        self.entity_registry = FakeEntityRegistry()
+        self.config_entries = FakeConfigEntries()
+        self.notifications = {}
+        self._tasks = set()
+
+    def async_create_task(self, coro, name=None):
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def async_run_hass_job(self, job, *args):
+        result = job.target(*args)
+        if asyncio.iscoroutine(result):
+            return self.async_create_task(result)
+        return result
+
+    @property
+    def pending_tasks(self):
+        return len(self._tasks)
+
+    async def async_block_till_done(self):
+        """Wartet auf alle über hass gestarteten Tasks (Timer zählen nicht)."""
+        await asyncio.sleep(0)
+        while self._tasks:
+            # asyncio.wait statt gather: ein Abbruch des Wartens bricht die Tasks nicht ab
+            await asyncio.wait(list(self._tasks))
+            await asyncio.sleep(0)
+
+
+# ----------------------------------------------------------
+#   Ersatz für homeassistant.components.light / Entity
+# ----------------------------------------------------------
+class ColorMode(str, enum.Enum):
+    UNKNOWN = "unknown"
+    ONOFF = "onoff"
+    BRIGHTNESS = "brightness"
+    COLOR_TEMP = "color_temp"
+    HS = "hs"
+    XY = "xy"
+    RGB = "rgb"
+    RGBW = "rgbw"
+    RGBWW = "rgbww"
+    WHITE = "white"
+
+
+class LightEntityFeature(enum.IntFlag):
+    EFFECT = 4
+    FLASH = 8
+    TRANSITION = 32
+
+
+class LightEntity:
+    """Basisklasse wie in HA: async_write_ha_state schreibt in die State-Machine."""
+
+    entity_id = None
+    hass = None
+
+    def async_on_remove(self, func):
+        self.__dict__.setdefault("_on_remove", []).append(func)
+
+    def async_write_ha_state(self):
+        attributes = dict(self.extra_state_attributes or {})
+        if self.is_on:
+            for key, value in (
+                ("brightness", self.brightness),
+                ("hs_color", self.hs_color),
+                ("color_mode", self.color_mode),
+                ("effect", self.effect),
+            ):
+                if value is not None:
+                    attributes[key] = value
+        self.hass.states.async_set(self.entity_id, "on" if self.is_on else "off", attributes)
+
+    async def async_remove(self):
+        await self.async_will_remove_from_hass()
+        for func in self.__dict__.pop("_on_remove", []):
+            func()
+
+    async def async_will_remove_from_hass(self):
+        pass
+
+
+def _persistent_notification_create(hass, message, title=None, notification_id=None):
+    hass.notifications[notification_id] = {"title": title, "message": message}
+
+
+def _track_state_change_event(hass, entity_ids, action):
+    return hass.bus.async_track_state(entity_ids, action)
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def _install_voluptuous_fallback():
+    """Nur falls voluptuous fehlt: Schemas werden gebaut, aber nie geprüft."""
+
+    class _Marker(str):
+        def __new__(cls, key, default=None, **kwargs):
+            return super().__new__(cls, key)
+
+    def _passthrough(*args, **kwargs):
+        return lambda value: value
+
+    sys.modules["voluptuous"] = _module(
+        "voluptuous",
+        Schema=_passthrough,
+        Optional=_Marker,
+        Required=_Marker,
+        All=_passthrough,
+        Any=_passthrough,
+        Coerce=_passthrough,
+        Range=_passthrough,
+        In=_passthrough,
+    )
+
+
+def install_stubs():
+    """Legt die homeassistant.*-Ersatzmodule an (einmal pro Prozess)."""
+    if getattr(sys.modules.get("homeassistant"), "__fake__", False):
+        return
+    try:
+        import voluptuous  # noqa: F401
+    except ImportError:
+        _install_voluptuous_fallback()
+
+    light_constants = {
+        name: name.lower().removeprefix("attr_")
+        for name in (
+            "ATTR_BRIGHTNESS",
+            "ATTR_HS_COLOR",
+            "ATTR_COLOR_TEMP_KELVIN",
+            "ATTR_EFFECT",
+            "ATTR_EFFECT_LIST",
+            "ATTR_SUPPORTED_COLOR_MODES",
+            "ATTR_XY_COLOR",
+            "ATTR_RGB_COLOR",
+            "ATTR_COLOR_MODE",
+            "ATTR_TRANSITION",
+        )
+    }
+    persistent_notification = _module(
+        "homeassistant.components.persistent_notification",
+        async_create=_persistent_notification_create,
+    )
+    entity_registry = _module(
+        "homeassistant.helpers.entity_registry",
+        async_get=lambda hass: hass.entity_registry,
+    )
+    config_validation = _module(
+        "homeassistant.helpers.config_validation",
+        entity_id=lambda value: value,
+        entity_ids=lambda value: value,
+    )
+    modules = {
+        "homeassistant": _module("homeassistant", __fake__=True, __path__=[]),
+        "homeassistant.core": _module(
+            "homeassistant.core",
+            HomeAssistant=FakeHass,
+            callback=callback,
+            HassJob=HassJob,
+            ServiceCall=ServiceCall,
+            SupportsResponse=SupportsResponse,
+            State=State,
+            Event=Event,
+        ),
+        "homeassistant.const": _module("homeassistant.const", CONF_NAME="name"),
+        "homeassistant.config_entries": _module("homeassistant.config_entries", ConfigEntry=object),
+        "homeassistant.components": _module(
+            "homeassistant.components", __path__=[], persistent_notification=persistent_notification
+        ),
+        "homeassistant.components.persistent_notification": persistent_notification,
+        "homeassistant.components.light": _module(
+            "homeassistant.components.light",
+            LightEntity=LightEntity,
+            ColorMode=ColorMode,
+            LightEntityFeature=LightEntityFeature,
+            **light_constants,
+        ),
+        "homeassistant.helpers": _module(
+            "homeassistant.helpers",
+            __path__=[],
+            entity_registry=entity_registry,
+            config_validation=config_validation,
+        ),
+        "homeassistant.helpers.entity_registry": entity_registry,
+        "homeassistant.helpers.config_validation": config_validation,
+        "homeassistant.helpers.entity_platform": _module(
+            "homeassistant.helpers.entity_platform", AddEntitiesCallback=object
+        ),
+        "homeassistant.helpers.event": _module(
+            "homeassistant.helpers.event",
+            async_track_state_change_event=_track_state_change_event,
+        ),
+    }
+    sys.modules.update(modules)
+
+
+def load_integration():
+    """Importiert die Integration gegen die Stubs; liefert das Paket-Modul."""
+    install_stubs()
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    import importlib
+
+    integration = importlib.import_module(f"custom_components.{DOMAIN}")
+    importlib.import_module(f"custom_components.{DOMAIN}.light")
+    return integration
+
+
+async def async_setup_integration(hass, **settings):
+    """Führt das echte async_setup der Integration mit YAML-Einstellungen aus."""
+    integration = load_integration()
+    config = {DOMAIN: settings} if settings else {}
+    await integration.async_setup(hass, config)
+    await hass.async_block_till_done()
+    return integration
+
+
+async def async_add_group(hass, name, members):
+    """Legt eine CustomLightGroup an und meldet sie wie die Plattform an."""
+    light = sys.modules[f"custom_components.{DOMAIN}.light"]
+    const = sys.modules[f"custom_components.{DOMAIN}.const"]
+    group = light.CustomLightGroup(
+        name,
+        list(members),
+        hass,
+        light.group_unique_id(name),
+        hass.data[DOMAIN].get(const.CONF_DELAY, const.DEFAULT_DELAY),
+    )
+    group.entity_id = f"light.{light.group_unique_id(name)}"
+    await group.async_added_to_hass()
+    return group
+
+
+# ----------------------------------------------------------
+#   Einfacher light-Service (sofortige Bestätigung)
+# ----------------------------------------------------------
+LAMP_ATTRIBUTES = {
+    "supported_color_modes": ["color_temp", "xy"],
+    "color_mode": "color_temp",
+    "color_temp_kelvin": 2700,
+    "min_color_temp_kelvin": 2000,
+    "max_color_temp_kelvin": 6500,
+}
+
+
+def apply_light_command(hass, service, data):
+    """Setzt die Zielzustände eines light.turn_on/turn_off-Aufrufs wie eine Lampe."""
+    entity_ids = data.get("entity_id") or ()
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+    changes = {key: value for key, value in data.items() if key != "entity_id"}
+    for entity_id in entity_ids:
+        old = hass.states.get(entity_id)
+        attributes = dict(old.attributes) if old is not None else dict(LAMP_ATTRIBUTES)
+        if service == "turn_off":
+            attributes.pop("brightness", None)
+            hass.states.async_set(entity_id, "off", attributes)
+            continue
+        attributes.update(changes)
+        if "brightness" not in attributes:
+            attributes["brightness"] = 255
+        hass.states.async_set(entity_id, "on", attributes)
+
+
+def register_instant_lights(hass):
+    """light.turn_on/turn_off ohne Latenz: der neue Zustand steht sofort in hass.states."""
+
+    async def _handle(call):
+        apply_light_command(hass, call.service, call.data)
+
+    hass.services.async_register("light", "turn_on", _handle)
+    hass.services.async_register("light", "turn_off", _handle)
+
+
+def add_lamps(hass, brightnesses, prefix="bench", platform=None):
+    """Legt Lampen mit den gegebenen Helligkeiten an (0 = aus); liefert die entity_ids."""
+    entity_ids = []
+    for index, brightness in enumerate(brightnesses):
+        entity_id = f"light.{prefix}_{index:03d}"
+        attributes = dict(LAMP_ATTRIBUTES)
+        if brightness > 0:
+            attributes["brightness"] = brightness
+        hass.states.async_set(entity_id, "on" if brightness > 0 else "off", attributes)
+        if platform is not None:
+            hass.entity_registry.register(entity_id, *platform)
+        entity_ids.append(entity_id)
+    return entity_ids
@@ -0,0 +1,231 @@
+"""
+Simulierte Hue-Bridge für Lasttests ohne Hardware.
+
+HueBridgeSimulator stellt light.turn_on/turn_off in FakeHass bereit und
+verhält sich dabei wie eine Bridge hinter der Hue-Integration:
+
+  * jede Lampe ist ein eigener Befehl, ein Raum bzw. eine Zone
+    (grouped_light) ein Befehl für alle Mitglieder
+  * die Bridge arbeitet Befehle nacheinander ab (rate pro Sekunde für
+    Lampen, group_rate für Räume); ist die Warteschlange voll, wird der
+    Aufruf abgelehnt (BridgeOverloaded, wie ein HTTP 429)
+  * der Service-Call kehrt nach Warteschlange + latency (± jitter) zurück
+  * der neue Zustand kommt erst später als state_changed an
+    (confirm_delay ± confirm_jitter pro Lampe), mit auf Prozent
+    gerundeter Helligkeit
+  * mit drop_rate geht ein Befehl für eine Lampe still verloren
+"""
+
+import asyncio
+import random
+
+from fake_hass import LAMP_ATTRIBUTES
+
+PLATFORM = "hue"
+
+
+class BridgeOverloaded(Exception):
+    """Warteschlange der Bridge voll (entspricht HTTP 429 / 503)."""
+
+
+def hue_brightness(brightness):
+    """Helligkeit so, wie die Bridge sie zurückmeldet (ganze Prozent)."""
+    percent = round(brightness * 100 / 255)
+    return max(1, round(percent * 255 / 100))
+
+
+class _Lane:
+    """Sequenzielle Abarbeitung mit fester Rate (Lampen bzw. Räume)."""
+
+    __slots__ = ("rate", "next_free", "commands", "max_delay", "total_delay")
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.next_free = 0.0
+        self.commands = 0
+        self.max_delay = 0.0
+        self.total_delay = 0.0
+
+    def depth(self, now):
+        return max(0.0, self.next_free - now) * self.rate
+
+    def reserve(self, now):
+        """Reserviert den nächsten Slot; liefert die Wartezeit bis dahin."""
+        start = max(now, self.next_free)
+        self.next_free = start + 1 / self.rate
+        delay = start - now
+        self.commands += 1
+        self.total_delay += delay
+        self.max_delay = max(self.max_delay, delay)
+        return delay
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "commands": self.commands,
+            "avg_queue_delay": round(self.total_delay / self.commands, 4) if self.commands else 0.0,
+            "max_queue_delay": round(self.max_delay, 4),
+        }
+
+
+class HueBridgeSimulator:
+    """Eine Bridge mit Lampen und optional Räumen in FakeHass."""
+
+    def __init__(
+        self,
+        hass,
+        *,
+        latency=0.04,
+        jitter=0.02,
+        rate=10.0,
+        group_rate=1.0,
+        max_queue=50,
+        drop_rate=0.0,
+        confirm_delay=0.3,
+        confirm_jitter=0.2,
+        seed=0,
+        entry_id="bridge_1",
+    ):
+        self.hass = hass
+        self.latency = latency
+        self.jitter = jitter
+        self.max_queue = max_queue
+        self.drop_rate = drop_rate
+        self.confirm_delay = confirm_delay
+        self.confirm_jitter = confirm_jitter
+        self.entry_id = entry_id
+        self._rng = random.Random(seed)
+        self._lights = _Lane(rate)
+        self._rooms = _Lane(group_rate)
+        self._room_members = {}  # {room_entity_id: [entity_id]}
+        self._pending_confirms = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.requests = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.executed = 0
+        self.confirmed = 0
+
+    # ------------------------------------------------------
+    #   Aufbau
+    # ------------------------------------------------------
+    def add_lights(self, brightnesses, prefix="hue"):
+        """Legt Lampen an (0 = aus) und trägt sie als Hue-Entities ein."""
+        entity_ids = []
+        for index, brightness in enumerate(brightnesses):
+            entity_id = f"light.{prefix}_{index:03d}"
+            attributes = dict(LAMP_ATTRIBUTES)
+            if brightness > 0:
+                attributes["brightness"] = hue_brightness(brightness)
+            self.hass.states.async_set(entity_id, "on" if brightness > 0 else "off", attributes)
+            self.hass.entity_registry.register(entity_id, PLATFORM, self.entry_id)
+            entity_ids.append(entity_id)
+        return entity_ids
+
+    def add_room(self, name, entity_ids):
+        """Hue-Raum (grouped_light) mit den gegebenen Lampen."""
+        room_entity_id = f"light.{name}"
+        self._room_members[room_entity_id] = list(entity_ids)
+        self.hass.states.async_set(
+            room_entity_id,
+            "on",
+            {
+                **LAMP_ATTRIBUTES,
+                "is_hue_group": True,
+                "lights": [entity_id.split(".", 1)[1] for entity_id in entity_ids],
+                "entity_id": list(entity_ids),
+            },
+        )
+        self.hass.entity_registry.register(room_entity_id, PLATFORM, self.entry_id)
+        return room_entity_id
+
+    def register_services(self):
+        self.hass.services.async_register("light", "turn_on", self._async_handle)
+        self.hass.services.async_register("light", "turn_off", self._async_handle)
+
+    # ------------------------------------------------------
+    #   Befehle
+    # ------------------------------------------------------
+    async def _async_handle(self, call):
+        entity_ids = call.data.get("entity_id") or ()
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        changes = {key: value for key, value in call.data.items() if key != "entity_id"}
+        loop = self.hass.loop
+        now = loop.time()
+        self.requests += 1
+
+        rooms = [entity_id for entity_id in entity_ids if entity_id in self._room_members]
+        lights = [entity_id for entity_id in entity_ids if entity_id not in self._room_members]
+        # Abgelehnt wird nur bei bereits voller Warteschlange, ein großer Aufruf wird eingereiht
+        if (lights and self._lights.depth(now) > self.max_queue) or (
+            rooms and self._rooms.depth(now) > self.max_queue
+        ):
+            self.rejected += 1
+            raise BridgeOverloaded(f"Bridge {self.entry_id}: Warteschlange voll")
+
+        # Ein Befehl pro Lampe bzw. Raum, die Antwort kommt nach dem letzten
+        queue_delay = 0.0
+        targets = []
+        for entity_id in lights:
+            queue_delay = max(queue_delay, self._lights.reserve(now))
+            targets.append(entity_id)
+        for room in rooms:
+            queue_delay = max(queue_delay, self._rooms.reserve(now))
+            targets.extend(self._room_members[room])
+        await asyncio.sleep(queue_delay + self._spread(self.latency, self.jitter))
+        self.executed += len(lights) + len(rooms)
+
+        for entity_id in targets:
+            if self.drop_rate and self._rng.random() < self.drop_rate:
+                self.dropped += 1
+                continue
+            self._pending_confirms += 1
+            self._idle.clear()
+            loop.call_later(
+                self._spread(self.confirm_delay, self.confirm_jitter),
+                self._confirm,
+                entity_id,
+                call.service,
+                changes,
+            )
+
+    def _spread(self, value, jitter):
+        return max(0.0, value + self._rng.uniform(-jitter, jitter))
+
+    def _confirm(self, entity_id, service, changes):
+        """Zustand melden, wie ihn die Bridge im Event-Stream schickt."""
+        self._pending_confirms -= 1
+        if self._pending_confirms == 0:
+            self._idle.set()
+        old = self.hass.states.get(entity_id)
+        attributes = dict(old.attributes) if old is not None else dict(LAMP_ATTRIBUTES)
+        self.confirmed += 1
+        if service == "turn_off":
+            attributes.pop("brightness", None)
+            self.hass.states.async_set(entity_id, "off", attributes)
+            return
+        attributes.update(changes)
+        attributes["brightness"] = hue_brightness(attributes.get("brightness", 255))
+        self.hass.states.async_set(entity_id, "on", attributes)
+
+    async def async_wait_idle(self, timeout):
+        """Wartet, bis alle Bestätigungen verschickt sind; False bei Timeout."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "executed": self.executed,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "confirmed": self.confirmed,
+            "pending_confirms": self._pending_confirms,
+            "lights": self._lights.stats(),
+            "rooms": self._rooms.stats(),
+        }
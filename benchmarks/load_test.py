@@ -0,0 +1,375 @@
+"""
+Lasttest: Lichtgruppen mit Hunderten Lampen gegen eine simulierte Hue-Bridge.
+
+Die Integration läuft in FakeHass (siehe fake_hass.py) in Echtzeit auf
+einem normalen asyncio-Loop. Pro Gruppe schickt ein Treiber Befehle wie ein
+gezogener Slider (Zufallsweg der Helligkeit, gelegentlich turn_off), ohne
+auf den vorherigen zu warten. Die Bridge (hue_bridge.py) antwortet mit
+Latenz, Jitter, Rate-Limit, verlorenen Befehlen und verzögerten
+state_changed-Bestätigungen.
+
+Gemessen werden:
+
+  * Durchsatz: abgeschickte/ausgeführte Befehle, Bridge-Befehle, Bestätigungen
+  * Dauer von async_turn_on/async_turn_off aus Sicht des Aufrufers
+  * Latenz Befehl -> Bestätigung aller Lampen (LatencyTracker der Integration)
+  * Event-Loop-Lag (p50/p95/p99/max) und CPU-Zeit
+  * Restabweichung jeder Gruppe vom zuletzt angeforderten Wert
+
+Bleiben nach dem Nachlauf Befehle oder Bestätigungen offen, war die Bridge
+überlastet: der Bericht bekommt "status": "saturated" und das Skript endet mit
+Exit-Code 2. Die Perzentile beschreiben dann nur die fertig gewordenen Befehle.
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --lamps 200 --rooms 4 --drop-rate 0.02 --output /tmp/last.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+import fake_hass
+from fake_hass import DOMAIN, FakeHass
+from hue_bridge import BridgeOverloaded, HueBridgeSimulator
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Abtastintervall für den Event-Loop-Lag (Sekunden)
+LAG_INTERVAL = 0.01
+# Exit-Code, wenn der Nachlauf nicht fertig wurde
+EXIT_SATURATED = 2
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {
+        "count": len(ordered),
+        "p50": round(ordered[round(0.50 * last)], 2),
+        "p95": round(ordered[round(0.95 * last)], 2),
+        "p99": round(ordered[round(0.99 * last)], 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def _slices(items, count):
+    """Teilt items in count zusammenhängende, möglichst gleich große Stücke."""
+    size, rest = divmod(len(items), count)
+    slices = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < rest else 0)
+        slices.append(items[start:end])
+        start = end
+    return slices
+
+
+class CommandStats:
+    """Dauer der Befehle aus Sicht des Aufrufers und Fehler nach Typ."""
+
+    def __init__(self):
+        self.durations = []
+        self.errors = {}
+        self.submitted = 0
+        self.completed = 0
+
+    async def async_track(self, coro, on_success):
+        self.submitted += 1
+        started = time.perf_counter()
+        try:
+            await coro
+        except asyncio.CancelledError:
+            self.errors["cancelled"] = self.errors.get("cancelled", 0) + 1
+        except BridgeOverloaded:
+            self.errors["overloaded"] = self.errors.get("overloaded", 0) + 1
+        except Exception as err:  # alles Weitere zählen, der Lasttest läuft weiter
+            name = type(err).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+        else:
+            self.durations.append((time.perf_counter() - started) * 1000)
+            self.completed += 1
+            on_success(self.completed)
+
+
+def _target_recorder(last_target, group, target):
+    """Merkt (Reihenfolge der Fertigstellung über alle Gruppen, Ziel) – für überlappende Gruppen."""
+
+    def _record(order):
+        last_target[group.entity_id] = (order, target)
+
+    return _record
+
+
+async def _async_drive(hass, group, rng, args, stats, last_target, stop):
+    """Slider-artige Befehlsfolge für eine Gruppe bis stop gesetzt ist."""
+    brightness = rng.randint(30, 220)
+    interval = 1 / args.command_rate
+    while not stop.is_set():
+        if rng.random() < args.off_ratio:
+            target = 0
+            coro = group.async_turn_off()
+        else:
+            brightness = max(5, min(250, brightness + rng.randint(-40, 40)))
+            target = brightness
+            coro = group.async_turn_on(brightness=brightness)
+        hass.async_create_task(stats.async_track(coro, _target_recorder(last_target, group, target)))
+        await asyncio.sleep(interval * rng.uniform(0.5, 1.5))
+
+
+async def _async_monitor_lag(loop, samples, stop):
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append((loop.time() - started - LAG_INTERVAL) * 1000)
+
+
+def _final_deviation(hass, group, groups, last_target):
+    """
+    Abweichung des bestätigten Gruppenmittels vom zuletzt angeforderten Wert.
+    Hat danach eine überlappende Gruppe noch Befehle geschickt, ist der Wert
+    nicht aussagekräftig (overridden).
+    """
+    if group.entity_id not in last_target:
+        return {"target": None}
+    order, target = last_target[group.entity_id]
+    members = set(group._entities)
+    for other in groups:
+        if (
+            other is not group
+            and last_target.get(other.entity_id, (-1, None))[0] > order
+            and members.intersection(other._entities)
+        ):
+            return {"target": target, "overridden_by": other.entity_id}
+    values = []
+    for entity_id in group._entities:
+        state = hass.states.get(entity_id)
+        if state is not None and state.state == "on":
+            values.append(state.attributes.get("brightness") or 0)
+    if target == 0:
+        return {"target": 0, "lamps_on": len(values)}
+    mean = sum(values) / len(values) if values else 0.0
+    return {
+        "target": target,
+        "confirmed_mean": round(mean, 2),
+        "deviation": round(abs(mean - target), 2),
+        "lamps_on": len(values),
+    }
+
+
+async def async_run(args):
+    rng = random.Random(args.seed)
+    hass = FakeHass()
+    settings = {
+        "solver": args.solver,
+        "update_window": args.update_window,
+        "min_dispatch_interval": args.min_dispatch_interval,
+        "hue_groups": args.rooms > 0,
+    }
+    if args.integration_rate is not None:
+        settings["rate_limits"] = {"hue": args.integration_rate}
+    await fake_hass.async_setup_integration(hass, **settings)
+
+    bridge = HueBridgeSimulator(
+        hass,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate=args.bridge_rate,
+        group_rate=args.bridge_group_rate,
+        max_queue=args.max_queue,
+        drop_rate=args.drop_rate,
+        confirm_delay=args.confirm_delay,
+        confirm_jitter=args.confirm_jitter,
+        seed=args.seed,
+    )
+    bridge.register_services()
+    entity_ids = bridge.add_lights([rng.choice((0, 60, 120, 200, 254)) for _ in range(args.lamps)])
+    for index, members in enumerate(_slices(entity_ids, args.rooms) if args.rooms else ()):
+        bridge.add_room(f"hue_room_{index}", members)
+
+    # Gruppe 0 enthält alle Lampen, die übrigen je einen zusammenhängenden Teil
+    groups = [await fake_hass.async_add_group(hass, "Load Alle", entity_ids)]
+    for index, members in enumerate(_slices(entity_ids, args.groups - 1) if args.groups > 1 else ()):
+        groups.append(await fake_hass.async_add_group(hass, f"Load {index + 1}", members))
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    stats = CommandStats()
+    lag_samples = []
+    last_target = {}
+    events_before = hass.bus.fired.get("state_changed", 0)
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+
+    monitor = loop.create_task(_async_monitor_lag(loop, lag_samples, stop))
+    drivers = [
+        loop.create_task(_async_drive(hass, group, rng, args, stats, last_target, stop))
+        for group in groups
+    ]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*drivers)
+    load_seconds = time.perf_counter() - started
+
+    # Nachlauf: offene Befehle und Bestätigungen abwarten (nicht beliebig lange)
+    try:
+        await asyncio.wait_for(hass.async_block_till_done(), args.drain_timeout)
+        drained = await bridge.async_wait_idle(args.drain_timeout)
+    except asyncio.TimeoutError:
+        drained = False
+    pending_commands = hass.pending_tasks
+    await asyncio.sleep(args.update_window + LAG_INTERVAL)
+    await monitor
+    total_seconds = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_started
+
+    data = hass.data[DOMAIN]
+    bridge_stats = bridge.stats()
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": vars(args) | {"output": str(args.output) if args.output else None},
+        },
+        "status": "ok" if drained and not pending_commands else "saturated",
+        "throughput": {
+            "load_seconds": round(load_seconds, 2),
+            "total_seconds": round(total_seconds, 2),
+            "drained": drained,
+            "pending_commands": pending_commands,
+            "commands_submitted": stats.submitted,
+            "commands_per_sec": round(stats.submitted / load_seconds, 2),
+            "commands_executed": sum(group._command_scheduler.dispatched for group in groups),
+            "bridge_requests_per_sec": round(bridge_stats["requests"] / load_seconds, 2),
+            "bridge_commands_per_sec": round(bridge_stats["executed"] / total_seconds, 2),
+            "confirmations_per_sec": round(bridge_stats["confirmed"] / total_seconds, 2),
+            "state_changed_events": hass.bus.fired.get("state_changed", 0) - events_before,
+        },
+        "command_ms": percentiles(stats.durations),
+        "command_errors": dict(stats.errors),
+        "event_loop_lag_ms": percentiles(lag_samples),
+        "cpu": {
+            "seconds": round(cpu_seconds, 2),
+            "utilisation": round(cpu_seconds / total_seconds, 3),
+        },
+        "bridge": bridge_stats,
+        "groups": {
+            group.entity_id: {
+                "lamps": len(group._entities),
+                "scheduler": group._command_scheduler.stats(),
+                "confirmation_ms": {
+                    key: value
+                    for key, value in data["latency"].group_summary(group._unique_id).items()
+                    if key != "lamps"
+                },
+                "final": _final_deviation(hass, group, groups, last_target),
+            }
+            for group in groups
+        },
+        "integration": {
+            name: data[name].stats()
+            for name in (
+                "latency", "limiter", "sent_states", "state_dispatcher", "solver_cache", "hue_group_index",
+            )
+            if data.get(name) is not None
+        },
+    }
+
+    for group in groups:
+        await group.async_remove()
+    data["cache_expiry"].async_shutdown()
+    data["limiter"].cancel()
+    data["state_dispatcher"].async_shutdown()
+    return report
+
+
+def _print_summary(report):
+    throughput = report["throughput"]
+    print(
+        f"Befehle: {throughput['commands_submitted']} abgeschickt "
+        f"({throughput['commands_per_sec']}/s), {throughput['commands_executed']} ausgeführt"
+    )
+    print(
+        f"Bridge: {throughput['bridge_requests_per_sec']} Requests/s, "
+        f"{throughput['bridge_commands_per_sec']} Befehle/s, "
+        f"{throughput['confirmations_per_sec']} Bestätigungen/s, "
+        f"abgelehnt {report['bridge']['rejected']}, verloren {report['bridge']['dropped']}"
+    )
+    command = report["command_ms"]
+    print(f"Befehlsdauer ms: p50 {command['p50']}  p95 {command['p95']}  p99 {command['p99']}  max {command['max']}")
+    lag = report["event_loop_lag_ms"]
+    print(f"Loop-Lag ms:     p50 {lag['p50']}  p95 {lag['p95']}  p99 {lag['p99']}  max {lag['max']}")
+    print(f"CPU: {report['cpu']['seconds']} s ({report['cpu']['utilisation']:.0%})")
+    if report["status"] != "ok":
+        print(
+            f"ÜBERLASTET: Nachlauf nach {report['meta']['settings']['drain_timeout']} s abgebrochen, "
+            f"{throughput['pending_commands']} Befehle und "
+            f"{report['bridge']['pending_confirms']} Bestätigungen offen – "
+            "Perzentile gelten nur für fertige Befehle"
+        )
+    if report["command_errors"]:
+        print(f"Fehler: {report['command_errors']}")
+    for entity_id, group in report["groups"].items():
+        confirmation = group["confirmation_ms"]
+        print(
+            f"  {entity_id:<28} {group['lamps']:>4} Lampen  "
+            f"Bestätigung p50 {confirmation['p50']} / p95 {confirmation['p95']} ms "
+            f"({confirmation['samples']} Messungen)  final {group['final']}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lamps", type=int, default=100)
+    parser.add_argument("--groups", type=int, default=4, help="Gruppen (die erste enthält alle Lampen)")
+    parser.add_argument("--rooms", type=int, default=4, help="Hue-Räume über die Lampen (0 = keine)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Sekunden unter Last")
+    parser.add_argument("--command-rate", type=float, default=4.0, help="Befehle/s pro Gruppe")
+    parser.add_argument("--off-ratio", type=float, default=0.05, help="Anteil turn_off-Befehle")
+    parser.add_argument("--solver", choices=("iterative", "scaling"), default="iterative")
+    parser.add_argument("--update-window", type=float, default=0.2)
+    parser.add_argument("--min-dispatch-interval", type=float, default=0.0)
+    parser.add_argument("--integration-rate", type=float, default=10.0, help="rate_limits.hue der Integration (0 = aus)")
+    parser.add_argument("--latency", type=float, default=0.04, help="Antwortzeit der Bridge (s)")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--bridge-rate", type=float, default=10.0, help="Lampen-Befehle/s der Bridge")
+    parser.add_argument("--bridge-group-rate", type=float, default=1.0, help="Raum-Befehle/s der Bridge")
+    parser.add_argument("--max-queue", type=int, default=50, help="Warteschlange der Bridge")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Anteil verlorener Lampen-Befehle")
+    parser.add_argument("--confirm-delay", type=float, default=0.3, help="Verzögerung bis state_changed (s)")
+    parser.add_argument("--confirm-jitter", type=float, default=0.2)
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="max. Nachlauf (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="JSON-Datei (Standard: benchmarks/results/)")
+    args = parser.parse_args(argv)
+    args.groups = max(1, args.groups)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    fake_hass.load_integration()
+
+    report = asyncio.run(async_run(args))
+    _print_summary(report)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"load-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nErgebnis: {output}")
+    return 0 if report["status"] == "ok" else EXIT_SATURATED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,12 +9,39 @@ from .const import (
     DEFAULT_DELAY,
     CONF_GROUPS,
     CONF_NAME,
-    CONF_ENTITIES
+    CONF_ENTITIES,
+    CONF_SOLVER,
+    DEFAULT_SOLVER,
+    CONF_SOLVER_CACHE_SIZE,
+    DEFAULT_SOLVER_CACHE_SIZE,
+    CONF_BRIGHTNESS_CACHE_SIZE,
+    DEFAULT_BRIGHTNESS_CACHE_SIZE,
+    CONF_BRIGHTNESS_CACHE_CELLS,
+    DEFAULT_BRIGHTNESS_CACHE_CELLS,
+    CONF_MIN_DISPATCH_INTERVAL,
+    CONF_RATE_LIMITS,
+    DEFAULT_RATE_LIMITS,
+    CONF_RATE_BURST,
+    CONF_HUE_GROUPS,
+    DEFAULT_HUE_GROUPS,
+    CONF_UPDATE_WINDOW,
+    CONF_LATENCY_SENSORS,
 )
+from .solver import SolverCache
+from .dispatch import SentStateTable
+from .ratelimit import OutboundLimiter
+from .hue_groups import HueGroupIndex
+from .events import StateChangeDispatcher
+from .capabilities import CapabilityRegistry
+from .expiry import ExpiryWheel
+from .brightness_cache import BrightnessCacheManager
+from .latency import LatencyTracker
+from .trace import FlightRecorder
+from .services import async_register_services
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["light"]
+PLATFORMS = ["light", "sensor"]
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
@@ -26,6 +53,7 @@ async def async_setup(hass: HomeAssistant, config: dict):
     # Globale Defaults in hass.data
     hass.data[DOMAIN].setdefault(CONF_GROUPS, [])
     hass.data[DOMAIN].setdefault(CONF_DELAY, DEFAULT_DELAY)
+    hass.data[DOMAIN].setdefault(CONF_SOLVER, DEFAULT_SOLVER)
     hass.data[DOMAIN]["yaml_config"] = False
 
     # Schauen, ob in configuration.yaml (oder packages) ein Abschnitt 'light_group_dimmer:' vorhanden ist
@@ -39,6 +67,45 @@ async def async_setup(hass: HomeAssistant, config: dict):
             hass.data[DOMAIN][CONF_DELAY] = yaml_delay
             hass.data[DOMAIN]["yaml_config"] = True
 
+        # Solver aus YAML (falls gesetzt)
+        if CONF_SOLVER in yaml_conf:
+            yaml_solver = yaml_conf.get(CONF_SOLVER)
+            _LOGGER.info("YAML-Solver erkannt: %s", yaml_solver)
+            hass.data[DOMAIN][CONF_SOLVER] = yaml_solver
+
+        # Größe des Solver-Caches aus YAML (falls gesetzt)
+        if CONF_SOLVER_CACHE_SIZE in yaml_conf:
+            hass.data[DOMAIN][CONF_SOLVER_CACHE_SIZE] = yaml_conf.get(CONF_SOLVER_CACHE_SIZE)
+
+        # Obergrenzen der Helligkeits-Caches aus YAML (falls gesetzt)
+        for key in (CONF_BRIGHTNESS_CACHE_SIZE, CONF_BRIGHTNESS_CACHE_CELLS):
+            if key in yaml_conf:
+                hass.data[DOMAIN][key] = yaml_conf.get(key)
+
+        # Mindestabstand zwischen zwei Befehlen pro Gruppe aus YAML (falls gesetzt)
+        if CONF_MIN_DISPATCH_INTERVAL in yaml_conf:
+            hass.data[DOMAIN][CONF_MIN_DISPATCH_INTERVAL] = yaml_conf.get(CONF_MIN_DISPATCH_INTERVAL)
+
+        # Rate-Limits pro Backend aus YAML (ergänzen/überschreiben die Defaults)
+        if CONF_RATE_LIMITS in yaml_conf:
+            hass.data[DOMAIN][CONF_RATE_LIMITS] = {
+                **DEFAULT_RATE_LIMITS, **yaml_conf.get(CONF_RATE_LIMITS)
+            }
+        if CONF_RATE_BURST in yaml_conf:
+            hass.data[DOMAIN][CONF_RATE_BURST] = yaml_conf.get(CONF_RATE_BURST)
+
+        # Zeitfenster für zusammengefasste Gruppen-Updates (falls gesetzt)
+        if CONF_UPDATE_WINDOW in yaml_conf:
+            hass.data[DOMAIN][CONF_UPDATE_WINDOW] = yaml_conf.get(CONF_UPDATE_WINDOW)
+
+        # Latenz-Sensoren anlegen (falls gesetzt)
+        if CONF_LATENCY_SENSORS in yaml_conf:
+            hass.data[DOMAIN][CONF_LATENCY_SENSORS] = yaml_conf.get(CONF_LATENCY_SENSORS)
+
+        # Hue-Räume/-Zonen nutzen (falls gesetzt)
+        if CONF_HUE_GROUPS in yaml_conf:
+            hass.data[DOMAIN][CONF_HUE_GROUPS] = yaml_conf.get(CONF_HUE_GROUPS)
+
         # Gruppen aus YAML
         yaml_groups = yaml_conf.get(CONF_GROUPS, [])
         _LOGGER.debug("Geladene Gruppen aus YAML: %s", yaml_groups)
@@ -53,6 +120,53 @@ async def async_setup(hass: HomeAssistant, config: dict):
             )
         )
 
+    # Gemeinsamer LRU-Cache für alle Gruppen
+    hass.data[DOMAIN]["solver_cache"] = SolverCache(
+        hass.data[DOMAIN].get(CONF_SOLVER_CACHE_SIZE, DEFAULT_SOLVER_CACHE_SIZE)
+    )
+
+    # Gemeinsamer Rate-Limiter für alle Gruppen (Token-Bucket pro Bridge)
+    hass.data[DOMAIN]["limiter"] = OutboundLimiter(
+        hass.data[DOMAIN].get(CONF_RATE_LIMITS, DEFAULT_RATE_LIMITS),
+        hass.data[DOMAIN].get(CONF_RATE_BURST),
+    )
+
+    # Index der Hue-Räume/-Zonen für gebündelte Befehle
+    # (eigener Schlüssel – unter CONF_HUE_GROUPS steht der YAML-Schalter)
+    if hass.data[DOMAIN].get(CONF_HUE_GROUPS, DEFAULT_HUE_GROUPS):
+        hass.data[DOMAIN]["hue_group_index"] = HueGroupIndex(hass)
+
+    # Ein gemeinsamer Timer für den Ablauf aller Helligkeits-Caches
+    hass.data[DOMAIN]["cache_expiry"] = ExpiryWheel(hass)
+    hass.data[DOMAIN]["brightness_cache"] = BrightnessCacheManager(
+        hass.data[DOMAIN]["cache_expiry"],
+        hass.data[DOMAIN].get(CONF_BRIGHTNESS_CACHE_SIZE, DEFAULT_BRIGHTNESS_CACHE_SIZE),
+        hass.data[DOMAIN].get(CONF_BRIGHTNESS_CACHE_CELLS, DEFAULT_BRIGHTNESS_CACHE_CELLS),
+    )
+
+    # Fähigkeits-Fingerprints der Lampen, von allen Gruppen geteilt
+    hass.data[DOMAIN]["capabilities"] = CapabilityRegistry()
+
+    # Zuletzt gesendeter/bestätigter Stand je Lampe (gruppenübergreifend)
+    hass.data[DOMAIN]["sent_states"] = SentStateTable()
+
+    # Flight-Recorder (Ringpuffer mit Trace-Einträgen aller Gruppen)
+    hass.data[DOMAIN]["trace"] = FlightRecorder()
+
+    # Geladene Gruppen-Entities {unique_id: CustomLightGroup} (für die Diagnose)
+    hass.data[DOMAIN]["group_entities"] = {}
+
+    # Latenz Befehl -> Bestätigung pro Gruppe und Lampe
+    hass.data[DOMAIN]["latency"] = LatencyTracker()
+
+    # Ein gemeinsamer state_changed-Dispatcher für alle Gruppen
+    hass.data[DOMAIN]["state_dispatcher"] = StateChangeDispatcher(
+        hass, hass.data[DOMAIN]["sent_states"], hass.data[DOMAIN]["latency"]
+    )
+
+    # Services (z. B. light_group_dimmer.dump_trace)
+    async_register_services(hass)
+
     # Prüfen, ob bereits ein Master-Eintrag existiert
     already_master = any(
         entry.data.get(CONF_TYPE) == "master"
@@ -104,6 +218,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             new_delay = entry.options.get(CONF_DELAY, entry.data.get(CONF_DELAY, DEFAULT_DELAY))
             hass.data[DOMAIN][CONF_DELAY] = new_delay
             _LOGGER.info("Aktueller Delay in hass.data: %s (über config entry)", new_delay)
+            new_solver = entry.options.get(CONF_SOLVER, entry.data.get(CONF_SOLVER, DEFAULT_SOLVER))
+            hass.data[DOMAIN][CONF_SOLVER] = new_solver
+            _LOGGER.info("Aktueller Solver in hass.data: %s (über config entry)", new_solver)
 
     elif entry_type == "group":
         # Gruppen-Eintrag, der im UI erstellt wurde
@@ -157,5 +274,6 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if entry_type == "master":
         # Wenn der Master entfernt wird, auf Default zurücksetzen
         hass.data[DOMAIN][CONF_DELAY] = DEFAULT_DELAY
+        hass.data[DOMAIN][CONF_SOLVER] = DEFAULT_SOLVER
     # Bei group-Einträgen ggf. Daten entfernen
     return True
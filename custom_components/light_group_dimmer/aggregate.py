@@ -0,0 +1,151 @@
+"""
+Inkrementelle Zustands-Aggregation für eine Lichtgruppe.
+
+Statt bei jeder Änderung einer Lampe alle Mitglieder neu einzulesen, hält
+GroupAggregator pro Lampe einen geparsten Snapshot sowie laufende Summen und
+Zähler. Ein state_changed-Event zieht den alten Beitrag der Lampe ab und
+addiert den neuen – die Gruppenwerte sind danach ohne Rescan verfügbar.
+"""
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_HS_COLOR,
+    ATTR_EFFECT,
+    ATTR_XY_COLOR,
+)
+
+ATTR_COLOR_TEMP = "color_temp"
+ATTR_RGB_COLOR = "rgb_color"
+
+# Mittelwerte über eingeschaltete Lampen
+SUM_FIELDS = ("brightness", "kelvin", "color_temp")
+# Erster Wert (in Reihenfolge der Gruppenmitglieder) einer eingeschalteten Lampe
+FIRST_FIELDS = ("hs_color", "rgb_color", "xy_color", "effect")
+
+
+class MemberSnapshot:
+    """Geparster Zustand einer Mitglieds-Lampe."""
+
+    __slots__ = (
+        "on", "brightness", "kelvin", "color_temp", "hs_color", "rgb_color",
+        "xy_color", "effect",
+    )
+
+    def __init__(self, state, mired_to_kelvin):
+        attributes = state.attributes
+        self.on = state.state == "on"
+        self.brightness = attributes.get(ATTR_BRIGHTNESS)
+        mired = attributes.get(ATTR_COLOR_TEMP)
+        self.kelvin = mired_to_kelvin(mired) if mired else None
+        self.color_temp = mired
+        self.hs_color = attributes.get(ATTR_HS_COLOR)
+        self.rgb_color = attributes.get(ATTR_RGB_COLOR)
+        self.xy_color = attributes.get(ATTR_XY_COLOR)
+        self.effect = attributes.get(ATTR_EFFECT)
+
+
+class GroupAggregator:
+    """Laufende Aggregation über die Mitglieder einer Gruppe."""
+
+    def __init__(self, entity_ids, mired_to_kelvin):
+        self._order = {entity_id: index for index, entity_id in enumerate(entity_ids)}
+        self._mired_to_kelvin = mired_to_kelvin
+        self._members = {}
+        self._on_count = 0
+        self._sums = dict.fromkeys(SUM_FIELDS, 0)
+        self._counts = dict.fromkeys(SUM_FIELDS, 0)
+        self._first = {field: {} for field in FIRST_FIELDS}  # {field: {index: value}}
+        self._first_index = dict.fromkeys(FIRST_FIELDS)  # kleinster Index, None = neu suchen
+
+    def rebuild(self, get_state):
+        """Kompletter Neuaufbau, z. B. beim Hinzufügen der Entity."""
+        for entity_id in list(self._members):
+            self.update(entity_id, None)
+        for entity_id in self._order:
+            self.update(entity_id, get_state(entity_id))
+
+    def update(self, entity_id, state):
+        """Ersetzt den Beitrag einer Lampe durch ihren neuen Zustand (None = entfernt)."""
+        index = self._order.get(entity_id)
+        if index is None:
+            return
+        old = self._members.pop(entity_id, None)
+        if old is not None:
+            self._apply(index, old, -1)
+        if state is not None:
+            new = MemberSnapshot(state, self._mired_to_kelvin)
+            self._members[entity_id] = new
+            self._apply(index, new, 1)
+
+    def _apply(self, index, snapshot, sign):
+        if not snapshot.on:
+            return
+        self._on_count += sign
+        for field in SUM_FIELDS:
+            value = getattr(snapshot, field)
+            if value is not None:
+                self._sums[field] += sign * value
+                self._counts[field] += sign
+        for field in FIRST_FIELDS:
+            value = getattr(snapshot, field)
+            if value is None:
+                continue
+            first_index = self._first_index[field]
+            if sign > 0:
+                self._first[field][index] = value
+                if first_index is not None and index < first_index:
+                    self._first_index[field] = index
+            else:
+                self._first[field].pop(index, None)
+                if first_index == index:
+                    self._first_index[field] = None
+
+    def _average(self, field):
+        count = self._counts[field]
+        if not count:
+            return None
+        return self._sums[field] / count
+
+    def _first_value(self, field):
+        values = self._first[field]
+        if not values:
+            return None
+        index = self._first_index[field]
+        if index is None:
+            index = self._first_index[field] = min(values)
+        return values[index]
+
+    @property
+    def is_on(self):
+        return self._on_count > 0
+
+    @property
+    def brightness(self):
+        average = self._average("brightness")
+        return round(average) if average is not None else 0
+
+    @property
+    def color_temp_kelvin(self):
+        average = self._average("kelvin")
+        return int(round(average)) if average is not None else None
+
+    @property
+    def color_temp(self):
+        average = self._average("color_temp")
+        return round(average) if average is not None else None
+
+    @property
+    def hs_color(self):
+        return self._first_value("hs_color")
+
+    @property
+    def rgb_color(self):
+        return self._first_value("rgb_color")
+
+    @property
+    def xy_color(self):
+        return self._first_value("xy_color")
+
+    @property
+    def effect(self):
+        return self._first_value("effect")
@@ -0,0 +1,151 @@
+"""
+Integrationsweiter Manager für die Helligkeits-Caches aller Gruppen.
+
+Ein Snapshot hält die IST-Helligkeiten einer Gruppe zu Beginn einer
+Slider-Bewegung plus die lazy gefüllte Zieltabelle und die Warmstart-Zustände.
+Statt loser Dicts pro Gruppe liegen alle Snapshots hier: mit Obergrenze für
+die Anzahl und für die gespeicherten Lampenwerte (LRU-Verdrängung), mit
+Treffer-/Fehl-/Ablaufzählern und einer Übersicht für Diagnosezwecke.
+"""
+
+import time
+from collections import OrderedDict
+from functools import partial
+
+
+class BrightnessSnapshot:
+    """Cache-Eintrag einer Gruppe."""
+
+    __slots__ = (
+        "group_brightness", "lamp_brightnesses", "targets", "warm_states",
+        "created", "last_used", "hits",
+    )
+
+    def __init__(self, group_brightness, lamp_brightnesses):
+        self.group_brightness = group_brightness
+        self.lamp_brightnesses = lamp_brightnesses  # {entity_id: brightness}
+        self.targets = {}  # Zieltabelle {ziel: {entity_id: brightness}}, wird lazy gefüllt
+        self.warm_states = {}  # Float-Zustände {erreichter Mittelwert: {entity_id: float}} für Warmstarts
+        self.created = self.last_used = time.monotonic()
+        self.hits = 0
+
+    @property
+    def cells(self):
+        """Anzahl gespeicherter Lampenwerte (Maß für den Speicherbedarf)."""
+        return len(self.lamp_brightnesses) * (1 + len(self.targets) + len(self.warm_states))
+
+
+class BrightnessCacheManager:
+    """Alle Snapshots {key: BrightnessSnapshot} mit LRU-Grenzen und Ablauf über das ExpiryWheel."""
+
+    def __init__(self, expiry, max_snapshots, max_cells):
+        self._expiry = expiry
+        self.max_snapshots = max_snapshots
+        self.max_cells = max_cells
+        self._snapshots = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.trimmed = 0
+
+    def get(self, key):
+        """Snapshot für key oder None (zählt Treffer/Fehlschläge)."""
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        snapshot.hits += 1
+        return snapshot
+
+    def create(self, key, group_brightness, lamp_brightnesses, delay):
+        """Legt einen neuen Snapshot an (ersetzt einen vorhandenen) und startet die Frist."""
+        self.remove(key)
+        snapshot = BrightnessSnapshot(group_brightness, lamp_brightnesses)
+        self._snapshots[key] = snapshot
+        self.touch(key, delay)
+        return snapshot
+
+    def touch(self, key, delay):
+        """Frist verschieben, als zuletzt benutzt markieren und Grenzen durchsetzen."""
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return
+        snapshot.last_used = time.monotonic()
+        self._snapshots.move_to_end(key)
+        self._expiry.async_schedule(key, delay, partial(self._expire, key))
+        self._enforce(key)
+
+    def remove(self, key):
+        if self._snapshots.pop(key, None) is not None:
+            self._expiry.async_cancel(key)
+            return True
+        return False
+
+    def _expire(self, key):
+        if self._snapshots.pop(key, None) is not None:
+            self.expirations += 1
+
+    def _enforce(self, current):
+        """Älteste Snapshots verdrängen, bis Anzahl und Lampenwerte unter den Grenzen liegen."""
+        while len(self._snapshots) > self.max_snapshots:
+            self._evict_oldest()
+        cells = sum(snapshot.cells for snapshot in self._snapshots.values())
+        while cells > self.max_cells and len(self._snapshots) > 1:
+            cells -= self._evict_oldest()
+        if cells > self.max_cells:
+            # Ein einzelner Snapshot ist zu groß: Zieltabelle und Warmstarts verwerfen
+            snapshot = self._snapshots[current]
+            snapshot.targets.clear()
+            snapshot.warm_states.clear()
+            self.trimmed += 1
+
+    def _evict_oldest(self):
+        key, snapshot = self._snapshots.popitem(last=False)
+        self._expiry.async_cancel(key)
+        self.evictions += 1
+        return snapshot.cells
+
+    def inspect(self):
+        """Übersicht aller Snapshots (für Diagnose/Logging)."""
+        return [self.describe(key) for key in self._snapshots]
+
+    def describe(self, key, detail=False):
+        """
+        Übersicht eines Snapshots oder None – zählt nicht als Treffer/Fehlschlag.
+        Mit detail=True inkl. Ausgangswerten und Zielen der Zieltabelle.
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+        now = time.monotonic()
+        description = {
+            "key": list(key) if isinstance(key, tuple) else key,
+            "group_brightness": snapshot.group_brightness,
+            "lamps": len(snapshot.lamp_brightnesses),
+            "targets": len(snapshot.targets),
+            "warm_states": len(snapshot.warm_states),
+            "cells": snapshot.cells,
+            "hits": snapshot.hits,
+            "age": round(now - snapshot.created, 3),
+            "idle": round(now - snapshot.last_used, 3),
+            "expires_in": self._expiry.remaining(key),
+        }
+        if detail:
+            description["lamp_brightnesses"] = dict(snapshot.lamp_brightnesses)
+            description["target_values"] = sorted(snapshot.targets)
+        return description
+
+    def stats(self):
+        return {
+            "live": len(self._snapshots),
+            "cells": sum(snapshot.cells for snapshot in self._snapshots.values()),
+            "max_snapshots": self.max_snapshots,
+            "max_cells": self.max_cells,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "trimmed": self.trimmed,
+        }
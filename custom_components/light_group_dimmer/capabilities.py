@@ -0,0 +1,139 @@
+"""
+Fähigkeiten (Farbmodi, Effektliste) einer Lichtgruppe mit Cache.
+
+Farbmodi und Effekte einer Lampe ändern sich praktisch nie, wurden aber bei
+jedem Update über alle Mitglieder neu vereinigt, bereinigt und sortiert.
+GroupCapabilities berechnet das Ergebnis einmal und verwirft es nur, wenn
+ein state_changed-Event einer Lampe andere Fähigkeiten meldet. Die
+Fingerprints pro Lampe werden integrationsweit geteilt: gleiche Lampenmodelle
+verweisen auf dasselbe Capabilities-Objekt, ein Vergleich ist ein "is".
+"""
+
+from homeassistant.components.light import ATTR_SUPPORTED_COLOR_MODES
+
+ATTR_EFFECT_LIST = "effect_list"
+
+# Farbmodi, die die Gruppe überhaupt anbieten kann
+VALID_COLOR_MODES = {"color_temp", "xy", "hs", "brightness", "onoff", "rgb", "rgbw", "rgbww"}
+COLOR_MODES_WITH_COLOR = ("hs", "rgb", "rgbw", "rgbww", "xy")
+
+
+def normalize_color_modes(modes):
+    """Bereinigt die Vereinigung der Farbmodi aller Mitglieder nach den Gruppenregeln."""
+    modes = {mode for mode in modes if mode in VALID_COLOR_MODES}
+
+    # Entferne 'onoff', wenn es andere Modi gibt
+    if "onoff" in modes and len(modes) > 1:
+        modes.discard("onoff")
+
+    # Kombination (xy, color_temp): xy -> hs
+    if "xy" in modes and "color_temp" in modes:
+        modes.discard("xy")
+        modes.add("hs")
+
+    # brightness ist in Farbe/Farbtemperatur enthalten
+    has_color = any(mode in modes for mode in COLOR_MODES_WITH_COLOR)
+    if (has_color or "color_temp" in modes) and "brightness" in modes:
+        modes.discard("brightness")
+    return modes
+
+
+class Capabilities:
+    """Fingerprint der Fähigkeiten einer Lampe (unveränderlich, geteilt)."""
+
+    __slots__ = ("color_modes", "effect_list")
+
+    def __init__(self, color_modes, effect_list):
+        self.color_modes = color_modes
+        self.effect_list = effect_list
+
+
+class CapabilityRegistry:
+    """Integrationsweiter Pool der Capabilities-Objekte, ein Objekt pro Fingerprint."""
+
+    def __init__(self):
+        self._interned = {}  # {(farbmodi, effekte): Capabilities}
+        self.lookups = 0
+
+    def intern(self, state):
+        """Capabilities-Objekt für den State einer Lampe (None = keine Fähigkeiten)."""
+        self.lookups += 1
+        if state is None:
+            key = ((), ())
+        else:
+            attributes = state.attributes
+            key = (
+                tuple(attributes.get(ATTR_SUPPORTED_COLOR_MODES) or ()),
+                tuple(attributes.get(ATTR_EFFECT_LIST) or ()),
+            )
+        capabilities = self._interned.get(key)
+        if capabilities is None:
+            capabilities = self._interned[key] = Capabilities(*key)
+        return capabilities
+
+    def stats(self):
+        return {"fingerprints": len(self._interned), "lookups": self.lookups}
+
+
+class GroupCapabilities:
+    """Gecachte Farbmodi und Effektliste einer Gruppe."""
+
+    def __init__(self, registry, entity_ids):
+        self._registry = registry
+        self._entity_ids = list(entity_ids)
+        self._members = {}  # {entity_id: Capabilities}
+        self._color_modes = None  # None = neu berechnen
+        self._effect_list = None
+        self.invalidations = 0
+        self.computations = 0
+
+    def rebuild(self, get_state):
+        """Kompletter Neuaufbau, z. B. beim Hinzufügen der Entity."""
+        for entity_id in self._entity_ids:
+            self._members[entity_id] = self._registry.intern(get_state(entity_id))
+        self._invalidate()
+
+    def update(self, entity_id, state):
+        """Neuer State einer Lampe; True, wenn sich ihre Fähigkeiten geändert haben."""
+        capabilities = self._registry.intern(state)
+        if self._members.get(entity_id) is capabilities:
+            return False
+        self._members[entity_id] = capabilities
+        self._invalidate()
+        return True
+
+    def _invalidate(self):
+        self._color_modes = None
+        self._effect_list = None
+        self.invalidations += 1
+
+    def _compute(self):
+        modes = set()
+        effects = set()
+        for capabilities in set(self._members.values()):
+            modes.update(capabilities.color_modes)
+            effects.update(capabilities.effect_list)
+        self._color_modes = normalize_color_modes(modes)
+        self._effect_list = sorted(effects)
+        self.computations += 1
+
+    @property
+    def color_modes(self):
+        """Bereinigte Farbmodi der Gruppe (geteiltes Objekt – nicht verändern)."""
+        if self._color_modes is None:
+            self._compute()
+        return self._color_modes
+
+    @property
+    def effect_list(self):
+        """Sortierte Vereinigung aller Effekte (geteiltes Objekt – nicht verändern)."""
+        if self._effect_list is None:
+            self._compute()
+        return self._effect_list
+
+    def stats(self):
+        return {
+            "invalidations": self.invalidations,
+            "computations": self.computations,
+            "distinct_fingerprints": len(set(self._members.values())),
+        }
@@ -14,6 +14,9 @@ from .const import (
     DEFAULT_DELAY,
     CONF_NAME,
     CONF_ENTITIES,
+    CONF_SOLVER,
+    SOLVERS,
+    DEFAULT_SOLVER,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -118,6 +121,7 @@ class LightGroupDimmerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """
         if user_input is not None:
             delay_val = user_input.get(CONF_DELAY, DEFAULT_DELAY)
+            solver_val = user_input.get(CONF_SOLVER, DEFAULT_SOLVER)
             await self.async_set_unique_id("master")
             self._abort_if_unique_id_configured()
 
@@ -126,11 +130,13 @@ class LightGroupDimmerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data={
                     CONF_TYPE: "master",
                     CONF_DELAY: delay_val,
+                    CONF_SOLVER: solver_val,
                 }
             )
 
         schema = vol.Schema({
-            vol.Required(CONF_DELAY, default=DEFAULT_DELAY): cv.positive_int
+            vol.Required(CONF_DELAY, default=DEFAULT_DELAY): cv.positive_int,
+            vol.Optional(CONF_SOLVER, default=DEFAULT_SOLVER): vol.In(SOLVERS),
         })
         return self.async_show_form(step_id="master", data_schema=schema)
 
@@ -211,9 +217,10 @@ class LightGroupDimmerOptionsFlow(config_entries.OptionsFlow):
         # Kein YAML => user_input auswerten
         if user_input is not None:
             new_delay = user_input.get(CONF_DELAY, DEFAULT_DELAY)
+            new_solver = user_input.get(CONF_SOLVER, DEFAULT_SOLVER)
             return self.async_create_entry(
                 title="",
-                data={CONF_DELAY: new_delay},
+                data={CONF_DELAY: new_delay, CONF_SOLVER: new_solver},
             )
 
         # Aktuellen Delay auslesen
@@ -222,8 +229,13 @@ class LightGroupDimmerOptionsFlow(config_entries.OptionsFlow):
             CONF_DELAY,
             entry.data.get(CONF_DELAY, DEFAULT_DELAY)
         )
+        current_solver = entry.options.get(
+            CONF_SOLVER,
+            entry.data.get(CONF_SOLVER, DEFAULT_SOLVER)
+        )
         schema = vol.Schema({
             vol.Required(CONF_DELAY, default=current_delay): cv.positive_int,
+            vol.Optional(CONF_SOLVER, default=current_solver): vol.In(SOLVERS),
         })
         return self.async_show_form(step_id="master_options", data_schema=schema)
 
@@ -7,3 +7,41 @@ DEFAULT_DELAY = 5
 CONF_NAME = "name"
 CONF_ENTITIES = "entities"
 CONF_GROUPS = "groups"   # Für das zentrale Array
+
+# Helligkeits-Solver: "iterative" (bisherige 150er-Schleife) oder "scaling" (geschlossene Lösung)
+CONF_SOLVER = "solver"
+SOLVER_ITERATIVE = "iterative"
+SOLVER_SCALING = "scaling"
+SOLVERS = [SOLVER_ITERATIVE, SOLVER_SCALING]
+DEFAULT_SOLVER = SOLVER_ITERATIVE
+
+# Integrationsweiter LRU-Cache für Solver-Ergebnisse (0 = aus)
+CONF_SOLVER_CACHE_SIZE = "solver_cache_size"
+DEFAULT_SOLVER_CACHE_SIZE = 256
+
+# Obergrenzen für die Helligkeits-Caches aller Gruppen (Snapshots / gespeicherte Lampenwerte)
+CONF_BRIGHTNESS_CACHE_SIZE = "brightness_cache_size"
+DEFAULT_BRIGHTNESS_CACHE_SIZE = 128
+CONF_BRIGHTNESS_CACHE_CELLS = "brightness_cache_cells"
+DEFAULT_BRIGHTNESS_CACHE_CELLS = 100000
+
+# Mindestabstand (Sekunden) zwischen zwei ausgeführten Befehlen pro Gruppe
+CONF_MIN_DISPATCH_INTERVAL = "min_dispatch_interval"
+DEFAULT_MIN_DISPATCH_INTERVAL = 0.0
+
+# Rate-Limits für ausgehende Befehle: {integration oder config_entry_id: Befehle pro Sekunde}
+CONF_RATE_LIMITS = "rate_limits"
+DEFAULT_RATE_LIMITS = {}  # opt-in, z. B. {"hue": 10}
+CONF_RATE_BURST = "rate_burst"
+
+# Gleiche Befehle an native Hue-Räume/-Zonen (grouped_light) auslagern
+CONF_HUE_GROUPS = "hue_groups"
+DEFAULT_HUE_GROUPS = True
+
+# Diagnose-Sensoren mit der Latenz (p50/p95/p99) vom Befehl bis zur Bestätigung
+CONF_LATENCY_SENSORS = "latency_sensors"
+DEFAULT_LATENCY_SENSORS = False
+
+# Zeitfenster (Sekunden), in dem Lampen-Events zu einem Gruppen-Update zusammengefasst werden
+CONF_UPDATE_WINDOW = "update_window"
+DEFAULT_UPDATE_WINDOW = 0.2
@@ -0,0 +1,69 @@
+"""
+Diagnose-Download für einen Config-Eintrag.
+
+Alles wird erst beim Download aus den vorhandenen Strukturen zusammengestellt
+(Gruppen-Entities, Caches, Zähler); im Betrieb kostet die Diagnose nichts.
+"""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    CONF_DELAY,
+    CONF_SOLVER,
+    CONF_TYPE,
+)
+from .light import get_entry_groups, group_unique_id
+
+# Integrationsweite Objekte mit stats()
+SHARED_COMPONENTS = (
+    "solver_cache",
+    "brightness_cache",
+    "cache_expiry",
+    "capabilities",
+    "sent_states",
+    "state_dispatcher",
+    "limiter",
+    "hue_group_index",
+    "latency",
+    "trace",
+)
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    data = hass.data.get(DOMAIN, {})
+    group_entities = data.get("group_entities", {})
+
+    groups = {}
+    for group in get_entry_groups(entry):
+        entity = group_entities.get(group_unique_id(group["name"]))
+        if entity is None:
+            groups[group["name"]] = {"members": list(group["entities"]), "loaded": False}
+        else:
+            groups[group["name"]] = entity.diagnostics()
+
+    shared = {}
+    for name in SHARED_COMPONENTS:
+        component = data.get(name)
+        if component is not None:
+            shared[name] = component.stats()
+
+    return {
+        "entry": {
+            "type": entry.data.get(CONF_TYPE),
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "settings": {
+            "delay": data.get(CONF_DELAY),
+            "solver": data.get(CONF_SOLVER),
+            "yaml_config": data.get("yaml_config"),
+        },
+        "groups": groups,
+        "shared": shared,
+        "trace": {
+            group["name"]: data["trace"].dump(group["name"])
+            for group in get_entry_groups(entry)
+        } if "trace" in data else {},
+    }
@@ -0,0 +1,302 @@
+"""
+Versand der Service-Calls an die Lampen der Gruppe.
+
+Statt für jede Lampe einen eigenen light.turn_on-Aufruf abzusetzen, werden
+Lampen mit identischen Daten (gleiche Helligkeit, Farbe, Effekt ...) zu einem
+Aufruf mit entity_id-Liste zusammengefasst.
+
+Zusätzlich sorgt LatestWinsScheduler dafür, dass pro Gruppe immer nur ein
+Befehl gleichzeitig läuft und bei einer Slider-Flut nur der neueste Stand
+berechnet und verschickt wird.
+"""
+
+import asyncio
+import time
+
+from .latency import BRIGHTNESS_TOLERANCE, LATENCY_TIMEOUT, PENDING_PER_LAMP
+
+# Farb-Attribute schließen sich gegenseitig aus: kommt ein neuer Farbwert,
+# fliegen die alten Farbwerte aus einem wartenden Befehl raus.
+COLOR_KEYS = ("hs_color", "xy_color", "rgb_color", "color_temp", "color_temp_kelvin")
+
+# Attribute, die SentStateTable pro Lampe verfolgt
+TRACKED_KEYS = ("brightness", "hs_color", "xy_color", "color_temp", "effect")
+
+
+def freeze(value):
+    """Macht Listen/Dicts hashbar, damit sie als Gruppierungsschlüssel taugen."""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    return value
+
+
+def coalesce_service_data(service_data_list):
+    """
+    Fasst service_data-Dicts mit gleichem Inhalt (ohne entity_id) zusammen.
+    Reihenfolge: erste Vorkommen bleiben vorne. Doppelte Entities fallen weg.
+    """
+    grouped = {}
+    for data in service_data_list:
+        payload = {key: value for key, value in data.items() if key != "entity_id"}
+        key = freeze(payload)
+        entry = grouped.get(key)
+        if entry is None:
+            entry = grouped[key] = (payload, {})
+        entity_ids = data.get("entity_id", [])
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        for entity_id in entity_ids:
+            entry[1][entity_id] = None
+
+    return [
+        {"entity_id": list(entity_ids), **payload}
+        for payload, entity_ids in grouped.values()
+    ]
+
+
+def _entity_ids(data):
+    entity_ids = data.get("entity_id", [])
+    if isinstance(entity_ids, str):
+        return [entity_ids]
+    return entity_ids
+
+
+class SentStateTable:
+    """
+    Letzter bekannter Stand je Lampe: entweder zuletzt von uns gesendet oder
+    per state_changed bestätigt. Damit lassen sich turn_on-Daten herausfiltern,
+    die an der Lampe nichts ändern würden (z. B. Lampen, die beim Dimmen an
+    den Enden des Bereichs schon auf 0/255 stehen).
+
+    Gesendete Werte stehen pro Lampe in einer Liste unbestätigter Befehle
+    (älteste zuerst); maßgeblich ist der neueste. Eine Bestätigung räumt nur
+    den Befehl, dessen Werte sie meldet (Helligkeit mit BRIGHTNESS_TOLERANCE),
+    und alle älteren ab – eine verspätete Bestätigung eines alten Werts lässt
+    den neueren also stehen. Ohne Bestätigung verfällt ein Befehl nach ttl
+    Sekunden (das Bestätigungsfenster der Latenzmessung): verwirft die Bridge
+    ihn, wird derselbe Wert danach wieder gesendet.
+    """
+
+    def __init__(self, ttl=LATENCY_TIMEOUT):
+        self.ttl = ttl
+        self._lamps = {}  # bestätigt: {entity_id: {"state": "on"/"off", key: frozen value}}
+        self._sent = {}  # unbestätigt: {entity_id: [(stand, gesendete Keys, seit)]}, älteste zuerst
+        self.suppressed = 0
+        self.expired = 0
+
+    def confirm(self, entity_id, state):
+        """Übernimmt den bestätigten Zustand aus einem state_changed-Event."""
+        if state is None:
+            self._lamps.pop(entity_id, None)
+            self._sent.pop(entity_id, None)
+            return
+        known = {"state": state.state}
+        for key in TRACKED_KEYS:
+            value = state.attributes.get(key)
+            if value is not None:
+                known[key] = freeze(value)
+        self._lamps[entity_id] = known
+
+        pending = self._sent.get(entity_id)
+        if not pending:
+            return
+        # Der neueste Befehl, den diese Meldung bestätigt; ältere sind damit überholt
+        for index in range(len(pending) - 1, -1, -1):
+            if self._matches(pending[index], known):
+                del pending[:index + 1]
+                break
+        if not pending:
+            del self._sent[entity_id]
+
+    @staticmethod
+    def _matches(sent, known):
+        values, keys, _ = sent
+        if values["state"] != known["state"]:
+            return False
+        for key in keys:
+            reported = known.get(key)
+            if key == "brightness":
+                if reported is None or abs(reported - values[key]) > BRIGHTNESS_TOLERANCE:
+                    return False
+            elif reported != values[key]:
+                return False
+        return True
+
+    def record(self, service, service_data_list):
+        """
+        Merkt sich die Service-Calls eines Befehls bis zur Bestätigung. Wird vor
+        dem Versand aufgerufen, damit auch sehr schnelle Bestätigungen sie
+        vorfinden. Liefert den Zeitstempel für discard().
+        """
+        now = time.monotonic()
+        for data in service_data_list:
+            for entity_id in _entity_ids(data):
+                if service == "turn_off":
+                    entry = ({"state": "off"}, (), now)
+                else:
+                    values = dict(self._known(entity_id, now) or {})
+                    values["state"] = "on"
+                    keys = tuple(key for key in TRACKED_KEYS if key in data)
+                    for key in keys:
+                        values[key] = freeze(data[key])
+                    entry = (values, keys, now)
+                pending = self._sent.setdefault(entity_id, [])
+                if len(pending) >= PENDING_PER_LAMP:
+                    del pending[0]
+                pending.append(entry)
+        return now
+
+    def discard(self, service_data_list, sent_at):
+        """Nimmt die mit record() gemerkten Werte wieder zurück (Versand fehlgeschlagen)."""
+        for data in service_data_list:
+            for entity_id in _entity_ids(data):
+                pending = self._sent.get(entity_id)
+                if not pending:
+                    continue
+                pending[:] = [entry for entry in pending if entry[2] != sent_at]
+                if not pending:
+                    del self._sent[entity_id]
+
+    def _known(self, entity_id, now):
+        """Neuester unbestätigter Stand, solange er nicht abgelaufen ist, sonst der bestätigte."""
+        pending = self._sent.get(entity_id)
+        if pending:
+            while pending and now - pending[0][2] > self.ttl:
+                del pending[0]
+                self.expired += 1
+            if pending:
+                return pending[-1][0]
+            del self._sent[entity_id]
+        return self._lamps.get(entity_id)
+
+    def filter(self, service_data_list):
+        """
+        Entfernt aus turn_on-Daten alle Werte, die die Lampe schon hat.
+        Bleibt außer entity_id nichts übrig, fällt der Eintrag ganz weg.
+        Lampen ohne bekannten Stand oder im Zustand "off" werden immer gesendet.
+        """
+        now = time.monotonic()
+        result = []
+        for data in service_data_list:
+            entity_id = data.get("entity_id")
+            known = self._known(entity_id, now) if isinstance(entity_id, str) else None
+            if known is None or known.get("state") != "on" or len(data) == 1:
+                result.append(data)
+                continue
+            changed = {
+                key: value for key, value in data.items()
+                if key == "entity_id" or key not in TRACKED_KEYS or known.get(key) != freeze(value)
+            }
+            if len(changed) > 1:
+                result.append(changed)
+            else:
+                self.suppressed += 1
+        return result
+
+    def stats(self):
+        return {
+            "lamps": len(self._lamps),
+            "unconfirmed": sum(len(pending) for pending in self._sent.values()),
+            "suppressed": self.suppressed,
+            "expired": self.expired,
+        }
+
+
+class LatestWinsScheduler:
+    """
+    Befehls-Scheduler pro Gruppe (latest wins).
+
+    - Es läuft immer nur ein Befehl gleichzeitig.
+    - Kommen währenddessen neue Befehle, wartet nur ein einziger: neuere
+      turn_on-Daten werden in den wartenden Befehl gemischt (neuester Wert
+      gewinnt), ein Wechsel zwischen turn_on/turn_off ersetzt ihn komplett.
+    - Zwischen zwei Ausführungen liegen mindestens min_interval Sekunden.
+    - Der letzte Befehl wird immer ausgeführt. Jeder Aufrufer wartet, bis sein
+      Befehl (oder der Befehl, der ihn ersetzt hat) abgearbeitet ist.
+    """
+
+    def __init__(self, handlers, min_interval=0.0):
+        self._handlers = handlers  # {"turn_on": coroutine_fn, "turn_off": coroutine_fn}
+        self.min_interval = min_interval
+        self._pending = None  # (service, kwargs, [futures])
+        self._worker = None
+        self._last_dispatch = None
+        self.submitted = 0
+        self.collapsed = 0
+        self.dispatched = 0
+
+    @property
+    def pending(self):
+        return self._pending is not None
+
+    async def async_submit(self, service, kwargs):
+        """Reiht einen Befehl ein und wartet, bis er angewendet wurde."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self.submitted += 1
+
+        if self._pending is None:
+            self._pending = (service, dict(kwargs), [waiter])
+        else:
+            pending_service, pending_kwargs, waiters = self._pending
+            self.collapsed += 1
+            if service == pending_service == "turn_on":
+                if any(key in kwargs for key in COLOR_KEYS):
+                    pending_kwargs = {
+                        key: value for key, value in pending_kwargs.items() if key not in COLOR_KEYS
+                    }
+                kwargs = {**pending_kwargs, **kwargs}
+            waiters.append(waiter)
+            self._pending = (service, dict(kwargs), waiters)
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        await waiter
+
+    async def _run(self):
+        while self._pending is not None:
+            if self._last_dispatch is not None and self.min_interval > 0:
+                wait = self._last_dispatch + self.min_interval - time.monotonic()
+                if wait > 0:
+                    # Während wir warten, können weitere Befehle zusammenfallen
+                    await asyncio.sleep(wait)
+
+            service, kwargs, waiters = self._pending
+            self._pending = None
+            self._last_dispatch = time.monotonic()
+            self.dispatched += 1
+            try:
+                await self._handlers[service](**kwargs)
+            except asyncio.CancelledError:
+                for waiter in waiters:
+                    waiter.cancel()
+                raise
+            except Exception as err:  # an alle wartenden Aufrufer weiterreichen
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(err)
+            else:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+
+    def cancel(self):
+        """Bricht laufende und wartende Befehle ab (z. B. beim Entladen)."""
+        if self._pending is not None:
+            for waiter in self._pending[2]:
+                waiter.cancel()
+            self._pending = None
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def stats(self):
+        return {
+            "min_interval": self.min_interval,
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "collapsed": self.collapsed,
+            "dispatched": self.dispatched,
+        }
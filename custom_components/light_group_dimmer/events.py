@@ -0,0 +1,142 @@
+"""
+Gemeinsamer state_changed-Dispatcher für alle Lichtgruppen.
+
+Früher hat jede Gruppe pro Mitglied einen eigenen Listener registriert (und
+nie wieder abgemeldet). Lampen in mehreren Gruppen wurden so mehrfach
+verarbeitet. Jetzt gibt es pro Lampe genau ein Abo; ein Index
+entity_id -> Gruppen verteilt das Event nur an die betroffenen Gruppen.
+"""
+
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+
+class StateChangeDispatcher:
+    """Integrationsweiter Dispatcher mit inkrementell gepflegten Abos."""
+
+    def __init__(self, hass, sent_states=None, latency=None):
+        self.hass = hass
+        self._sent_states = sent_states
+        self._latency = latency
+        self._index = {}  # {entity_id: {handler_id: HassJob}}
+        self._unsubs = {}  # {entity_id: unsubscribe}
+        self.events = 0
+        self.deliveries = 0
+
+    @callback
+    def async_register(self, entity_ids, handler):
+        """
+        Meldet handler für entity_ids an. Neue Lampen bekommen ein Abo, schon
+        bekannte nicht. Rückgabe: Funktion zum Abmelden.
+        """
+        job = HassJob(handler)
+        handler_id = id(job)
+        new_entities = []
+        for entity_id in entity_ids:
+            handlers = self._index.setdefault(entity_id, {})
+            if not handlers:
+                new_entities.append(entity_id)
+            handlers[handler_id] = job
+        for entity_id in new_entities:
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self.hass, entity_id, self._async_dispatch
+            )
+
+        @callback
+        def _unregister():
+            for entity_id in entity_ids:
+                handlers = self._index.get(entity_id)
+                if handlers is None:
+                    continue
+                handlers.pop(handler_id, None)
+                if not handlers:
+                    del self._index[entity_id]
+                    unsub = self._unsubs.pop(entity_id, None)
+                    if unsub is not None:
+                        unsub()
+
+        return _unregister
+
+    @callback
+    def _async_dispatch(self, event):
+        entity_id = event.data.get("entity_id")
+        new_state = event.data.get("new_state")
+        self.events += 1
+        # Einmal pro Event statt einmal pro Gruppe
+        if self._sent_states is not None:
+            self._sent_states.confirm(entity_id, new_state)
+        if self._latency is not None:
+            self._latency.confirm(entity_id, new_state)
+        for job in list(self._index.get(entity_id, {}).values()):
+            self.deliveries += 1
+            self.hass.async_run_hass_job(job, event)
+
+    @callback
+    def async_shutdown(self):
+        """Alle Abos abmelden (z. B. beim Entladen der Integration)."""
+        for unsub in self._unsubs.values():
+            unsub()
+        self._unsubs.clear()
+        self._index.clear()
+
+    def stats(self):
+        return {
+            "entities": len(self._index),
+            "subscriptions": len(self._unsubs),
+            "events": self.events,
+            "deliveries": self.deliveries,
+        }
+
+
+class TrailingCoalescer:
+    """
+    Fasst state_changed-Events einer Gruppe innerhalb eines Zeitfensters zu
+    einer einzigen Neuberechnung + einem einzigen Schreibvorgang zusammen.
+    Das Fenster startet mit dem ersten Event; alles, was danach kommt, landet
+    im nächsten Fenster – das letzte Event wird also nie verschluckt.
+    """
+
+    def __init__(self, hass, window, action):
+        self.hass = hass
+        self.window = window
+        self._action = action
+        self._handle = None
+        self._pending = 0
+        self.events = 0
+        self.writes = 0
+        self.last_batch = 0
+        self.max_batch = 0
+
+    @callback
+    def async_schedule(self):
+        """Ein Event vormerken; startet ggf. das Fenster."""
+        self.events += 1
+        self._pending += 1
+        if self._handle is None:
+            self._handle = self.hass.loop.call_later(self.window, self._async_fire)
+
+    @callback
+    def _async_fire(self):
+        self._handle = None
+        batch, self._pending = self._pending, 0
+        self.writes += 1
+        self.last_batch = batch
+        self.max_batch = max(self.max_batch, batch)
+        self._action()
+
+    @callback
+    def async_cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending = 0
+
+    def stats(self):
+        return {
+            "window": self.window,
+            "events": self.events,
+            "writes": self.writes,
+            "events_per_write": self.events / self.writes if self.writes else 0.0,
+            "last_batch": self.last_batch,
+            "max_batch": self.max_batch,
+        }
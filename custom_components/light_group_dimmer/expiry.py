@@ -0,0 +1,118 @@
+"""
+Gemeinsame Ablaufsteuerung für die Helligkeits-Caches aller Gruppen.
+
+Früher hat jeder Slider-Tick pro Gruppe einen Timer-Task abgebrochen und
+einen neuen erzeugt. ExpiryWheel hält stattdessen alle Fristen in einem
+Dict plus einem Heap und weckt die Event-Loop über genau ein loop.call_at
+für die früheste Frist. Ein Reset schreibt nur die neue Frist ins Dict; der
+alte Heap-Eintrag wird beim Aufwachen erkannt und mit der neuen Frist
+wieder eingereiht.
+"""
+
+import heapq
+import itertools
+
+from homeassistant.core import callback
+
+
+class ExpiryWheel:
+    """Integrationsweite Fristen {key: (deadline, action)} mit einem einzigen Timer."""
+
+    def __init__(self, hass):
+        self.hass = hass
+        self._deadlines = {}  # {key: (deadline, action)}
+        self._queued = {}  # {key: deadline des gültigen Heap-Eintrags}
+        self._heap = []  # [(deadline, seq, key)]
+        self._seq = itertools.count()
+        self._handle = None
+        self._handle_when = None
+        self.scheduled = 0
+        self.resets = 0
+        self.expirations = 0
+        self.wakeups = 0
+
+    @callback
+    def async_schedule(self, key, delay, action):
+        """Setzt (oder verschiebt) die Frist für key; action() läuft bei Ablauf."""
+        deadline = self.hass.loop.time() + delay
+        if key in self._deadlines:
+            self.resets += 1
+        else:
+            self.scheduled += 1
+        self._deadlines[key] = (deadline, action)
+        queued = self._queued.get(key)
+        # Spätere Frist: der vorhandene Heap-Eintrag reicht (wird beim Aufwachen verschoben)
+        if queued is None or deadline < queued:
+            self._push(key, deadline)
+
+    @callback
+    def async_cancel(self, key):
+        """Frist verwerfen; der Heap-Eintrag wird beim Aufwachen übersprungen."""
+        self._deadlines.pop(key, None)
+        self._queued.pop(key, None)
+
+    def remaining(self, key):
+        """Sekunden bis zum Ablauf von key (None = keine Frist)."""
+        entry = self._deadlines.get(key)
+        if entry is None:
+            return None
+        return max(0.0, round(entry[0] - self.hass.loop.time(), 3))
+
+    def _push(self, key, deadline):
+        self._queued[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+        self._arm()
+
+    def _arm(self):
+        if not self._heap:
+            return
+        when = self._heap[0][0]
+        if self._handle is not None:
+            if self._handle_when <= when:
+                return
+            self._handle.cancel()
+        self._handle = self.hass.loop.call_at(when, self._async_wakeup)
+        self._handle_when = when
+
+    @callback
+    def _async_wakeup(self):
+        self._handle = None
+        self._handle_when = None
+        self.wakeups += 1
+        now = self.hass.loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            queued, _, key = heapq.heappop(heap)
+            if self._queued.get(key) != queued:
+                continue  # veraltet (abgebrochen oder ersetzt)
+            deadline, action = self._deadlines[key]
+            if deadline > now:
+                # Zwischenzeitlich zurückgesetzt: mit der neuen Frist wieder einreihen
+                self._queued[key] = deadline
+                heapq.heappush(heap, (deadline, next(self._seq), key))
+                continue
+            del self._deadlines[key]
+            del self._queued[key]
+            self.expirations += 1
+            action()
+        self._arm()
+
+    @callback
+    def async_shutdown(self):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._handle_when = None
+        self._deadlines.clear()
+        self._queued.clear()
+        self._heap.clear()
+
+    def stats(self):
+        return {
+            "live": len(self._deadlines),
+            "heap": len(self._heap),
+            "scheduled": self.scheduled,
+            "resets": self.resets,
+            "expirations": self.expirations,
+            "wakeups": self.wakeups,
+        }
@@ -0,0 +1,105 @@
+"""
+Auslagern gleicher Befehle an native Hue-Räume/-Zonen (grouped_light).
+
+Die Hue-Integration legt für jeden Raum und jede Zone eine Light-Entity mit
+den Attributen is_hue_group, lights (Namen aller Lampen laut Bridge) und
+entity_id (nur die Lampen, die es in HA als Entity gibt) an. Sollen mehrere
+Lampen denselben Wert bekommen und bilden die Mitglieder eines Hue-Raums eine
+Teilmenge davon, geht ein einziger Befehl an den Raum statt N Einzelbefehle –
+eine Bridge-Anfrage, und alle Lampen schalten synchron.
+
+Räume mit Lampen ohne HA-Entity werden nie genutzt: der Befehl an den Raum
+würde auch diese Lampen schalten, die nicht zur Gruppe gehören.
+"""
+
+import time
+
+# Nach so vielen Sekunden werden die Hue-Gruppen neu eingesammelt
+HUE_GROUP_TTL = 300
+
+
+def _resolved_members(state):
+    """
+    Mitglieder eines Hue-Raums als frozenset – None, wenn es kein Raum ist oder
+    die Bridge mehr Lampen kennt als HA (Lampe ohne oder mit gelöschter Entity).
+    """
+    attributes = state.attributes
+    if not attributes.get("is_hue_group"):
+        return None
+    members = frozenset(attributes.get("entity_id") or ())
+    bridge_lights = attributes.get("lights")
+    if bridge_lights is None or len(bridge_lights) != len(members):
+        return None
+    return members
+
+
+class HueGroupIndex:
+    """Integrationsweiter Index {grouped_light entity_id: frozenset(Mitglieder)}."""
+
+    def __init__(self, hass):
+        self.hass = hass
+        self._groups = {}
+        self._built = None
+        self.offloaded = 0
+        self.saved_calls = 0
+
+    def _rebuild(self):
+        groups = {}
+        for state in self.hass.states.async_all("light"):
+            members = _resolved_members(state)
+            if members and len(members) > 1:
+                groups[state.entity_id] = members
+        self._groups = groups
+        self._built = time.monotonic()
+
+    def _current_members(self, group_entity_id):
+        """Mitglieder laut aktuellem State – schützt vor einem veralteten Index."""
+        state = self.hass.states.get(group_entity_id)
+        if state is None or state.state in ("unavailable", "unknown"):
+            return None
+        return _resolved_members(state)
+
+    def cover(self, entity_ids):
+        """
+        Greedy-Abdeckung: größte Hue-Gruppen zuerst, deren Mitglieder komplett
+        in entity_ids liegen. Rückgabe (hue_gruppen, restliche_entity_ids).
+        """
+        if self._built is None or time.monotonic() - self._built > HUE_GROUP_TTL:
+            self._rebuild()
+
+        remaining = set(entity_ids)
+        candidates = sorted(
+            (
+                (len(members), group_entity_id)
+                for group_entity_id, members in self._groups.items()
+                if members <= remaining
+            ),
+            reverse=True,
+        )
+        chosen = []
+        for _, group_entity_id in candidates:
+            members = self._current_members(group_entity_id)
+            if not members or len(members) < 2 or not members <= remaining:
+                continue
+            chosen.append(group_entity_id)
+            remaining -= members
+        return chosen, [entity_id for entity_id in entity_ids if entity_id in remaining]
+
+    def offload(self, data):
+        """Ersetzt in einem Service-Call passende Lampen durch ihre Hue-Gruppe."""
+        entity_ids = data.get("entity_id", [])
+        if isinstance(entity_ids, str) or len(entity_ids) < 2:
+            return data
+        groups, rest = self.cover(entity_ids)
+        if not groups:
+            return data
+        self.offloaded += 1
+        self.saved_calls += len(entity_ids) - len(groups) - len(rest)
+        return {**data, "entity_id": groups + rest}
+
+    def stats(self):
+        return {
+            "hue_groups": len(self._groups),
+            "offloaded_calls": self.offloaded,
+            "saved_lamp_calls": self.saved_calls,
+        }
@@ -0,0 +1,183 @@
+"""
+Latenzmessung vom Befehl bis zum bestätigten Zustand der Lampe.
+
+Jeder abgesetzte Befehl wird pro Lampe mit Zeitstempel und erwartetem
+Zustand vorgemerkt. Das state_changed-Event, das diesen Zustand meldet,
+schließt die Messung ab: pro Lampe (Befehl -> Bestätigung) und pro Gruppe
+(Befehl -> Bestätigung der letzten Lampe). Die letzten Messwerte liegen in
+Ringpuffern, aus denen p50/p95/p99 erst beim Auslesen berechnet werden.
+
+Ein neuer Befehl verdrängt ältere, noch unbestätigte nicht: gemessen wird der
+Befehl, dessen Zustand die Lampe tatsächlich meldet. Erst wenn eine Lampe einen
+neueren Befehl bestätigt, gelten die älteren für sie als überholt – deren
+Gruppenmessung fällt weg und wird pro Gruppe als "unmeasured" gezählt.
+"""
+
+import time
+from collections import deque
+
+# Messwerte pro Ringpuffer
+LATENCY_WINDOW = 256
+# Ohne Bestätigung nach so vielen Sekunden gilt ein Befehl als verloren
+LATENCY_TIMEOUT = 30.0
+# Erlaubte Abweichung der gemeldeten Helligkeit (Bridges runden auf Prozent)
+BRIGHTNESS_TOLERANCE = 2
+# Höchstens so viele unbestätigte Befehle pro Lampe (Slider-Flut), ältere fallen weg
+PENDING_PER_LAMP = 16
+
+
+class RollingLatency:
+    """Die letzten Messwerte (ms) mit Perzentilen."""
+
+    __slots__ = ("samples", "count")
+
+    def __init__(self, size=LATENCY_WINDOW):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return {"samples": 0, "p50": None, "p95": None, "p99": None}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {
+            "samples": self.count,
+            "p50": round(ordered[round(0.50 * last)], 1),
+            "p95": round(ordered[round(0.95 * last)], 1),
+            "p99": round(ordered[round(0.99 * last)], 1),
+        }
+
+
+class _Command:
+    """Ein Gruppenbefehl, der auf die Bestätigung mehrerer Lampen wartet."""
+
+    __slots__ = ("group", "started", "remaining")
+
+    def __init__(self, group, started, remaining):
+        self.group = group
+        self.started = started
+        self.remaining = remaining
+
+
+class LatencyTracker:
+    """Integrationsweite Latenzmessung pro Gruppe und pro Lampe."""
+
+    def __init__(self, timeout=LATENCY_TIMEOUT):
+        self.timeout = timeout
+        self._pending = {}  # {entity_id: [(gestartet, erwartet, _Command)]}, älteste zuerst
+        self._groups = {}  # {gruppe: RollingLatency}
+        self._lamps = {}  # {entity_id: RollingLatency}
+        self._group_unmeasured = {}  # {gruppe: Gruppenbefehle ohne Messwert (überholt oder Timeout)}
+        self.superseded = 0
+        self.timeouts = 0
+
+    def expect(self, group, service, service_data_list):
+        """Merkt die Lampen eines abgesetzten Befehls vor (Daten pro Lampe, vor dem Bündeln)."""
+        now = time.monotonic()
+        expected_by_lamp = {}
+        for data in service_data_list:
+            entity_ids = data.get("entity_id")
+            if isinstance(entity_ids, str):
+                entity_ids = [entity_ids]
+            expected = (
+                "off" if service == "turn_off" else "on",
+                data.get("brightness") if service == "turn_on" else None,
+            )
+            for entity_id in entity_ids or ():
+                expected_by_lamp[entity_id] = expected
+        if not expected_by_lamp:
+            return
+        command = _Command(group, now, len(expected_by_lamp))
+        for entity_id, expected in expected_by_lamp.items():
+            pending = self._pending.setdefault(entity_id, [])
+            self._drop_expired(pending, now)
+            if len(pending) >= PENDING_PER_LAMP:
+                self._abandon(pending.pop(0)[2])
+                self.superseded += 1
+            pending.append((now, expected, command))
+
+    def confirm(self, entity_id, state):
+        """Aus dem state_changed-Event: schließt die Messung des gemeldeten Befehls ab."""
+        pending = self._pending.get(entity_id)
+        if pending is None or state is None:
+            return
+        now = time.monotonic()
+        self._drop_expired(pending, now)
+        # Der neueste Befehl, dessen Zustand die Lampe meldet
+        for index in range(len(pending) - 1, -1, -1):
+            if self._matches(pending[index][1], state):
+                break
+        else:
+            if not pending:
+                del self._pending[entity_id]
+            return
+        started, _, command = pending[index]
+        # Ältere Befehle hat die Lampe übersprungen
+        for _, _, older in pending[:index]:
+            self._abandon(older)
+        self.superseded += index
+        del pending[:index + 1]
+        if not pending:
+            del self._pending[entity_id]
+
+        self._histogram(self._lamps, entity_id).add((now - started) * 1000)
+        command.remaining -= 1
+        if command.remaining == 0:
+            self._histogram(self._groups, command.group).add((now - command.started) * 1000)
+
+    @staticmethod
+    def _matches(expected, state):
+        expected_state, expected_brightness = expected
+        if state.state != expected_state:
+            return False
+        if expected_brightness is None:
+            return True
+        brightness = state.attributes.get("brightness")
+        return brightness is not None and abs(brightness - expected_brightness) <= BRIGHTNESS_TOLERANCE
+
+    def _drop_expired(self, pending, now):
+        """Entfernt unbestätigte Befehle, die älter als timeout sind."""
+        while pending and now - pending[0][0] > self.timeout:
+            self._abandon(pending.pop(0)[2])
+            self.timeouts += 1
+
+    def _abandon(self, command):
+        # Gruppenmessung kann nicht mehr vollständig werden
+        if command.remaining > 0:
+            command.remaining = -1
+            self._group_unmeasured[command.group] = self._group_unmeasured.get(command.group, 0) + 1
+
+    @staticmethod
+    def _histogram(table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = RollingLatency()
+        return histogram
+
+    def group_summary(self, group, entity_ids=()):
+        """Perzentile der Gruppe plus die ihrer Lampen."""
+        summary = self._histogram_summary(self._groups, group)
+        summary["unmeasured"] = self._group_unmeasured.get(group, 0)
+        summary["lamps"] = {
+            entity_id: self._histogram_summary(self._lamps, entity_id)
+            for entity_id in entity_ids
+        }
+        return summary
+
+    @staticmethod
+    def _histogram_summary(table, key):
+        histogram = table.get(key)
+        return histogram.summary() if histogram is not None else RollingLatency(1).summary()
+
+    def stats(self):
+        return {
+            "pending": sum(len(pending) for pending in self._pending.values()),
+            "groups": len(self._groups),
+            "lamps": len(self._lamps),
+            "superseded": self.superseded,
+            "timeouts": self.timeouts,
+        }
@@ -1,7 +1,10 @@
 import logging
 import asyncio
 import time
+from time import perf_counter
 from asyncio import CancelledError
+from functools import partial
+from homeassistant.components import persistent_notification
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_HS_COLOR,
@@ -13,11 +16,32 @@ from homeassistant.components.light import (
     ColorMode,
     LightEntityFeature
 )
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 #from .const import DOMAIN, CONF_GROUPS, CONF_NAME, CONF_ENTITIES
-from .const import DOMAIN, CONF_TYPE, CONF_NAME, CONF_ENTITIES, CONF_DELAY, DEFAULT_DELAY
+from .const import (
+    DOMAIN,
+    CONF_TYPE,
+    CONF_NAME,
+    CONF_ENTITIES,
+    CONF_DELAY,
+    DEFAULT_DELAY,
+    CONF_SOLVER,
+    DEFAULT_SOLVER,
+    SOLVER_SCALING,
+    CONF_MIN_DISPATCH_INTERVAL,
+    DEFAULT_MIN_DISPATCH_INTERVAL,
+    CONF_UPDATE_WINDOW,
+    DEFAULT_UPDATE_WINDOW,
+)
+from .solver import solve_scaling
+from .dispatch import coalesce_service_data, freeze, LatestWinsScheduler
+from .ratelimit import async_get_backend, PRIORITY_TURN_OFF, PRIORITY_TURN_ON
+from .aggregate import GroupAggregator
+from .events import TrailingCoalescer
+from .shadow import ShadowStates
+from .capabilities import GroupCapabilities
+from .profile import PhaseProfiler, format_report
 
 _LOGGER = logging.getLogger(__name__)
 # Direkt nach den Imports oder ganz oben
@@ -37,16 +61,8 @@ def mired_to_kelvin(mired: float) -> int:
 
 
 
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Kompatibilität, falls alte discovery genutzt wird (wird oft leer gelassen)."""
-    _LOGGER.debug("Starte async_setup_platform für Light Group Dimmer (legacy).")
-    # In aktuellen Integrationen normalerweise leer oder deprecated.
-    return
-
-
-async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddEntitiesCallback):
-    _LOGGER.debug("Starte async_setup_entry für Light Group Dimmer (entry_id=%s).", entry.entry_id)
-
+def get_entry_groups(entry):
+    """Liefert die Gruppen ({"name", "entities"}) eines Config-Eintrags."""
     # 1) Hole den 'type' dieses Eintrags (z. B. 'yaml', 'group', 'master' ...)
     entry_type = entry.data.get(CONF_TYPE)
 
@@ -76,6 +92,26 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddE
         groups_data = []
         _LOGGER.warning("Unbekannter entry_type: %s", entry_type)
 
+    return groups_data
+
+
+def group_unique_id(name):
+    """Unique ID einer Gruppe – so wie angelegt."""
+    return f"light_group_{name.replace(' ', '_').lower()}"
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Kompatibilität, falls alte discovery genutzt wird (wird oft leer gelassen)."""
+    _LOGGER.debug("Starte async_setup_platform für Light Group Dimmer (legacy).")
+    # In aktuellen Integrationen normalerweise leer oder deprecated.
+    return
+
+
+async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddEntitiesCallback):
+    _LOGGER.debug("Starte async_setup_entry für Light Group Dimmer (entry_id=%s).", entry.entry_id)
+
+    # 1) + 2) Gruppen dieses Eintrags bestimmen
+    groups_data = get_entry_groups(entry)
     _LOGGER.debug("Gefundene Gruppen für dieses Entry: %s", groups_data)
 
     # 3) Delay-Wert auslesen
@@ -92,7 +128,7 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddE
             continue
 
         # Unique ID soll so heißen wie angelegt
-        unique_id = f"light_group_{name.replace(' ', '_').lower()}"
+        unique_id = group_unique_id(name)
         # Berechne eine stabile Unique ID (empfohlen, anstatt entry.entry_id zu verwenden)
         #unique_id = f"{DOMAIN}_{name.replace(' ', '_').lower()}"
         _LOGGER.debug("Erstelle LightGroupEntity: %s (Entitäten: %s, unique_id=%s)", name, lights, unique_id)
@@ -108,6 +144,9 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddE
 
 
 class CustomLightGroup(LightEntity):
+    # Zustand kommt per state_changed der Mitglieder, nie per Polling
+    _attr_should_poll = False
+
     def __init__(self, name, entities, hass, unique_id, delay):
         """Initialisiere die benutzerdefinierte Lichtgruppe."""
         self._color_temp_mired = None  # interner Mired-Wert
@@ -128,72 +167,76 @@ class CustomLightGroup(LightEntity):
         self._color_mode = None
         self._rgb_color = None  # Hinzugefügt
         self._xy_color = None   # Hinzugefügt
+        self._written_state = None  # Zuletzt geschriebene Attribute (Diff-Vergleich)
+        self._skipped_writes = 0
+        self._last_solve = None  # (solver, quelle, eingabe, ziel, ergebnis, iterationen) für die Diagnose
+        self._last_solve_iterations = 0
+        self._last_solve_warm = False  # letzter Solve mit Warmstart (nicht in den LRU-Cache)
         self.hass = hass
         self._icon = "mdi:lightbulb-group"  # Standard-Icon für die Gruppe
         self._supported_color_modes = set()
         self._supported_features = LightEntityFeature.EFFECT
         self._fallback_triggered = False
-        self._update_scheduled = False
-        self._brightness_cache = {}  # Cache-Format: {group_id: {"timestamp": time, "values": {entity_id: brightness}}}
         self._cache_update_lock = asyncio.Lock()
         self._cancel_task = None  # Task-Referenz zur Abbruchsteuerung
+        # Laufende Aggregation der Mitglieder (wird pro state_changed aktualisiert)
+        self._aggregator = GroupAggregator(entities, mired_to_kelvin)
+        # Optimistische Werte der Mitglieder bis zur Bestätigung durch die Bridge
+        self._shadow = ShadowStates()
+        # Farbmodi/Effektliste, nur bei geänderten Fähigkeiten neu berechnet
+        self._capabilities = GroupCapabilities(hass.data[DOMAIN]["capabilities"], entities)
+        self._shadow_expiry = None
+        # Events im Zeitfenster => ein Update + ein Schreibvorgang
+        self._update_coalescer = TrailingCoalescer(
+            hass,
+            hass.data[DOMAIN].get(CONF_UPDATE_WINDOW, DEFAULT_UPDATE_WINDOW),
+            self._async_refresh_state,
+        )
+        # Latest-wins: nur ein Befehl gleichzeitig, wartende Befehle werden zusammengefasst
+        self._command_scheduler = LatestWinsScheduler(
+            {
+                "turn_on": partial(self._async_run_command, "turn_on", self._async_apply_turn_on),
+                "turn_off": partial(self._async_run_command, "turn_off", self._async_apply_turn_off),
+            },
+            hass.data[DOMAIN].get(CONF_MIN_DISPATCH_INTERVAL, DEFAULT_MIN_DISPATCH_INTERVAL),
+        )
         #self.delay = delay
-        _LOGGER.debug(f"Initialisiere Lichtgruppe: {self._name} mit Entitäten: {self._entities}")
+        # Flight-Recorder (immer aktiv, keine Formatierung im Hot-Path)
+        self._trace = hass.data[DOMAIN]["trace"].record
+        # Phasen-Profiling (Service light_group_dimmer.profile), sonst None
+        self._profiler = None
+        _LOGGER.debug("Initialisiere Lichtgruppe: %s mit Entitäten: %s", self._name, self._entities)
 
 
     async def async_added_to_hass(self):
         """Wird aufgerufen, wenn die Entity zum System hinzugefügt wird."""
         _LOGGER.debug("Registriere Listener für Lichtgruppe: %s", self._name)
-        for entity_id in self._entities:
-            async_track_state_change_event(
-                self.hass, entity_id, self._handle_light_change
+        self.hass.data[DOMAIN]["group_entities"][self._unique_id] = self
+        self._aggregator.rebuild(self.hass.states.get)
+        self._capabilities.rebuild(self.hass.states.get)
+        # Ein gemeinsamer Dispatcher für alle Gruppen; Abmeldung beim Entfernen
+        self.async_on_remove(
+            self.hass.data[DOMAIN]["state_dispatcher"].async_register(
+                self._entities, self._handle_light_change
             )
+        )
     
         # Anstatt 15s-Warteschleife => entweder ganz weglassen:
         _LOGGER.debug("Keine Wartezeit mehr. Initialisiere supported_color_modes direkt.")
-        await self._initialize_supported_color_modes()
+        self._supported_color_modes = self._capabilities.color_modes
         
         # Eventuell einmal initial updaten
         await self.async_update()
-        self.async_write_ha_state()
-
-
-    async def _initialize_supported_color_modes(self):
-        """Initialisiere die unterstützten Farbmodi basierend auf den Entitäten."""
-        supported_modes = set()
-        for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
-            if state and "supported_color_modes" in state.attributes:
-                supported_modes.update(state.attributes["supported_color_modes"])
-    
-        # Filtere ungültige Modi
-        valid_modes = {"color_temp", "xy", "hs", "brightness", "onoff", "rgb", "rgbw", "rgbww"}
-        supported_modes = {mode for mode in supported_modes if mode in valid_modes}
-    
-        # Entferne 'onoff', wenn es andere Modi gibt
-        if "onoff" in supported_modes and len(supported_modes) > 1:
-            supported_modes.discard("onoff")
-            #_LOGGER.debug(f"'onoff' entfernt, da andere Modi unterstützt werden: {supported_modes}")
-
-        if "xy" in supported_modes and "color_temp" in supported_modes:
-            _LOGGER.debug(
-                "Kombination (xy, color_temp) gefunden. Entferne xy oder wandle xy -> hs."
-            )
-            supported_modes.discard("xy")
-            supported_modes.add("hs")            
-
-        has_color = any(m in self._supported_color_modes for m in ("hs", "rgb", "rgbw", "rgbww", "xy"))
-        if has_color or "color_temp" in self._supported_color_modes:
-            if "brightness" in self._supported_color_modes:
-                _LOGGER.debug("Entferne brightness, weil wir (hs oder color_temp) haben.")
-                self._supported_color_modes.discard("brightness")
-    
-        # Setze die bereinigte Liste
-        self._supported_color_modes = supported_modes
-    
-        # Erzwinge, dass keine andere Methode 'onoff' wieder hinzufügt
-        #_LOGGER.debug(f"Finale unterstützte Farbmodi für {self._name}: {self._supported_color_modes}")
 
+    async def async_will_remove_from_hass(self):
+        """Wird beim Entfernen/Reload aufgerufen: offene Befehle/Updates verwerfen."""
+        self.hass.data[DOMAIN]["group_entities"].pop(self._unique_id, None)
+        self._command_scheduler.cancel()
+        self._update_coalescer.async_cancel()
+        if self._shadow_expiry is not None:
+            self._shadow_expiry.cancel()
+            self._shadow_expiry = None
+        self.clear_brightness_cache(self._name)
 
 
     async def _update_color_mode(self):
@@ -226,6 +269,11 @@ class CustomLightGroup(LightEntity):
         """Liefert den aktuellen Delay-Wert dynamisch ab, auch aus YAML, falls gesetzt."""
         return self.hass.data[DOMAIN].get(CONF_DELAY, DEFAULT_DELAY)
 
+    @property
+    def solver(self):
+        """Gewählter Helligkeits-Solver ("iterative" oder "scaling")."""
+        return self.hass.data[DOMAIN].get(CONF_SOLVER, DEFAULT_SOLVER)
+
 
     @property
     def supported_color_modes(self):
@@ -327,75 +375,22 @@ class CustomLightGroup(LightEntity):
 
     async def async_update(self):
         """Aktualisiere den Status und die Attribute der Lichtgruppe."""
-        #_LOGGER.debug(f"Aktualisiere Status und Attribute für {self._name}")
-        await asyncio.sleep(1)
-        states = [self.hass.states.get(entity_id) for entity_id in self._entities if self.hass.states.get(entity_id)]
-    
-        # Protokolliere alle Lampen-Attribute zur Fehlerdiagnose
-        #for state in states:   'muss wieder aktiviert werden'
-            #_LOGGER.debug(f"Lampe {state.entity_id}: Status={state.state}, Attribute={state.attributes}")
-    
-        # Aktualisiere den EIN/AUS-Status
-        self._is_on = any(state.state == "on" for state in states if state)
-        #_LOGGER.debug(f"{self._name}: is_on Status: {self._is_on}")
-    
-        # Sammle Helligkeitswerte
-        brightness_values = [
-            state.attributes.get(ATTR_BRIGHTNESS, 0)
-            for state in states if state and state.state == "on" and ATTR_BRIGHTNESS in state.attributes and state.attributes.get(ATTR_BRIGHTNESS) is not None
-        ]
-        #_LOGGER.debug(f"{self._name}: brightness_values: {brightness_values}")
-        self._brightness = round(sum(brightness_values) / len(brightness_values)) if brightness_values else 0
-        #_LOGGER.debug(f"{self._name}: Berechnete Helligkeit: {self._brightness}")
+        self._async_refresh_state()
 
-        kelvin_values = []
-        for s in states:
-            if s.state != "on":
-                continue
-            # Angenommen, das Gerät liefert in "color_temp" (Mired):
-            mired_val = s.attributes.get("color_temp")  # oder dein lokales ATTR_COLOR_TEMP
-            if mired_val:
-                kelvin_values.append(mired_to_kelvin(mired_val))
-    
-        if kelvin_values:
-            # Beispiel: Einfacher Mittelwert aller Kelvin-Werte
-            avg_kelvin = sum(kelvin_values) / len(kelvin_values)
-            self._color_temp_kelvin = int(round(avg_kelvin))
-        else:
-            self._color_temp_kelvin = None
-    
-        # Sammle HS-Farben
-        hs_colors = [
-            state.attributes.get(ATTR_HS_COLOR)
-            for state in states if state and state.state == "on" and ATTR_HS_COLOR in state.attributes and state.attributes.get(ATTR_HS_COLOR) is not None
-        ]
-        #_LOGGER.debug(f"{self._name}: hs_colors: {hs_colors}")
-        self._hs_color = hs_colors[0] if hs_colors else None
-    
-        # Sammle RGB-Farben (falls verfügbar)
-        rgb_colors = [
-            state.attributes.get("rgb_color")
-            for state in states if state and state.state == "on" and "rgb_color" in state.attributes and state.attributes.get("rgb_color") is not None
-        ]
-        #_LOGGER.debug(f"{self._name}: rgb_colors: {rgb_colors}")
-        self._rgb_color = rgb_colors[0] if rgb_colors else None
-    
-        # Sammle Farbtemperaturen
-        color_temps = [
-            state.attributes.get(ATTR_COLOR_TEMP)
-            for state in states if state and state.state == "on" and ATTR_COLOR_TEMP in state.attributes and state.attributes.get(ATTR_COLOR_TEMP) is not None
-        ]
-        #_LOGGER.debug(f"{self._name}: color_temps: {color_temps}")
-        self._color_temp = round(sum(color_temps) / len(color_temps)) if color_temps else None
-        #_LOGGER.debug(f"{self._name}: Berechnete Farbtemperatur: {self._color_temp}")
-    
-        # Sammle XY-Farben
-        xy_colors = [
-            state.attributes.get(ATTR_XY_COLOR)
-            for state in states if state and state.state == "on" and ATTR_XY_COLOR in state.attributes and state.attributes.get(ATTR_XY_COLOR) is not None
-        ]
-        _LOGGER.debug(f"{self._name}: xy_colors: {xy_colors}")
-        self._xy_color = xy_colors[0] if xy_colors else None
+    @callback
+    def _async_refresh_state(self):
+        """Übernimmt die aggregierten Werte und schreibt den Gruppenzustand."""
+        #_LOGGER.debug(f"Aktualisiere Status und Attribute für {self._name}")
+        # Kein Rescan aller Lampen mehr: die Werte kommen aus dem inkrementellen
+        # Aggregator, der in _handle_light_change pro Event aktualisiert wird.
+        aggregator = self._aggregator
+        self._is_on = aggregator.is_on
+        self._brightness = aggregator.brightness
+        self._color_temp_kelvin = aggregator.color_temp_kelvin
+        self._hs_color = aggregator.hs_color
+        self._rgb_color = aggregator.rgb_color
+        self._color_temp = aggregator.color_temp
+        self._xy_color = aggregator.xy_color
 
         # --- Spezialfall: Transformiere Farbwerte nur zur Anzeige ---
         if self._special_case:
@@ -403,29 +398,8 @@ class CustomLightGroup(LightEntity):
                 self._hs_color, self._rgb_color, self._xy_color
             )
     
-        # Sammle unterstützte Farbmodi
-        self._supported_color_modes = set()
-        for state in states:
-            if ATTR_SUPPORTED_COLOR_MODES in state.attributes:
-                self._supported_color_modes.update(state.attributes[ATTR_SUPPORTED_COLOR_MODES])
-        
-        # Entferne 'onoff', wenn andere Farbmodi verfügbar sind
-        if ColorMode.ONOFF in self._supported_color_modes and len(self._supported_color_modes) > 1:
-            self._supported_color_modes.discard(ColorMode.ONOFF)
-            #_LOGGER.debug(f"{self._name}: 'onoff' entfernt, da andere Farbmodi unterstützt werden: {self._supported_color_modes}")
-
-        if "xy" in self._supported_color_modes and "color_temp" in self._supported_color_modes:
-            _LOGGER.debug(
-                "Kombination (xy, color_temp) im Laufzeit-Update gefunden. Ersetze xy -> hs."
-            )
-            self._supported_color_modes.discard("xy")
-            self._supported_color_modes.add("hs")
-
-        has_color = any(m in self._supported_color_modes for m in ("hs", "rgb", "rgbw", "rgbww", "xy"))
-        if has_color or "color_temp" in self._supported_color_modes:
-            if "brightness" in self._supported_color_modes:
-                _LOGGER.debug("Entferne brightness, weil wir (hs oder color_temp) haben.")
-                self._supported_color_modes.discard("brightness")
+        # Unterstützte Farbmodi (bereinigt, aus dem Fähigkeits-Cache)
+        self._supported_color_modes = self._capabilities.color_modes
     
         #_LOGGER.debug(f"{self._name}: Unterstützte Farbmodi: {self._supported_color_modes}")
     
@@ -456,23 +430,16 @@ class CustomLightGroup(LightEntity):
         #_LOGGER.debug(f"{self._name}: Farbmodus: {self._color_mode}")
 
     
-        # Sammle Effekte
-        effects = [
-            state.attributes.get(ATTR_EFFECT)
-            for state in states if state and state.state == "on" and ATTR_EFFECT in state.attributes and state.attributes.get(ATTR_EFFECT) is not None
-        ]
-        #_LOGGER.debug(f"{self._name}: effects: {effects}")
-        self._effect = effects[0] if effects else None
-    
-        # Sammle Effektlisten
-        effect_lists = [
-            state.attributes.get("effect_list", [])
-            for state in states if state
-        ]
-        self._effect_list = sorted({effect for effect_list in effect_lists for effect in effect_list}) if effect_lists else []
-        #_LOGGER.debug(f"{self._name}: effect_list: {self._effect_list}")
+        # Effekte
+        self._effect = aggregator.effect
+        self._effect_list = self._capabilities.effect_list
     
-        # Erzwinge Statusaktualisierung in Home Assistant
+        # Nur schreiben, wenn sich an den aggregierten Attributen etwas geändert hat
+        written_state = self._aggregated_state()
+        if written_state == self._written_state:
+            self._skipped_writes += 1
+            return
+        self._written_state = written_state
         self.async_write_ha_state()
     
         """
@@ -484,6 +451,22 @@ class CustomLightGroup(LightEntity):
         )
         """
 
+    def _aggregated_state(self):
+        """Alle Werte, die in den Gruppenzustand einfließen – als vergleichbares Tupel."""
+        return (
+            self._is_on,
+            self._brightness,
+            self._color_mode,
+            freeze(self._hs_color),
+            self._color_temp_kelvin,
+            self._color_temp,
+            freeze(self._rgb_color),
+            freeze(self._xy_color),
+            self._effect,
+            tuple(self._effect_list or ()),
+            self._supported_color_modes,
+        )
+
 
     def _transform_special(self, hs_color, rgb_color, xy_color):
         """
@@ -510,16 +493,97 @@ class CustomLightGroup(LightEntity):
 
 
 
+    def _member_state(self, entity_id):
+        """Zustand einer Mitglieds-Lampe inkl. noch unbestätigter eigener Werte."""
+        return self._shadow.get(entity_id, self.hass.states.get(entity_id))
+
+    def _async_set_member_state(self, entity_id, changes):
+        """
+        Optimistisches Setzen einer Mitglieds-Lampe auf "on" – nur im
+        Schatten-Zustand dieser Gruppe, der State der Lampe bleibt unberührt.
+        """
+        shadow = self._shadow.set(entity_id, self.hass.states.get(entity_id), changes)
+        self._aggregator.update(entity_id, shadow)
+        if self._shadow_expiry is None:
+            self._shadow_expiry = self.hass.loop.call_later(
+                self._shadow.ttl, self._async_expire_shadows
+            )
+
+    @callback
+    def _async_expire_shadows(self):
+        """Unbestätigte Schatten nach Ablauf durch den echten Zustand ersetzen."""
+        self._shadow_expiry = None
+        expired = self._shadow.pop_expired()
+        for entity_id in expired:
+            real_state = self.hass.states.get(entity_id)
+            self._aggregator.update(entity_id, real_state)
+            self._capabilities.update(entity_id, real_state)
+        if expired:
+            self._update_coalescer.async_schedule()
+        next_expiry = self._shadow.next_expiry()
+        if next_expiry is not None:
+            # Nächster Lauf, wenn der älteste verbliebene Schatten abläuft
+            self._shadow_expiry = self.hass.loop.call_later(
+                next_expiry, self._async_expire_shadows
+            )
+
     def is_group_on(self):
         """Berechnet dynamisch, ob die Gruppe eingeschaltet ist."""
         for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
+            state = self._member_state(entity_id)
             if state and state.state == "on":
                 return True  # Mindestens eine Lampe ist eingeschaltet
         return False  # Keine Lampe ist eingeschaltet
 
     
     async def async_turn_on(self, **kwargs):
+        """Befehl an den Scheduler – bei einer Slider-Flut gewinnt der neueste Wert."""
+        await self._command_scheduler.async_submit("turn_on", kwargs)
+
+    async def async_turn_off(self, **kwargs):
+        """Befehl an den Scheduler – ersetzt ggf. noch wartende turn_on-Befehle."""
+        await self._command_scheduler.async_submit("turn_off", kwargs)
+
+    async def _async_run_command(self, service, handler, **kwargs):
+        """Führt einen Befehl des Schedulers aus (bei aktivem Profiling mit Phasenmessung)."""
+        profiler = self._profiler
+        if profiler is None:
+            await handler(**kwargs)
+            return
+        profiler.begin(service)
+        try:
+            await handler(**kwargs)
+        finally:
+            if profiler.end():
+                self._profiler = None
+
+    def _profile_mark(self):
+        """Startzeit einer Phase – nur bei aktivem Profiling."""
+        return perf_counter() if self._profiler is not None else None
+
+    def _profile_add(self, phase, mark):
+        if mark is not None and self._profiler is not None:
+            self._profiler.add(phase, perf_counter() - mark)
+
+    @callback
+    def async_start_profile(self, commands):
+        """Misst die nächsten `commands` Befehle phasenweise (Service light_group_dimmer.profile)."""
+        self._profiler = PhaseProfiler(self._name, commands, self._async_profile_done)
+        _LOGGER.info("Profiling für '%s' gestartet (%s Befehle)", self._name, commands)
+
+    @callback
+    def _async_profile_done(self, report):
+        """Auswertung als Event und Persistent Notification melden."""
+        report["entity_id"] = self.entity_id
+        self.hass.bus.async_fire(f"{DOMAIN}_profile", report)
+        persistent_notification.async_create(
+            self.hass,
+            format_report(report),
+            title=f"Light Group Dimmer: Profiling {self._name}",
+            notification_id=f"{DOMAIN}_profile_{self._unique_id}",
+        )
+
+    async def _async_apply_turn_on(self, **kwargs):
         """
         Schalte die Gruppe ein und verarbeite optional
         neue Helligkeit/Farben/Effekte. 
@@ -557,7 +621,7 @@ class CustomLightGroup(LightEntity):
         # 1) Herausfinden, ob irgendeine dimmbare Lampe tatsächlich an ist.
         dimmable_on = False
         for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
+            state = self._member_state(entity_id)
             if state and state.state == "on":
                 # Prüfen, ob Lampe dimmbar ist (hat brightness oder color_modes mit brightness)
                 if (
@@ -572,21 +636,21 @@ class CustomLightGroup(LightEntity):
         treat_as_off = (not group_is_on) or (not dimmable_on)
         if treat_as_off and only_brightness_requested:
             _LOGGER.debug(
-                f"[Spezialfall] Gruppe '{self._name}' hat keine dimmbare Lampe an. "
-                f"Schalte alle Lampen ein und setze Helligkeit auf {new_brightness}."
+                "[Spezialfall] Gruppe '%s' hat keine dimmbare Lampe an. "
+                "Schalte alle Lampen ein und setze Helligkeit auf %s.",
+                self._name, new_brightness,
             )
+            self._trace(self._name, "turn_on_all", new_brightness)
     
             service_data_list = []
             for entity_id in self._entities:
-                state = self.hass.states.get(entity_id)
+                state = self._member_state(entity_id)
                 if not state or state.state in ("unavailable", "unknown"):
-                    _LOGGER.debug(f"Lampe {entity_id} ist unavailable/unknown. Überspringe sie.")
+                    _LOGGER.debug("Lampe %s ist unavailable/unknown. Überspringe sie.", entity_id)
                     continue
 
     
-                updated_attributes = dict(state.attributes)
-                updated_attributes[ATTR_BRIGHTNESS] = new_brightness
-                self.hass.states.async_set(entity_id, "on", updated_attributes)
+                self._async_set_member_state(entity_id, {ATTR_BRIGHTNESS: new_brightness})
     
                 if (
                     ATTR_BRIGHTNESS in state.attributes
@@ -601,38 +665,34 @@ class CustomLightGroup(LightEntity):
                     # Lampe kennt nur On/Off => kein Brightness mitschicken
                     service_data_list.append({"entity_id": entity_id})
     
-            # Parallel Services aufrufen
-            tasks = [
-                self.hass.services.async_call("light", "turn_on", data)
-                for data in service_data_list
-            ]
-            await asyncio.gather(*tasks)
+            # Services aufrufen (gleiche Daten => ein gemeinsamer Call)
+            await self._async_call_lights("turn_on", service_data_list)
     
-            await self.async_update()
-            await self.async_update_ha_state(force_refresh=True)
+            mark = self._profile_mark()
+            self._async_refresh_state()
+            self._profile_add("refresh", mark)
             return
     
         # Sonderfall: sehr niedrige Helligkeit (<=3)
         if new_brightness is not None and new_brightness <= 3:
             _LOGGER.debug(
-                f"[1% Override] new_brightness={new_brightness} => "
-                f"Setze alle aktiven Lampen exakt auf {new_brightness}."
+                "[1%% Override] new_brightness=%s => Setze alle aktiven Lampen exakt auf %s.",
+                new_brightness, new_brightness,
             )
+            self._trace(self._name, "low_override", new_brightness)
             service_data_list = []
             for entity_id in self._entities:
-                state = self.hass.states.get(entity_id)
+                state = self._member_state(entity_id)
                 # Nur Lampen updaten, die "on" sind (oder ggf. alle einschalten?)
                 if not state or state.state == "off":
-                    _LOGGER.debug(f"Lamp {entity_id} ist off, überspringe oder schalte ein.")
+                    _LOGGER.debug("Lamp %s ist off, überspringe oder schalte ein.", entity_id)
                     # Zum Einschalten auskommentieren/ändern:
                     # continue
                 if not state or state.state in ("unavailable", "unknown"):
-                    _LOGGER.debug(f"Lampe {entity_id} ist unavailable/unknown. Überspringe sie.")
+                    _LOGGER.debug("Lampe %s ist unavailable/unknown. Überspringe sie.", entity_id)
                     continue
                 
-                updated_attributes = dict(state.attributes if state else {})
-                updated_attributes[ATTR_BRIGHTNESS] = new_brightness
-                self.hass.states.async_set(entity_id, "on", updated_attributes)
+                self._async_set_member_state(entity_id, {ATTR_BRIGHTNESS: new_brightness})
                 service_data_list.append({
                     "entity_id": entity_id,
                     ATTR_BRIGHTNESS: new_brightness
@@ -646,67 +706,78 @@ class CustomLightGroup(LightEntity):
         # =============== NEUE MANUELLE HELLIGKEITS-LOGIK (Cache) ===============
         if new_brightness is not None:
             # => Dies gilt als manuelle Änderung per Slider.
-            _LOGGER.debug(f"[Cache] Manuelle Helligkeitsänderung erkannt: Ziel={new_brightness}")
+            _LOGGER.debug("[Cache] Manuelle Helligkeitsänderung erkannt: Ziel=%s", new_brightness)
     
             # 1) Gibt es schon einen Cache für diese Gruppe?
             cached_data = self.get_brightness_cache(self._name)
     
             if not cached_data:
                 # Kein Cache vorhanden => erstelle neuen Cache auf Basis der "IST-Werte"
-                _LOGGER.debug(f"[Cache] Kein Cache vorhanden. Erstelle neuen Cache für Gruppe '{self._name}'")
-                self.store_brightness_cache(self._name)
-                cached_data = self.get_brightness_cache(self._name)
+                _LOGGER.debug("[Cache] Kein Cache vorhanden. Erstelle neuen Cache für Gruppe '%s'", self._name)
+                mark = self._profile_mark()
+                cached_data = self.store_brightness_cache(self._name)
+                self._profile_add("snapshot", mark)
+                self._trace(self._name, "cache_new", new_brightness, cached_data.group_brightness)
             else:
                 # Cache vorhanden => Timer zurücksetzen
-                _LOGGER.debug(f"[Cache] Cache existiert bereits, Timer wird zurückgesetzt.")
+                _LOGGER.debug("[Cache] Cache existiert bereits, Timer wird zurückgesetzt.")
                 self.reset_brightness_cache_timer(self._name)
+                self._trace(self._name, "cache_hit", new_brightness, cached_data.group_brightness)
     
             # 2) Werte aus dem Cache holen (alte Gruppenhelligkeit, alte Lampenhelligkeiten)
-            old_group_brightness = cached_data["group_brightness"]
-            old_lamp_brightnesses = cached_data["lamp_brightnesses"]  # dict {entity_id: brightness}
+            old_group_brightness = cached_data.group_brightness
+            old_lamp_brightnesses = cached_data.lamp_brightnesses  # dict {entity_id: brightness}
     
             _LOGGER.debug(
-                f"[Cache] Verwende aus Cache für '{self._name}': "
-                f"old_group_brightness={old_group_brightness}, "
-                f"old_lamp_brightnesses={old_lamp_brightnesses}"
+                "[Cache] Verwende aus Cache für '%s': old_group_brightness=%s, old_lamp_brightnesses=%s",
+                self._name, old_group_brightness, old_lamp_brightnesses,
             )
     
-            # 3) Iterative Berechnung auf Basis der alten Werte
-            brightness_calc_input = old_lamp_brightnesses.copy()
-            adjusted_brightness_cache = await self.adjust_brightness_until_match(
-                brightness_calc_input,
-                new_brightness
-            )
+            # 3) Iterative Berechnung auf Basis der alten Werte –
+            #    gleiche Ziele innerhalb derselben Baseline kommen aus der Zieltabelle
+            target_table = cached_data.targets
+            adjusted_brightness_cache = target_table.get(new_brightness)
+            if adjusted_brightness_cache is None:
+                mark = self._profile_mark()
+                adjusted_brightness_cache = await self.solve_brightness(
+                    old_lamp_brightnesses,
+                    new_brightness,
+                    cached_data.warm_states
+                )
+                self._profile_add("solve", mark)
+                target_table[new_brightness] = adjusted_brightness_cache
+            else:
+                _LOGGER.debug("[Cache] Ziel %s aus Zieltabelle für '%s'", new_brightness, self._name)
+                self._trace(self._name, "target_hit", new_brightness)
     
             # 4) Alle relevanten Lampen updaten
+            mark = self._profile_mark()
             service_data_list = []
             for entity_id, adj_brightness in adjusted_brightness_cache.items():
                 # Nur updaten, wenn Lampe tatsächlich "on" ist
-                state = self.hass.states.get(entity_id)
+                state = self._member_state(entity_id)
                 if not state or state.state == "off":
-                    _LOGGER.debug(f"Lampe {entity_id} ist aus. Überspringe.")
+                    _LOGGER.debug("Lampe %s ist aus. Überspringe.", entity_id)
                     continue
 
                 if not state or state.state in ("unavailable", "unknown"):
-                    _LOGGER.debug(f"Lampe {entity_id} ist unavailable/unknown. Überspringe sie.")
+                    _LOGGER.debug("Lampe %s ist unavailable/unknown. Überspringe sie.", entity_id)
                     continue
 
     
                 # Prepare call
-                updated_attributes = dict(state.attributes)
-                updated_attributes[ATTR_BRIGHTNESS] = adj_brightness
                 service_data = {
                     "entity_id": entity_id,
                     ATTR_BRIGHTNESS: adj_brightness
                 }
                 service_data_list.append(service_data)
     
-                # Direkt in HA-Registry
-                self.hass.states.async_set(entity_id, "on", updated_attributes)
+                # Optimistisch im Schatten-Zustand der Gruppe
+                self._async_set_member_state(entity_id, {ATTR_BRIGHTNESS: adj_brightness})
     
                 _LOGGER.debug(
-                    f"[Cache] Setze Helligkeit für {entity_id} von {state.attributes.get(ATTR_BRIGHTNESS)} "
-                    f"auf {adj_brightness}"
+                    "[Cache] Setze Helligkeit für %s von %s auf %s",
+                    entity_id, state.attributes.get(ATTR_BRIGHTNESS), adj_brightness,
                 )
     
             # Farben/Effekte + neue Kelvin-Farbtemperatur verarbeiten (unabhängig vom Cache)
@@ -717,19 +788,17 @@ class CustomLightGroup(LightEntity):
                 new_effect            # unverändert
             )
             service_data_list.extend(color_service_data_list)
+            self._profile_add("payload", mark)
     
             # Services aufrufen
-            tasks = [
-                self.hass.services.async_call("light", "turn_on", data)
-                for data in service_data_list
-            ]
-            await asyncio.gather(*tasks)
+            await self._async_call_lights("turn_on", service_data_list)
     
         else:
             # Kein new_brightness => Farben/Effekt oder nur Einschalten
             _LOGGER.debug("Kein new_brightness => normales Einschalten oder nur Farbe/Effekt setzen.")
     
             # Farben/Effekte verarbeiten
+            mark = self._profile_mark()
             service_data_list = self._build_color_service_data(
                 new_xy_color, new_hs_color, self._color_temp_kelvin, new_effect
             )
@@ -738,64 +807,129 @@ class CustomLightGroup(LightEntity):
             if is_simple_turn_on and not service_data_list:
                 service_data_list = [{"entity_id": e} for e in self._entities]
     
-            # Parallel aufrufen
-            tasks = []
             for data in service_data_list:
-                # Zustand in HA-Registry auf 'on' setzen
+                # Zustand im Schatten auf 'on' setzen
                 ent_id = data.get("entity_id")
-                if ent_id:
-                    state = self.hass.states.get(ent_id)
-                    if state:
-                        updated_attributes = dict(state.attributes)
-                        self.hass.states.async_set(ent_id, "on", updated_attributes)
-                tasks.append(self.hass.services.async_call("light", "turn_on", data))
-    
-            await asyncio.gather(*tasks)
+                if ent_id and self.hass.states.get(ent_id):
+                    self._async_set_member_state(ent_id, {})
+            self._profile_add("payload", mark)
+
+            await self._async_call_lights("turn_on", service_data_list)
     
-        # Abschließend: Status aktualisieren
-        await self.async_update()
-        await self.async_update_ha_state(force_refresh=True)
+        # Abschließend: Status aktualisieren (schreibt nur bei Änderungen)
+        mark = self._profile_mark()
+        self._async_refresh_state()
+        self._profile_add("refresh", mark)
 
 
-    async def async_turn_off(self, **kwargs):
+    async def _async_apply_turn_off(self, **kwargs):
         """Schalte die ganze Gruppe aus."""
         self._is_on = False
-        tasks = []
+        service_data_list = []
         for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
+            state = self._member_state(entity_id)
             if not state or state.state == "off":
-                _LOGGER.debug(f"{entity_id} ist bereits aus oder nicht verfügbar.")
+                _LOGGER.debug("%s ist bereits aus oder nicht verfügbar.", entity_id)
                 continue
             if (
                 not state
                 or state.state == "unavailable"
                 or state.state == "unknown"
             ):
-                _LOGGER.debug(f"Lampe {entity_id} ist unavailable/unknown, überspringe Service-Call.")
+                _LOGGER.debug("Lampe %s ist unavailable/unknown, überspringe Service-Call.", entity_id)
                 continue
-            service_data = {"entity_id": entity_id}
-            tasks.append(self.hass.services.async_call("light", "turn_off", service_data))
+            service_data_list.append({"entity_id": entity_id})
         
-        await asyncio.gather(*tasks)
-        await self.async_update()
-        await self.async_update_ha_state(force_refresh=True)
-        
-    async def _handle_light_change(self, event):
-        """Wird getriggert, wenn sich eine einzelne Lampe ändert."""
-        _LOGGER.debug(f"Lichtänderung erkannt: {event}")
-        
-        if self._update_scheduled:
-            _LOGGER.debug(f"Update für '{self._name}' ist bereits geplant – überspringe.")
-            return
-        self._update_scheduled = True
+        await self._async_call_lights("turn_off", service_data_list)
+        mark = self._profile_mark()
+        self._async_refresh_state()
+        self._profile_add("refresh", mark)
         
+    async def _async_call_lights(self, service, service_data_list):
+        """
+        Ruft light.<service> parallel auf. Werte, die eine Lampe laut
+        SentStateTable schon hat, werden nicht erneut gesendet. Lampen mit
+        identischen Daten werden zu einem Aufruf mit entity_id-Liste zusammengefasst.
+        Deckt eine Hue-Raum/-Zone Lampen komplett ab, geht der Befehl an den Raum.
+        Jeder Aufruf läuft durch den gemeinsamen Rate-Limiter seines Backends.
+        """
+        sent_states = self.hass.data[DOMAIN].get("sent_states")
+        if sent_states is not None and service == "turn_on":
+            service_data_list = sent_states.filter(service_data_list)
+
+        latency = self.hass.data[DOMAIN].get("latency")
+        if latency is not None:
+            latency.expect(self._unique_id, service, service_data_list)
+
+        coalesced = coalesce_service_data(service_data_list)
+        # Vor dem Versand merken: die Bestätigung kann vor dem Ende von gather kommen
+        if sent_states is not None:
+            sent_at = sent_states.record(service, coalesced)
+
+        outgoing = coalesced
+        hue_groups = self.hass.data[DOMAIN].get("hue_group_index")
+        if hue_groups is not None:
+            outgoing = [hue_groups.offload(data) for data in coalesced]
+
+        tasks = [
+            self._async_limited_call(service, data)
+            for data in outgoing
+        ]
+        self._trace(self._name, service, len(service_data_list), len(tasks))
+        mark = self._profile_mark()
         try:
-            await self.async_update()
-            self.async_write_ha_state()
-            await asyncio.sleep(0.2)
-        finally:
-            self._update_scheduled = False
-        _LOGGER.debug(f"Lichtänderung für '{self._name}' verarbeitet.")
+            await asyncio.gather(*tasks)
+        except Exception:
+            # Was nicht sicher rausging, darf spätere Befehle nicht unterdrücken
+            if sent_states is not None:
+                sent_states.discard(coalesced, sent_at)
+            raise
+        self._profile_add("dispatch", mark)
+
+    async def _async_limited_call(self, service, data):
+        """
+        Teilt einen (zusammengefassten) Aufruf nach Backend auf und wartet je
+        Backend auf Tokens (eine Lampe oder ein Hue-Raum = ein Token, also eine
+        Bridge-Anfrage). turn_off hat Vorrang.
+        """
+        limiter = self.hass.data[DOMAIN].get("limiter")
+        if limiter is None:
+            await self.hass.services.async_call("light", service, data)
+            return
+
+        by_backend = {}
+        for entity_id in data["entity_id"]:
+            by_backend.setdefault(async_get_backend(self.hass, entity_id), []).append(entity_id)
+
+        priority = PRIORITY_TURN_OFF if service == "turn_off" else PRIORITY_TURN_ON
+
+        async def _call(backend, entity_ids):
+            await limiter.async_acquire(backend, len(entity_ids), priority)
+            await self.hass.services.async_call("light", service, {**data, "entity_id": entity_ids})
+
+        await asyncio.gather(*(
+            _call(backend, entity_ids) for backend, entity_ids in by_backend.items()
+        ))
+
+    @callback
+    def _handle_light_change(self, event):
+        """Wird getriggert, wenn sich eine einzelne Lampe ändert."""
+        _LOGGER.debug("Lichtänderung erkannt: %s", event)
+
+        entity_id = event.data.get("entity_id")
+        new_state = event.data.get("new_state")
+        # Schatten durch den echten State ersetzen – auch bei einer Bestätigung,
+        # denn die Bridge rundet und ergänzt abgeleitete Attribute (xy/hs zu color_temp)
+        self._shadow.resolve(entity_id, new_state)
+
+        # Nur die geänderte Lampe neu in die Gruppenwerte einrechnen
+        # (die Delta-Unterdrückung wird zentral im StateChangeDispatcher bestätigt)
+        self._aggregator.update(entity_id, new_state)
+        self._capabilities.update(entity_id, new_state)
+
+        # Neuberechnung + Schreiben erst am Ende des Zeitfensters, dafür nie verloren;
+        # ändert sich am Gruppenzustand nichts, entfällt das Schreiben ohnehin
+        self._update_coalescer.async_schedule()
 
     # ----------------------------------------------------------
     #               NEUE CACHING-FUNKTIONEN
@@ -803,14 +937,14 @@ class CustomLightGroup(LightEntity):
     def store_brightness_cache(self, group_id):
         """
         Erzeugt einen neuen Cache-Eintrag für group_id auf Basis
-        der aktuellen IST-Werte.
+        der aktuellen IST-Werte und liefert ihn zurück.
         """
         # Alte Gruppenhelligkeit ermitteln (z.B. Mittelwert der aktiven Lampen)
         lamp_brightnesses = {}
         active_vals = []
         
         for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
+            state = self._member_state(entity_id)
             if state and state.state == "on":
                 val = state.attributes.get(ATTR_BRIGHTNESS, 0)
                 lamp_brightnesses[entity_id] = val
@@ -822,66 +956,112 @@ class CustomLightGroup(LightEntity):
         else:
             old_group_brightness = 0
         
-        # Timer ggf. abbrechen, falls schon vorhanden
-        self.clear_brightness_cache(group_id)
-        
-        self._brightness_cache[group_id] = {
-            "group_brightness": old_group_brightness,
-            "lamp_brightnesses": lamp_brightnesses,
-            "timer": None
-        }
-        
+        snapshot = self.hass.data[DOMAIN]["brightness_cache"].create(
+            (self._unique_id, group_id), old_group_brightness, lamp_brightnesses, self.delay
+        )
         _LOGGER.debug(
-            f"[Cache] Neuer Cache angelegt für '{group_id}': group_brightness={old_group_brightness}, "
-            f"lamp_brightnesses={lamp_brightnesses}"
+            "[Cache] Neuer Cache angelegt für '%s': group_brightness=%s, lamp_brightnesses=%s",
+            group_id, old_group_brightness, lamp_brightnesses,
         )
-        
-        # Timer starten
-        self.reset_brightness_cache_timer(group_id, log_reason="Neuanlage")
+        return snapshot
 
     def reset_brightness_cache_timer(self, group_id, log_reason="Reset"):
-        """Setzt den (5s) Timer zurück, damit der Cache nicht gelöscht wird."""
-        entry = self._brightness_cache.get(group_id)
-        if not entry:
-            return
-        
-        # Bestehenden Timer abbrechen
-        if entry["timer"]:
-            entry["timer"].cancel()
-        
-        # Neuen Timer anlegen
-        entry["timer"] = asyncio.create_task(self._clear_cache_after_delay(group_id, self.delay))
-        _LOGGER.debug(f"[Cache] Timer zurückgesetzt (Grund: {log_reason}) für Gruppe '{group_id}'")
-
-    async def _clear_cache_after_delay(self, group_id, delay):
-        """Wartet 'delay' Sekunden und löscht dann den Cache, wenn nichts Neues passiert."""
-        try:
-            _LOGGER.debug(f"[Cache] Starte {delay}s-Timer, um Cache für '{group_id}' zu löschen.")
-            await asyncio.sleep(delay)
-            # Wenn wir hier ankommen und kein Cancel kam => Cache wirklich löschen
-            self.clear_brightness_cache(group_id)
-            _LOGGER.debug(f"[Cache] Cache für '{group_id}' ist abgelaufen und wurde gelöscht.")
-        except asyncio.CancelledError:
-            _LOGGER.debug(f"[Cache] Timer für '{group_id}' wurde abgebrochen.")
-            raise
+        """Verschiebt die Ablauffrist (delay), damit der Cache nicht gelöscht wird."""
+        # Nur die Frist im gemeinsamen ExpiryWheel verschieben – kein Task pro Tick
+        self.hass.data[DOMAIN]["brightness_cache"].touch((self._unique_id, group_id), self.delay)
+        _LOGGER.debug("[Cache] Frist zurückgesetzt (Grund: %s) für Gruppe '%s'", log_reason, group_id)
 
     def clear_brightness_cache(self, group_id):
-        """Cache-Eintrag für group_id entfernen, wenn vorhanden."""
-        if group_id in self._brightness_cache:
-            # Evtl. laufenden Timer abbrechen
-            timer_task = self._brightness_cache[group_id].get("timer")
-            if timer_task:
-                timer_task.cancel()
-            del self._brightness_cache[group_id]
-            _LOGGER.debug(f"[Cache] remove: Cache für '{group_id}' entfernt.")
+        """Cache-Eintrag für group_id (inkl. Zieltabelle) entfernen, wenn vorhanden."""
+        if self.hass.data[DOMAIN]["brightness_cache"].remove((self._unique_id, group_id)):
+            _LOGGER.debug("[Cache] remove: Cache für '%s' entfernt.", group_id)
 
     def get_brightness_cache(self, group_id):
-        """Liefert den Cache-Eintrag für group_id oder None."""
-        return self._brightness_cache.get(group_id)
+        """Liefert den Snapshot (BrightnessSnapshot) für group_id oder None."""
+        return self.hass.data[DOMAIN]["brightness_cache"].get((self._unique_id, group_id))
+
+    def diagnostics(self):
+        """Momentaufnahme für die Diagnose – wird nur beim Download zusammengestellt."""
+        snapshot = self.hass.data[DOMAIN]["brightness_cache"].describe(
+            (self._unique_id, self._name), detail=True
+        )
+
+        last_solve = None
+        if self._last_solve is not None:
+            solver, source, lamp_brightnesses, target, result, iterations = self._last_solve
+            last_solve = {
+                "solver": solver,
+                "source": source,
+                "input": dict(lamp_brightnesses),
+                "target": target,
+                "output": dict(result),
+                "iterations": iterations,
+            }
+
+        return {
+            "entity_id": self.entity_id,
+            "unique_id": self._unique_id,
+            "members": list(self._entities),
+            "aggregated_state": {
+                "is_on": self._is_on,
+                "brightness": self._brightness,
+                "color_mode": self._color_mode,
+                "hs_color": self._hs_color,
+                "rgb_color": self._rgb_color,
+                "xy_color": self._xy_color,
+                "color_temp_kelvin": self._color_temp_kelvin,
+                "color_temp": self._color_temp,
+                "effect": self._effect,
+                "skipped_writes": self._skipped_writes,
+            },
+            "capabilities": {
+                "supported_color_modes": sorted(self._capabilities.color_modes),
+                "effect_list": list(self._capabilities.effect_list),
+                **self._capabilities.stats(),
+            },
+            "brightness_cache": snapshot,
+            "last_solve": last_solve,
+            "dispatch": {
+                "scheduler": self._command_scheduler.stats(),
+                "update_coalescer": self._update_coalescer.stats(),
+                "shadow": self._shadow.stats(),
+            },
+            "latency": self.hass.data[DOMAIN]["latency"].group_summary(self._unique_id, self._entities),
+        }
 
     # ----------------------------------------------------------
     #       HELFER-FUNKTIONEN für Helligkeitsberechnung
     # ----------------------------------------------------------
+    async def solve_brightness(self, lamp_brightnesses, target_group_brightness, warm_states=None):
+        """
+        Einstieg für die Helligkeitsberechnung: zuerst der integrationsweite
+        LRU-Cache, erst bei einem Miss adjust_brightness_until_match.
+        """
+        solver_cache = self.hass.data[DOMAIN].get("solver_cache")
+        solver = self.solver
+        if solver_cache is not None:
+            cached = solver_cache.get(solver, lamp_brightnesses, target_group_brightness)
+            if cached is not None:
+                _LOGGER.debug("[Cache] LRU-Treffer für '%s' (Ziel=%s)", self._name, target_group_brightness)
+                self._last_solve = (solver, "lru", lamp_brightnesses, target_group_brightness, cached, 0)
+                return cached
+
+        result = await self.adjust_brightness_until_match(
+            lamp_brightnesses.copy(),
+            target_group_brightness,
+            warm_states
+        )
+        # Warmstart-Ergebnisse hängen vom bisherigen Slider-Weg ab, der Cache-Schlüssel
+        # aber nur von Baseline und Ziel => nur Kaltstarts teilen
+        if solver_cache is not None and not self._last_solve_warm:
+            solver_cache.put(solver, lamp_brightnesses, target_group_brightness, result)
+        # Nur Referenzen merken (für die Diagnose), keine Kopien
+        self._last_solve = (
+            solver, "warm" if self._last_solve_warm else "solver", lamp_brightnesses,
+            target_group_brightness, result, self._last_solve_iterations,
+        )
+        return result
+
 # ----------------------------------------------------------
 #   NEUE VERSION von calculate_new_brightness und
 #   adjust_brightness_until_match mit "Late Rounding"
@@ -933,11 +1113,40 @@ class CustomLightGroup(LightEntity):
         return new_val  # => float zurückgeben
     
     
-    async def adjust_brightness_until_match(self, group_brightness_cache, target_group_brightness):
+    def _pick_warm_start(self, warm_states, lamp_initial_brightness, target_group_brightness):
+        """
+        Sucht aus den gespeicherten Float-Zuständen dieser Baseline (Schlüssel:
+        tatsächlich erreichter Mittelwert) den, der zwischen Ausgangs-Mittelwert
+        und neuem Ziel liegt und dem Ziel am nächsten ist. Nur dann liegt er auf demselben Dimm-Pfad (gleiche Richtung,
+        gleiche Gewichtung) wie ein Kaltstart; sonst None.
+        """
+        start_group_brightness = sum(lamp_initial_brightness.values()) / len(lamp_initial_brightness)
+        low, high = sorted((start_group_brightness, target_group_brightness))
+        best_target = None
+        for warm_target in warm_states:
+            if warm_target == start_group_brightness or not low <= warm_target <= high:
+                continue
+            if best_target is None or abs(target_group_brightness - warm_target) < abs(target_group_brightness - best_target):
+                best_target = warm_target
+        if best_target is None:
+            return None
+        return warm_states[best_target]
+
+    async def adjust_brightness_until_match(self, group_brightness_cache, target_group_brightness, warm_states=None):
         """
         Nur am Ende runden wir auf int, anstatt in jeder Iteration.
+        Im Modus "scaling" wird der Fixpunkt direkt über solver.solve_scaling gelöst.
+        warm_states ({erreichter Mittelwert: {entity_id: float}}) stammt aus dem
+        Cache-Eintrag der aktuellen Baseline: passende Zustände dienen als
+        Warmstart, das beste Ergebnis jedes Laufs (auch ohne Konvergenz) wird
+        dort abgelegt.
         """
         _LOGGER.debug("[Cache] => Starte adjust_brightness_until_match(...)")
+        self._last_solve_warm = False
+
+        if self.solver == SOLVER_SCALING:
+            self._last_solve_iterations = 0
+            return solve_scaling(group_brightness_cache, target_group_brightness)
         
         tolerance = 0.01
         max_iterations = 150
@@ -952,10 +1161,19 @@ class CustomLightGroup(LightEntity):
         active_lamps = {lp: float(val) for lp, val in group_brightness_cache.items() if val > 0}
         if not active_lamps:
             _LOGGER.debug("[Cache] Keine aktiven Lampen => leeres Ergebnis.")
+            self._last_solve_iterations = 0
             return {}
     
         # Initialwerte sichern, um pro Gruppe zu wissen, wer dieselbe Ausgangshelligkeit hatte
         lamp_initial_brightness = active_lamps.copy()
+
+        # Warmstart vom nächstgelegenen gemerkten Zustand derselben Baseline
+        if warm_states:
+            warm_start = self._pick_warm_start(warm_states, lamp_initial_brightness, target_group_brightness)
+            if warm_start is not None and warm_start.keys() == active_lamps.keys():
+                _LOGGER.debug("[Cache] Warmstart für '%s' (Ziel=%s)", self._name, target_group_brightness)
+                active_lamps = warm_start.copy()
+                self._last_solve_warm = True
     
         try:
             for iteration in range(max_iterations):
@@ -969,14 +1187,8 @@ class CustomLightGroup(LightEntity):
                     best_result = active_lamps.copy()  # float-Zwischenwerte
     
                 if deviation <= tolerance:
-                    _LOGGER.debug(f"Iteration={iteration}, Toleranz erreicht => Abbruch.")
                     break
     
-                _LOGGER.debug(
-                    f"Iteration={iteration}, current={current_group_brightness:.2f}, "
-                    f"target={target_group_brightness:.2f}, dev={deviation:.2f}"
-                )
-    
                 # Teilgruppen: Alle Lampen mit gleicher "initial brightness"
                 brightness_groups = {}
                 for lamp in active_lamps:
@@ -987,8 +1199,6 @@ class CustomLightGroup(LightEntity):
                 for init_val, lamp_list in brightness_groups.items():
                     if not lamp_list:
                         continue
-                    # Durschnitt nur innerhalb dieser Teilgruppe
-                    old_group_val = sum(active_lamps[l] for l in lamp_list) / len(lamp_list)
     
                     # Repräsentative Lampe: Erst für eine Lampe berechnen, dann übernehmen
                     representative_lamp = lamp_list[0]
@@ -1002,21 +1212,25 @@ class CustomLightGroup(LightEntity):
                         lamp_id=representative_lamp
                     )
     
-                    _LOGGER.debug(
-                        f"[Cache] Teilgruppe init_val={init_val}, alter Mittelwert={old_group_val:.2f}, "
-                        f"repr. Lamp {representative_lamp} => {new_representative:.2f}, lamps={lamp_list}"
-                    )
     
                     # Setze alle Lampen dieser Teilgruppe auf den neuen repräsentativen Wert (float)
                     for lamp in lamp_list:
                         active_lamps[lamp] = new_representative
                         group_brightness_cache[lamp] = new_representative
             else:
-                _LOGGER.warning(f"{max_iterations} Iterationen ausgereizt, Restabweichung={best_deviation:.2f}")
+                _LOGGER.warning("%s Iterationen ausgereizt, Restabweichung=%.2f", max_iterations, best_deviation)
     
             # Am Ende: best_result hat die "beste" Annäherung als Float => jetzt rundest du EINMAL
             if not best_result:
                 best_result = active_lamps
+
+            # Auch nicht konvergierte Zustände merken (große Gruppen schaffen die
+            # Toleranz in 150 Iterationen oft nicht): sie liegen auf dem Weg von der
+            # Baseline zum Ziel und werden unter dem erreichten Mittelwert abgelegt
+            if warm_states is not None and best_result:
+                warm_states[sum(best_result.values()) / len(best_result)] = best_result
+            self._last_solve_iterations = iteration + 1
+            self._trace(self._name, "solve", target_group_brightness, iteration + 1, best_deviation)
     
             final_result = {
                 lamp: int(round(value)) for lamp, value in best_result.items()
@@ -1049,7 +1263,7 @@ class CustomLightGroup(LightEntity):
             chosen_color_mode = "temp"
     
         for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
+            state = self._member_state(entity_id)
             if group_is_on and (not state or state.state == "off"):
                 continue
             if (
@@ -1057,33 +1271,34 @@ class CustomLightGroup(LightEntity):
                 or state.state == "unavailable"
                 or state.state == "unknown"
             ):
-                _LOGGER.debug(f"Lampe {entity_id} ist unavailable/unknown, überspringe Service-Call.")
+                _LOGGER.debug("Lampe %s ist unavailable/unknown, überspringe Service-Call.", entity_id)
                 continue
     
-            updated_attributes = dict(state.attributes) if state else {}
+            attributes = state.attributes
+            changes = {}
             service_data = {"entity_id": entity_id}
     
             # 2) Schreibe **nur** den ausgewählten Farbmodus ins service_data
-            if chosen_color_mode == "hs" and ATTR_HS_COLOR in updated_attributes:
+            if chosen_color_mode == "hs" and ATTR_HS_COLOR in attributes:
                 service_data[ATTR_HS_COLOR] = hs_color
-                updated_attributes[ATTR_HS_COLOR] = hs_color
+                changes[ATTR_HS_COLOR] = hs_color
     
-            elif chosen_color_mode == "xy" and ATTR_XY_COLOR in updated_attributes:
+            elif chosen_color_mode == "xy" and ATTR_XY_COLOR in attributes:
                 service_data[ATTR_XY_COLOR] = xy_color
-                updated_attributes[ATTR_XY_COLOR] = xy_color
+                changes[ATTR_XY_COLOR] = xy_color
     
-            elif chosen_color_mode == "temp" and ATTR_COLOR_TEMP in updated_attributes:
+            elif chosen_color_mode == "temp" and ATTR_COLOR_TEMP in attributes:
                 mired_val = kelvin_to_mired(kelvin_temp)
                 service_data[ATTR_COLOR_TEMP] = mired_val
-                updated_attributes[ATTR_COLOR_TEMP] = mired_val
+                changes[ATTR_COLOR_TEMP] = mired_val
     
             # Effekt darf mit hinzu
-            if effect is not None and ATTR_EFFECT in updated_attributes:
+            if effect is not None and ATTR_EFFECT in attributes:
                 service_data[ATTR_EFFECT] = effect
-                updated_attributes[ATTR_EFFECT] = effect
+                changes[ATTR_EFFECT] = effect
     
-            # Update Home Assistant State
-            self.hass.states.async_set(entity_id, "on", updated_attributes)
+            # Optimistisch im Schatten-Zustand der Gruppe
+            self._async_set_member_state(entity_id, changes)
     
             # So wie vorher:
             if not group_is_on:
@@ -0,0 +1,92 @@
+"""
+Phasen-Profiling der Befehls-Pipeline einer Gruppe (Service light_group_dimmer.profile).
+
+Ist für eine Gruppe ein PhaseProfiler aktiv, werden die nächsten N Befehle
+phasenweise gemessen: snapshot (store_brightness_cache), solve
+(solve_brightness), payload (Service-Daten bauen), dispatch (Service-Calls
+inkl. Rate-Limit) und refresh (Gruppenzustand neu berechnen/schreiben).
+Danach meldet sich der Profiler über on_done mit einer Auswertung und wird
+wieder entfernt. Ohne Profiler kostet das im Hot-Path nur eine None-Abfrage.
+"""
+
+from time import perf_counter
+
+PHASES = ("snapshot", "solve", "payload", "dispatch", "refresh")
+
+
+class PhaseProfiler:
+    """Misst die Phasen der nächsten `commands` Befehle einer Gruppe."""
+
+    def __init__(self, group, commands, on_done):
+        self.group = group
+        self.commands = commands
+        self.remaining = commands
+        self._on_done = on_done
+        self._samples = {phase: [] for phase in PHASES}  # {phase: [ms pro Befehl]}
+        self._totals = []  # Gesamtdauer pro Befehl (ms)
+        self._services = []
+        self._current = None
+        self._started = None
+
+    def begin(self, service):
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._started = perf_counter()
+        self._services.append(service)
+
+    def add(self, phase, seconds):
+        if self._current is not None:
+            self._current[phase] += seconds
+
+    def end(self):
+        """Befehl abgeschlossen; True, wenn alle Befehle gemessen sind (Profiler fertig)."""
+        if self._current is None:
+            return False
+        self._totals.append((perf_counter() - self._started) * 1000)
+        for phase, seconds in self._current.items():
+            self._samples[phase].append(seconds * 1000)
+        self._current = None
+        self.remaining -= 1
+        if self.remaining > 0:
+            return False
+        self._on_done(self.report())
+        return True
+
+    def report(self):
+        total = sum(self._totals)
+        phases = {}
+        for phase, samples in self._samples.items():
+            phase_total = sum(samples)
+            phases[phase] = {
+                "mean_ms": round(phase_total / len(samples), 3) if samples else 0.0,
+                "max_ms": round(max(samples), 3) if samples else 0.0,
+                "share": round(phase_total / total, 3) if total else 0.0,
+            }
+        measured = sum(sum(samples) for samples in self._samples.values())
+        return {
+            "group": self.group,
+            "commands": len(self._totals),
+            "services": {
+                service: self._services.count(service) for service in set(self._services)
+            },
+            "total_mean_ms": round(total / len(self._totals), 3) if self._totals else 0.0,
+            "phases": phases,
+            # Zeit außerhalb der gemessenen Phasen (Schleifen, Filter, Schatten-Zustand ...)
+            "other_share": round(1 - measured / total, 3) if total else 0.0,
+        }
+
+
+def format_report(report):
+    """Kurzfassung für die Persistent Notification."""
+    lines = [
+        f"**{report['group']}** – {report['commands']} Befehle, "
+        f"Ø {report['total_mean_ms']:.2f} ms pro Befehl",
+        "",
+        "| Phase | Ø ms | max ms | Anteil |",
+        "|---|---|---|---|",
+    ]
+    for phase, values in report["phases"].items():
+        lines.append(
+            f"| {phase} | {values['mean_ms']:.2f} | {values['max_ms']:.2f} | {values['share']:.0%} |"
+        )
+    lines.append(f"| sonstiges | | | {report['other_share']:.0%} |")
+    return "\n".join(lines)
@@ -0,0 +1,163 @@
+"""
+Gemeinsamer Rate-Limiter für ausgehende light.turn_on/turn_off-Aufrufe.
+
+Eine Hue Bridge verarbeitet nur etwa 10 Lichtbefehle pro Sekunde, danach
+werden Befehle verzögert oder verworfen. Alle CustomLightGroup-Instanzen
+teilen sich deshalb pro Backend (Integration + Config-Eintrag der Lampe,
+z. B. eine bestimmte Hue Bridge) einen Token-Bucket. turn_off hat Vorrang
+vor wartenden turn_on-Befehlen.
+
+Ein Token entspricht einer Bridge-Anfrage: die Hue-Integration schickt für
+jede Lampe eines Service-Calls eine eigene Anfrage, ein Hue-Raum
+(grouped_light) ist dagegen eine einzige. Begrenzt wird nur, was per
+rate_limits konfiguriert ist.
+"""
+
+import asyncio
+import heapq
+import itertools
+
+from homeassistant.helpers import entity_registry as er
+
+PRIORITY_TURN_OFF = 0
+PRIORITY_TURN_ON = 1
+
+
+def async_get_backend(hass, entity_id):
+    """
+    Liefert (platform, config_entry_id) der Lampe aus dem Entity-Registry,
+    z. B. ("hue", "<entry_id der Bridge>"). Unbekannte Entities => ("unknown", None).
+    """
+    entry = er.async_get(hass).async_get(entity_id)
+    if entry is None:
+        return ("unknown", None)
+    return (entry.platform, entry.config_entry_id)
+
+
+class TokenBucket:
+    """Token-Bucket mit Warteschlange (Heap nach Priorität, dann Reihenfolge)."""
+
+    __slots__ = (
+        "rate", "capacity", "tokens", "updated", "waiters", "drain_task",
+        "acquired", "total_wait", "max_wait", "max_depth",
+    )
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+        self.waiters = []  # [(priority, seq, cost, future)]
+        self.drain_task = None
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_depth = 0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, cost, now):
+        """Sekunden, bis genug Tokens da sind (größere Kosten als capacity dürfen ins Minus)."""
+        self.refill(now)
+        needed = min(cost, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def take(self, cost):
+        self.tokens -= cost
+
+
+class OutboundLimiter:
+    """
+    Integrationsweiter Limiter. rates: {platform oder config_entry_id: Befehle/s}.
+    Backends ohne konfigurierte Rate (oder Rate <= 0) werden nicht begrenzt.
+    """
+
+    def __init__(self, rates, burst=None):
+        self._rates = dict(rates or {})
+        self._burst = burst
+        self._buckets = {}
+        self._seq = itertools.count()
+
+    def _rate_for(self, backend):
+        platform, config_entry_id = backend
+        if config_entry_id is not None and config_entry_id in self._rates:
+            return self._rates[config_entry_id]
+        return self._rates.get(platform)
+
+    def _bucket(self, backend, now):
+        bucket = self._buckets.get(backend)
+        if bucket is None:
+            rate = self._rate_for(backend)
+            if not rate or rate <= 0:
+                return None
+            bucket = self._buckets[backend] = TokenBucket(rate, self._burst or rate, now)
+        return bucket
+
+    async def async_acquire(self, backend, cost=1, priority=PRIORITY_TURN_ON):
+        """Wartet, bis für backend genug Tokens frei sind."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        bucket = self._bucket(backend, now)
+        if bucket is None:
+            return
+
+        if not bucket.waiters and bucket.time_until(cost, now) == 0.0:
+            bucket.take(cost)
+            bucket.acquired += 1
+            return
+
+        future = loop.create_future()
+        heapq.heappush(bucket.waiters, (priority, next(self._seq), cost, future))
+        bucket.max_depth = max(bucket.max_depth, len(bucket.waiters))
+        if bucket.drain_task is None or bucket.drain_task.done():
+            bucket.drain_task = loop.create_task(self._drain(bucket))
+
+        await future
+        waited = loop.time() - now
+        bucket.acquired += 1
+        bucket.total_wait += waited
+        bucket.max_wait = max(bucket.max_wait, waited)
+
+    async def _drain(self, bucket):
+        loop = asyncio.get_running_loop()
+        while bucket.waiters:
+            _, _, cost, future = bucket.waiters[0]
+            if future.done():  # Aufrufer wurde abgebrochen
+                heapq.heappop(bucket.waiters)
+                continue
+            wait = bucket.time_until(cost, loop.time())
+            if wait > 0:
+                # Neue turn_off-Befehle können sich währenddessen vordrängeln
+                await asyncio.sleep(wait)
+                continue
+            heapq.heappop(bucket.waiters)
+            bucket.take(cost)
+            future.set_result(None)
+
+    def cancel(self):
+        """Bricht alle Warteschlangen ab (z. B. beim Entladen)."""
+        for bucket in self._buckets.values():
+            for _, _, _, future in bucket.waiters:
+                future.cancel()
+            bucket.waiters.clear()
+            if bucket.drain_task is not None:
+                bucket.drain_task.cancel()
+                bucket.drain_task = None
+
+    def stats(self):
+        return {
+            f"{platform}:{config_entry_id}": {
+                "rate": bucket.rate,
+                "tokens": round(bucket.tokens, 2),
+                "queue_depth": len(bucket.waiters),
+                "max_queue_depth": bucket.max_depth,
+                "acquired": bucket.acquired,
+                "avg_wait": bucket.total_wait / bucket.acquired if bucket.acquired else 0.0,
+                "max_wait": bucket.max_wait,
+            }
+            for (platform, config_entry_id), bucket in self._buckets.items()
+        }
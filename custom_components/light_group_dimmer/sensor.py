@@ -0,0 +1,80 @@
+"""
+Diagnose-Sensoren: Latenz einer Lichtgruppe vom Befehl bis zur Bestätigung.
+
+Nur aktiv mit "latency_sensors: true" in der YAML-Konfiguration. Wert ist
+das p95 der Gruppe in Millisekunden, p50/p99 und die Werte der einzelnen
+Lampen stehen in den Attributen.
+"""
+
+import logging
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, CONF_LATENCY_SENSORS, DEFAULT_LATENCY_SENSORS
+from .light import get_entry_groups, group_unique_id
+
+_LOGGER = logging.getLogger(__name__)
+
+# Die Werte werden nur beim Abfragen aus den Ringpuffern berechnet
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddEntitiesCallback):
+    if not hass.data[DOMAIN].get(CONF_LATENCY_SENSORS, DEFAULT_LATENCY_SENSORS):
+        return
+
+    entities = [
+        GroupLatencySensor(group["name"], group["entities"], group_unique_id(group["name"]))
+        for group in get_entry_groups(entry)
+        if group.get("entities")
+    ]
+    if entities:
+        async_add_entities(entities)
+        _LOGGER.debug("%d Latenz-Sensoren für Entry '%s' hinzugefügt.", len(entities), entry.title)
+
+
+class GroupLatencySensor(SensorEntity):
+    """
+    p95-Latenz einer Lichtgruppe (Befehl -> Bestätigung aller Lampen).
+
+    Gemessen werden nur Befehle, die jede Lampe bestätigt hat. Überholt beim
+    Ziehen am Slider ein neuerer Befehl den alten an der Bridge, fehlt der alte
+    in den Perzentilen und zählt in "unmeasured". Viele unmeasured bei wenigen
+    samples heißt: p95/p99 beruhen vor allem auf den letzten Befehlen einer Geste.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-outline"
+    # Werte pro Lampe nur live anzeigen, nicht im Recorder speichern
+    _unrecorded_attributes = frozenset({"lamps"})
+
+    def __init__(self, name, entities, group_unique_id):
+        self._group_unique_id = group_unique_id
+        self._entities = entities
+        self._attr_name = f"{name} Latenz"
+        self._attr_unique_id = f"{group_unique_id}_latency"
+        self._summary = {}
+
+    async def async_update(self):
+        self._summary = self.hass.data[DOMAIN]["latency"].group_summary(
+            self._group_unique_id, self._entities
+        )
+
+    @property
+    def native_value(self):
+        return self._summary.get("p95")
+
+    @property
+    def extra_state_attributes(self):
+        return self._summary
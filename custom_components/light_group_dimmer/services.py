@@ -0,0 +1,84 @@
+"""
+Services der Integration (light_group_dimmer.*).
+"""
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_DUMP_TRACE = "dump_trace"
+SERVICE_PROFILE = "profile"
+
+ATTR_GROUP = "group"
+ATTR_LIMIT = "limit"
+ATTR_COMMANDS = "commands"
+DEFAULT_PROFILE_COMMANDS = 10
+
+DUMP_TRACE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_GROUP): cv.entity_id,
+    vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+})
+
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_GROUP): cv.entity_id,
+    vol.Optional(ATTR_COMMANDS, default=DEFAULT_PROFILE_COMMANDS): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=1000)
+    ),
+})
+
+
+def _group_entity(hass, entity_id):
+    """Gruppen-Entity (CustomLightGroup) zu einer entity_id oder None."""
+    for entity in hass.data[DOMAIN]["group_entities"].values():
+        if entity.entity_id == entity_id:
+            return entity
+    return None
+
+
+def _group_name(hass, entity_id):
+    """Name der Gruppe zu einer entity_id (so steht sie im Flight-Recorder)."""
+    entity = _group_entity(hass, entity_id)
+    return entity.name if entity is not None else None
+
+
+def async_register_services(hass: HomeAssistant):
+    """Registriert die Services (einmal beim Setup der Integration)."""
+
+    async def async_dump_trace(call: ServiceCall):
+        group = None
+        if ATTR_GROUP in call.data:
+            group = _group_name(hass, call.data[ATTR_GROUP])
+            if group is None:
+                _LOGGER.warning("dump_trace: %s ist keine Lichtgruppe dieser Integration", call.data[ATTR_GROUP])
+                return {"records": []} if call.return_response else None
+        records = hass.data[DOMAIN]["trace"].dump(group, call.data.get(ATTR_LIMIT))
+        if call.return_response:
+            return {"records": records}
+        _LOGGER.info("Flight-Recorder (%d Einträge): %s", len(records), records)
+        return None
+
+    async def async_profile(call: ServiceCall):
+        entity = _group_entity(hass, call.data[ATTR_GROUP])
+        if entity is None:
+            _LOGGER.warning("profile: %s ist keine Lichtgruppe dieser Integration", call.data[ATTR_GROUP])
+            return
+        entity.async_start_profile(call.data[ATTR_COMMANDS])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_TRACE,
+        async_dump_trace,
+        schema=DUMP_TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
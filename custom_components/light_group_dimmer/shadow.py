@@ -0,0 +1,131 @@
+"""
+Schatten-Zustände für die Mitglieds-Lampen einer Gruppe.
+
+Für ein sofortiges UI-Feedback wurden früher die States fremder Lampen per
+hass.states.async_set mit kopierten Attributen überschrieben (Recorder-Zeilen,
+Events, neue State-Objekte). Jetzt hält jede Gruppe die optimistischen Werte
+nur bei sich: ShadowStates legt die geänderten Attribute über den echten State
+der Lampe, bis die Bridge den Zustand bestätigt oder der Schatten abläuft.
+"""
+
+import time
+from collections import ChainMap
+
+from .dispatch import freeze
+from .latency import BRIGHTNESS_TOLERANCE
+
+# Attribute, die für die Gruppen-Aggregation relevant sind
+AGGREGATED_ATTRIBUTES = (
+    "brightness", "color_temp", "hs_color", "rgb_color", "xy_color",
+    "effect", "effect_list", "supported_color_modes",
+)
+# So lange (Sekunden) gilt ein Schatten ohne Bestätigung der Bridge
+SHADOW_TTL = 10.0
+
+
+def confirms(shadow, real_state):
+    """
+    True, wenn der echte State die vom Schatten geänderten Attribute bestätigt.
+    Nur diese werden verglichen, die Helligkeit mit BRIGHTNESS_TOLERANCE
+    (Bridges runden auf Prozent).
+    """
+    if real_state.state != shadow.state:
+        return False
+    attributes = real_state.attributes
+    for key, value in shadow.changes.items():
+        if key not in AGGREGATED_ATTRIBUTES:
+            continue
+        reported = attributes.get(key)
+        if key == "brightness":
+            if reported is None or value is None or abs(reported - value) > BRIGHTNESS_TOLERANCE:
+                return False
+        elif freeze(reported) != freeze(value):
+            return False
+    return True
+
+
+class ShadowState:
+    """Minimaler State-Ersatz: "on" + geänderte Attribute über den echten Attributen."""
+
+    __slots__ = ("entity_id", "state", "changes", "attributes")
+
+    def __init__(self, entity_id, changes, real_attributes):
+        self.entity_id = entity_id
+        self.state = "on"
+        self.changes = changes
+        self.attributes = ChainMap(changes, real_attributes)
+
+
+class ShadowStates:
+    """Optimistische Werte der Mitglieder einer Gruppe."""
+
+    def __init__(self, ttl=SHADOW_TTL):
+        self.ttl = ttl
+        self._entries = {}  # {entity_id: (ShadowState, seit)}
+        self.written = 0
+        self.confirmed = 0
+        self.superseded = 0
+        self.expired = 0
+
+    def set(self, entity_id, real_state, changes):
+        """Legt (weitere) optimistische Werte für eine Lampe ab und liefert den Schatten."""
+        entry = self._entries.get(entity_id)
+        if entry is not None:
+            changes = {**entry[0].changes, **changes}
+        real_attributes = real_state.attributes if real_state is not None else {}
+        shadow = ShadowState(entity_id, dict(changes), real_attributes)
+        self._entries[entity_id] = (shadow, time.monotonic())
+        self.written += 1
+        return shadow
+
+    def get(self, entity_id, real_state):
+        """Effektiver Zustand: aktiver Schatten, sonst der echte State."""
+        entry = self._entries.get(entity_id)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return real_state
+        return entry[0]
+
+    def resolve(self, entity_id, real_state):
+        """
+        Ein echter State ist eingetroffen: Schatten verwerfen. True, wenn er
+        den Schatten bestätigt (siehe confirms), sonst gilt der Schatten als überholt.
+        """
+        entry = self._entries.pop(entity_id, None)
+        if entry is None:
+            return False
+        if real_state is not None and confirms(entry[0], real_state):
+            self.confirmed += 1
+            return True
+        self.superseded += 1
+        return False
+
+    def pop_expired(self):
+        """Entfernt abgelaufene Schatten und liefert deren entity_ids."""
+        now = time.monotonic()
+        expired = [
+            entity_id for entity_id, (_, since) in self._entries.items()
+            if now - since > self.ttl
+        ]
+        for entity_id in expired:
+            del self._entries[entity_id]
+        self.expired += len(expired)
+        return expired
+
+    def next_expiry(self):
+        """Sekunden, bis der älteste Schatten abläuft; None ohne Schatten."""
+        if not self._entries:
+            return None
+        oldest = min(since for _, since in self._entries.values())
+        return max(0.0, oldest + self.ttl - time.monotonic())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            "active": len(self._entries),
+            "written": self.written,
+            "confirmed": self.confirmed,
+            "superseded": self.superseded,
+            "expired": self.expired,
+        }
@@ -0,0 +1,132 @@
+"""
+Helligkeits-Solver für Light Group Dimmer.
+
+Die iterative Berechnung in CustomLightGroup.adjust_brightness_until_match
+verschiebt jede Lampe pro Durchlauf gewichtet in Richtung Zielwert:
+  - beim Abdunkeln mit Gewicht v/255  => alle Helligkeiten werden proportional
+    skaliert (v_neu = v * k)
+  - beim Aufhellen mit Gewicht 1 - v/255 => alle Abstände zu 255 werden
+    proportional skaliert (255 - v_neu = (255 - v) * k)
+
+Mit unendlich kleinen Schritten wäre das Ergebnis genau ein gemeinsamer
+Skalierungsfaktor k; da der Gruppen-Mittelwert linear in k ist, reicht eine
+geschlossene Formel – O(Lampen) statt O(Iterationen x Teilgruppen x Lampen).
+Die Schleife macht endliche Schritte und aktualisiert die Teilgruppen
+nacheinander, ihre Lampen landen deshalb nur in der Nähe dieses Ergebnisses
+(Schranke hergeleitet in tests/test_solver.py, sie fällt mit 1/Lampenzahl).
+"""
+
+from collections import OrderedDict
+
+from .const import SOLVER_SCALING
+
+MAX_BRIGHTNESS = 255.0
+
+
+def active_brightnesses(lamp_brightnesses):
+    """Nur Lampen mit Helligkeit > 0 bilden die Rechenbasis (wie im iterativen Solver)."""
+    return {lamp: float(val) for lamp, val in lamp_brightnesses.items() if val > 0}
+
+
+def scale_brightnesses(active_lamps, target_group_brightness):
+    """
+    Liefert die Float-Helligkeiten je Lampe, deren Mittelwert exakt
+    target_group_brightness entspricht. Erwartet nur aktive Lampen (> 0).
+    """
+    if not active_lamps:
+        return {}
+    if target_group_brightness >= MAX_BRIGHTNESS:
+        return {lamp: MAX_BRIGHTNESS for lamp in active_lamps}
+
+    target = max(0.0, float(target_group_brightness))
+    current = sum(active_lamps.values()) / len(active_lamps)
+
+    if target > current:
+        # Aufhellen: helle Lampen bekommen proportional weniger dazu
+        factor = (MAX_BRIGHTNESS - target) / (MAX_BRIGHTNESS - current)
+        return {
+            lamp: MAX_BRIGHTNESS - (MAX_BRIGHTNESS - val) * factor
+            for lamp, val in active_lamps.items()
+        }
+
+    # Abdunkeln (oder keine Änderung): proportional zur Ausgangshelligkeit
+    factor = target / current
+    return {lamp: val * factor for lamp, val in active_lamps.items()}
+
+
+def solve_scaling(lamp_brightnesses, target_group_brightness):
+    """
+    Ersatz für die 150-Iterationen-Schleife: gleiche Gewichtung, aber direkt
+    gelöst; trifft den Gruppenwert und erhält die Reihenfolge der Lampen. Rückgabe wie adjust_brightness_until_match:
+    {entity_id: int-Helligkeit} nur für aktive Lampen.
+    """
+    result = scale_brightnesses(active_brightnesses(lamp_brightnesses), target_group_brightness)
+    return {lamp: int(round(value)) for lamp, value in result.items()}
+
+
+class SolverCache:
+    """
+    Integrationsweiter LRU-Cache für Solver-Ergebnisse.
+
+    Schlüssel ist (solver, Baseline-Tupel, ziel). Das Ergebnis hängt nur von den
+    Helligkeitswerten ab, nicht von den Entity-IDs – deshalb wird je Baseline-Wert
+    das Ergebnis gespeichert und beim Treffer wieder auf die Lampen verteilt.
+    So profitieren auch verschiedene Gruppen mit gleicher Baseline.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(solver, lamp_brightnesses, target):
+        values = tuple(float(val) for val in lamp_brightnesses.values() if val > 0)
+        if solver == SOLVER_SCALING:
+            # Reihenfolge egal => sortiert
+            values = tuple(sorted(values))
+        # Der iterative Solver arbeitet die Teilgruppen in Einfügereihenfolge ab
+        return solver, values, target
+
+    def get(self, solver, lamp_brightnesses, target):
+        """Liefert {entity_id: brightness} oder None bei Cache-Miss."""
+        if self.capacity <= 0:
+            return None
+        key = self.make_key(solver, lamp_brightnesses, target)
+        by_value = self._entries.get(key)
+        if by_value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return {
+            lamp: by_value[float(val)]
+            for lamp, val in lamp_brightnesses.items() if val > 0
+        }
+
+    def put(self, solver, lamp_brightnesses, target, result):
+        """Speichert ein Solver-Ergebnis und verdrängt ggf. den ältesten Eintrag."""
+        if self.capacity <= 0:
+            return
+        key = self.make_key(solver, lamp_brightnesses, target)
+        self._entries[key] = {
+            float(lamp_brightnesses[lamp]): value for lamp, value in result.items()
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
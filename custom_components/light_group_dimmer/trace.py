@@ -0,0 +1,82 @@
+"""
+Flight-Recorder: immer aktiver Ringpuffer mit strukturierten Trace-Einträgen.
+
+Statt im Hot-Path Debug-Strings zu formatieren, schreiben Gruppen und Solver
+kurze Einträge (Zeitpunkt, Gruppe, Phase, bis zu drei Zahlen) in einen fest
+vorbelegten Ringpuffer. Ein Eintrag überschreibt nur die Felder eines
+vorhandenen Objekts – keine Allokation, keine Formatierung. Ausgelesen wird
+der Puffer erst bei Bedarf über den Service light_group_dimmer.dump_trace
+oder den Diagnose-Download.
+"""
+
+import time
+
+# Anzahl der Einträge im Ringpuffer
+TRACE_SIZE = 2048
+
+
+class TraceRecord:
+    """Ein Eintrag im Ringpuffer (wird wiederverwendet)."""
+
+    __slots__ = ("ts", "group", "phase", "a", "b", "c")
+
+    def __init__(self):
+        self.ts = 0.0
+        self.group = None
+        self.phase = None
+        self.a = None
+        self.b = None
+        self.c = None
+
+    def as_dict(self, now):
+        values = [self.a, self.b, self.c]
+        while values and values[-1] is None:
+            values.pop()
+        return {
+            "age": round(now - self.ts, 4),
+            "group": self.group,
+            "phase": self.phase,
+            "values": values,
+        }
+
+
+class FlightRecorder:
+    """Integrationsweiter Ringpuffer fester Größe."""
+
+    def __init__(self, size=TRACE_SIZE):
+        self._records = [TraceRecord() for _ in range(size)]
+        self._size = size
+        self._next = 0
+        self.written = 0
+
+    def record(self, group, phase, a=None, b=None, c=None):
+        entry = self._records[self._next]
+        entry.ts = time.monotonic()
+        entry.group = group
+        entry.phase = phase
+        entry.a = a
+        entry.b = b
+        entry.c = c
+        self._next = (self._next + 1) % self._size
+        self.written += 1
+
+    def dump(self, group=None, limit=None):
+        """Einträge (älteste zuerst), optional nur für eine Gruppe und nur die letzten limit."""
+        count = min(self.written, self._size)
+        start = (self._next - count) % self._size
+        now = time.monotonic()
+        records = [
+            entry.as_dict(now)
+            for entry in (self._records[(start + offset) % self._size] for offset in range(count))
+            if group is None or entry.group == group
+        ]
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return records
+
+    def stats(self):
+        return {
+            "size": self._size,
+            "written": self.written,
+            "overwritten": max(0, self.written - self._size),
+        }
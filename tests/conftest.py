@@ -0,0 +1,13 @@
+"""
+Tests laufen ohne Home Assistant: die Integration wird gegen die schlanken
+homeassistant.*-Ersatzmodule aus benchmarks/fake_hass.py geladen.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import fake_hass  # noqa: E402
+
+fake_hass.load_integration()
@@ -0,0 +1,74 @@
+"""GroupAggregator: inkrementelle Updates liefern dasselbe wie ein kompletter Rescan."""
+
+import random
+from types import SimpleNamespace
+
+from custom_components.light_group_dimmer.aggregate import GroupAggregator
+
+MEMBERS = [f"light.lamp_{index}" for index in range(6)]
+
+
+def _mired_to_kelvin(mired):
+    return 1000000 / mired
+
+
+def _state(on, **attributes):
+    return SimpleNamespace(state="on" if on else "off", attributes=attributes)
+
+
+def _random_state(rng):
+    if rng.random() < 0.2:
+        return None  # Lampe entfernt / unbekannt
+    attributes = {"brightness": rng.randint(1, 255)}
+    if rng.random() < 0.5:
+        attributes["color_temp"] = rng.randint(153, 500)
+    if rng.random() < 0.5:
+        attributes["hs_color"] = (rng.randint(0, 360), rng.randint(0, 100))
+    if rng.random() < 0.3:
+        attributes["effect"] = rng.choice(["colorloop", "none"])
+    return _state(rng.random() < 0.7, **attributes)
+
+
+def _snapshot(aggregator):
+    return (
+        aggregator.is_on, aggregator.brightness, aggregator.color_temp,
+        aggregator.color_temp_kelvin, aggregator.hs_color, aggregator.effect,
+    )
+
+
+def test_incremental_updates_match_full_rebuild():
+    rng = random.Random(3)
+    states = dict.fromkeys(MEMBERS)
+    incremental = GroupAggregator(MEMBERS, _mired_to_kelvin)
+    for _ in range(500):
+        entity_id = rng.choice(MEMBERS)
+        states[entity_id] = _random_state(rng)
+        incremental.update(entity_id, states[entity_id])
+
+        rebuilt = GroupAggregator(MEMBERS, _mired_to_kelvin)
+        rebuilt.rebuild(states.get)
+        assert _snapshot(incremental) == _snapshot(rebuilt)
+
+
+def test_first_value_follows_member_order():
+    aggregator = GroupAggregator(MEMBERS, _mired_to_kelvin)
+    aggregator.update(MEMBERS[2], _state(True, brightness=100, hs_color=(20, 80)))
+    aggregator.update(MEMBERS[0], _state(True, brightness=200, hs_color=(240, 50)))
+    assert aggregator.hs_color == (240, 50)
+    assert aggregator.brightness == 150
+
+    # Erste Lampe schaltet aus => Farbe der nächsten eingeschalteten Lampe
+    aggregator.update(MEMBERS[0], _state(False, brightness=200, hs_color=(240, 50)))
+    assert aggregator.hs_color == (20, 80)
+    assert aggregator.brightness == 100
+
+    aggregator.update(MEMBERS[2], None)
+    assert not aggregator.is_on
+    assert aggregator.brightness == 0
+    assert aggregator.hs_color is None
+
+
+def test_unknown_entities_are_ignored():
+    aggregator = GroupAggregator(MEMBERS, _mired_to_kelvin)
+    aggregator.update("light.stranger", _state(True, brightness=255))
+    assert not aggregator.is_on
@@ -0,0 +1,81 @@
+"""BrightnessCacheManager: LRU-Verdrängung nach Anzahl und Lampenwerten, Ablauf."""
+
+from custom_components.light_group_dimmer.brightness_cache import BrightnessCacheManager
+
+
+class _Expiry:
+    """Hält die Fristen fest; Ablauf wird im Test von Hand ausgelöst."""
+
+    def __init__(self):
+        self.actions = {}
+
+    def async_schedule(self, key, delay, action):
+        self.actions[key] = action
+
+    def async_cancel(self, key):
+        self.actions.pop(key, None)
+
+    def remaining(self, key):
+        return 1.0 if key in self.actions else None
+
+    def fire(self, key):
+        self.actions.pop(key)()
+
+
+def _lamps(count):
+    return {f"light.lamp_{index}": 100 for index in range(count)}
+
+
+def test_least_recently_used_snapshot_is_evicted_first():
+    expiry = _Expiry()
+    manager = BrightnessCacheManager(expiry, max_snapshots=2, max_cells=1000)
+    manager.create("a", 100, _lamps(2), delay=5)
+    manager.create("b", 100, _lamps(2), delay=5)
+    manager.touch("a", delay=5)  # "b" ist jetzt der älteste
+    manager.create("c", 100, _lamps(2), delay=5)
+
+    assert manager.get("b") is None
+    assert manager.get("a") is not None
+    assert manager.get("c") is not None
+    # Verdrängter Snapshot hat keine Frist mehr
+    assert set(expiry.actions) == {"a", "c"}
+    assert manager.stats()["evictions"] == 1
+    assert (manager.hits, manager.misses) == (2, 1)
+
+
+def test_cell_limit_evicts_old_snapshots_and_trims_oversized_one():
+    expiry = _Expiry()
+    manager = BrightnessCacheManager(expiry, max_snapshots=10, max_cells=10)
+    manager.create("a", 100, _lamps(4), delay=5)
+    manager.create("b", 100, _lamps(4), delay=5)
+    assert manager.stats()["cells"] == 8
+
+    # Zieltabelle von "b" wächst über die Grenze => "a" wird verdrängt
+    snapshot = manager.get("b")
+    snapshot.targets[50] = _lamps(4)
+    manager.touch("b", delay=5)
+    assert manager.get("a") is None
+    assert manager.stats()["cells"] == 8
+
+    # Allein zu groß => Zieltabelle und Warmstarts werden verworfen, Snapshot bleibt
+    snapshot.targets[60] = _lamps(4)
+    snapshot.warm_states[55.0] = _lamps(4)
+    manager.touch("b", delay=5)
+    assert manager.get("b") is snapshot
+    assert snapshot.targets == {} and snapshot.warm_states == {}
+    assert manager.stats()["trimmed"] == 1
+
+
+def test_expired_snapshot_is_removed():
+    expiry = _Expiry()
+    manager = BrightnessCacheManager(expiry, max_snapshots=10, max_cells=1000)
+    manager.create("a", 100, _lamps(2), delay=5)
+    expiry.fire("a")
+    assert manager.get("a") is None
+    assert manager.stats()["expirations"] == 1
+    assert manager.stats()["live"] == 0
+    # Ein neuer Snapshot ersetzt einen vorhandenen, ohne zu verdrängen
+    manager.create("b", 100, _lamps(2), delay=5)
+    manager.create("b", 120, _lamps(2), delay=5)
+    assert manager.get("b").group_brightness == 120
+    assert manager.stats()["evictions"] == 0
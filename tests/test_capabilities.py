@@ -0,0 +1,53 @@
+"""Fähigkeiten-Cache: Neuberechnung nur bei geänderten Fingerprints."""
+
+from types import SimpleNamespace
+
+from custom_components.light_group_dimmer.capabilities import (
+    CapabilityRegistry,
+    GroupCapabilities,
+    normalize_color_modes,
+)
+
+
+def _state(modes, effects=(), brightness=None):
+    return SimpleNamespace(
+        state="on",
+        attributes={"supported_color_modes": list(modes), "effect_list": list(effects), "brightness": brightness},
+    )
+
+
+def test_same_fingerprint_is_shared_between_lamps():
+    registry = CapabilityRegistry()
+    first = registry.intern(_state(["color_temp", "xy"], ["colorloop"]))
+    second = registry.intern(_state(["color_temp", "xy"], ["colorloop"], brightness=12))
+    assert first is second
+    assert registry.intern(None) is registry.intern(None)
+    assert registry.stats()["fingerprints"] == 2
+
+
+def test_group_recomputes_only_when_capabilities_change():
+    states = {
+        "light.a": _state(["color_temp", "xy"], ["colorloop"]),
+        "light.b": _state(["brightness"]),
+    }
+    group = GroupCapabilities(CapabilityRegistry(), states)
+    group.rebuild(states.get)
+    assert group.color_modes == {"color_temp", "hs"}
+    assert group.effect_list == ["colorloop"]
+    assert group.computations == 1
+
+    # Nur die Helligkeit ändert sich => Cache bleibt gültig
+    assert not group.update("light.b", _state(["brightness"], brightness=200))
+    assert group.color_modes == {"color_temp", "hs"}
+    assert group.computations == 1
+
+    assert group.update("light.b", _state(["onoff"], ["candle"]))
+    assert group.effect_list == ["candle", "colorloop"]
+    assert group.computations == 2
+
+
+def test_normalize_color_modes_follows_group_rules():
+    assert normalize_color_modes({"onoff"}) == {"onoff"}
+    assert normalize_color_modes({"onoff", "brightness"}) == {"brightness"}
+    assert normalize_color_modes({"brightness", "color_temp", "unknown"}) == {"color_temp"}
+    assert normalize_color_modes({"xy", "brightness"}) == {"xy"}
@@ -0,0 +1,93 @@
+"""LatestWinsScheduler: wartende Befehle fallen zusammen, der letzte wird immer ausgeführt."""
+
+import asyncio
+
+from custom_components.light_group_dimmer.dispatch import LatestWinsScheduler
+
+
+class _Recorder:
+    """Handler, deren erster Aufruf blockiert, bis release gesetzt ist."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    def handlers(self):
+        async def turn_on(**kwargs):
+            self.calls.append(("turn_on", kwargs))
+            await self.release.wait()
+
+        async def turn_off(**kwargs):
+            self.calls.append(("turn_off", kwargs))
+            await self.release.wait()
+
+        return {"turn_on": turn_on, "turn_off": turn_off}
+
+
+async def _async_submit_while_busy(commands):
+    """Erster Befehl läuft, alle weiteren kommen währenddessen an."""
+    recorder = _Recorder()
+    scheduler = LatestWinsScheduler(recorder.handlers())
+    tasks = [asyncio.create_task(scheduler.async_submit(*commands[0]))]
+    await asyncio.sleep(0)
+    for command in commands[1:]:
+        tasks.append(asyncio.create_task(scheduler.async_submit(*command)))
+        await asyncio.sleep(0)
+    recorder.release.set()
+    await asyncio.wait_for(asyncio.gather(*tasks), 1.0)
+    return recorder.calls, scheduler
+
+
+def test_queued_turn_on_commands_collapse_to_latest_values():
+    calls, scheduler = asyncio.run(_async_submit_while_busy([
+        ("turn_on", {"brightness": 50}),
+        ("turn_on", {"brightness": 100, "transition": 2}),
+        ("turn_on", {"brightness": 150}),
+        ("turn_on", {"brightness": 200, "hs_color": (30, 50)}),
+        ("turn_on", {"color_temp_kelvin": 2700}),
+    ]))
+    assert calls == [
+        ("turn_on", {"brightness": 50}),
+        # Neueste Helligkeit gewinnt, neue Farbe ersetzt die alte
+        ("turn_on", {"brightness": 200, "transition": 2, "color_temp_kelvin": 2700}),
+    ]
+    assert (scheduler.submitted, scheduler.collapsed, scheduler.dispatched) == (5, 3, 2)
+    assert not scheduler.pending
+
+
+def test_turn_off_replaces_queued_turn_on():
+    calls, _ = asyncio.run(_async_submit_while_busy([
+        ("turn_on", {"brightness": 50}),
+        ("turn_on", {"brightness": 200}),
+        ("turn_off", {"transition": 1}),
+    ]))
+    assert calls == [("turn_on", {"brightness": 50}), ("turn_off", {"transition": 1})]
+
+
+def test_final_command_is_applied_after_turn_off():
+    calls, _ = asyncio.run(_async_submit_while_busy([
+        ("turn_on", {"brightness": 50}),
+        ("turn_off", {}),
+        ("turn_on", {"brightness": 120}),
+    ]))
+    # Wechsel turn_off -> turn_on ersetzt komplett, nichts wird gemischt
+    assert calls[-1] == ("turn_on", {"brightness": 120})
+    assert len(calls) == 2
+
+
+def test_handler_error_reaches_all_waiting_callers():
+    async def _run():
+        async def turn_on(**kwargs):
+            raise RuntimeError("bridge down")
+
+        scheduler = LatestWinsScheduler({"turn_on": turn_on, "turn_off": turn_on})
+        results = await asyncio.gather(
+            scheduler.async_submit("turn_on", {"brightness": 1}),
+            scheduler.async_submit("turn_on", {"brightness": 2}),
+            return_exceptions=True,
+        )
+        return results, scheduler
+
+    results, scheduler = asyncio.run(_run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert scheduler.dispatched == 1
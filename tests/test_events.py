@@ -0,0 +1,129 @@
+"""StateChangeDispatcher und TrailingCoalescer aus events.py."""
+
+import asyncio
+
+import fake_hass
+
+from custom_components.light_group_dimmer.events import StateChangeDispatcher, TrailingCoalescer
+
+WINDOW = 0.05
+
+
+class _Confirmations:
+    def __init__(self):
+        self.calls = []
+
+    def confirm(self, entity_id, new_state):
+        self.calls.append(entity_id)
+
+
+def _listeners(hass, entity_id):
+    return len(hass.bus._state_listeners.get(entity_id, ()))
+
+
+async def _async_dispatcher_scenario():
+    hass = fake_hass.FakeHass()
+    confirmations = _Confirmations()
+    dispatcher = StateChangeDispatcher(hass, sent_states=confirmations)
+    received = {"kitchen": [], "all": []}
+    unregister_kitchen = dispatcher.async_register(
+        ["light.a", "light.b"], lambda event: received["kitchen"].append(event.data["entity_id"])
+    )
+    dispatcher.async_register(
+        ["light.b", "light.c"], lambda event: received["all"].append(event.data["entity_id"])
+    )
+    result = {"subscriptions": [_listeners(hass, lamp) for lamp in ("light.a", "light.b", "light.c")]}
+
+    hass.states.async_set("light.b", "on", {"brightness": 10})
+    hass.states.async_set("light.a", "on", {"brightness": 20})
+    result["received"] = {name: list(values) for name, values in received.items()}
+    result["confirmed"] = list(confirmations.calls)
+
+    unregister_kitchen()
+    result["after_unregister"] = [_listeners(hass, lamp) for lamp in ("light.a", "light.b", "light.c")]
+    hass.states.async_set("light.a", "off")
+    hass.states.async_set("light.b", "off")
+    result["received_after"] = {name: list(values) for name, values in received.items()}
+
+    dispatcher.async_shutdown()
+    result["after_shutdown"] = [_listeners(hass, lamp) for lamp in ("light.a", "light.b", "light.c")]
+    result["stats"] = dispatcher.stats()
+    return result
+
+
+def test_dispatcher_subscribes_once_and_delivers_to_affected_groups():
+    result = asyncio.run(_async_dispatcher_scenario())
+    # light.b gehört zu beiden Gruppen, hat aber nur ein Abo
+    assert result["subscriptions"] == [1, 1, 1]
+    assert result["received"] == {"kitchen": ["light.b", "light.a"], "all": ["light.b"]}
+    # Bestätigung einmal pro Event, nicht einmal pro Gruppe
+    assert result["confirmed"] == ["light.b", "light.a"]
+
+
+def test_dispatcher_unregister_drops_only_unshared_subscriptions():
+    result = asyncio.run(_async_dispatcher_scenario())
+    assert result["after_unregister"] == [0, 1, 1]
+    assert result["received_after"] == {"kitchen": ["light.b", "light.a"], "all": ["light.b", "light.b"]}
+    assert result["after_shutdown"] == [0, 0, 0]
+    assert result["stats"]["entities"] == 0
+
+
+async def _async_coalescer_scenario():
+    hass = fake_hass.FakeHass()
+    seen = []  # Anzahl der Events, die beim Schreiben schon vorlagen
+    counter = [0]
+    coalescer = TrailingCoalescer(hass, WINDOW, lambda: seen.append(counter[0]))
+
+    def event():
+        counter[0] += 1
+        coalescer.async_schedule()
+
+    for _ in range(5):
+        event()
+    await asyncio.sleep(WINDOW * 3)
+    # Event direkt nach dem Schreiben => eigenes Fenster
+    event()
+    await asyncio.sleep(WINDOW / 2)
+    event()
+    await asyncio.sleep(WINDOW * 3)
+    return seen, coalescer.stats()
+
+
+def test_coalescer_batches_burst_and_never_drops_the_last_event():
+    seen, stats = asyncio.run(_async_coalescer_scenario())
+    assert seen == [5, 7]
+    assert stats["events"] == 7
+    assert stats["writes"] == 2
+    assert stats["max_batch"] == 5
+    assert stats["last_batch"] == 2
+
+
+def test_coalescer_schedules_again_when_event_arrives_during_write():
+    async def _run():
+        hass = fake_hass.FakeHass()
+        writes = []
+
+        def action():
+            writes.append(len(writes))
+            if len(writes) == 1:
+                coalescer.async_schedule()  # Event während des Schreibens
+
+        coalescer = TrailingCoalescer(hass, WINDOW, action)
+        coalescer.async_schedule()
+        await asyncio.sleep(WINDOW * 4)
+        return writes
+
+    assert asyncio.run(_run()) == [0, 1]
+
+
+def test_coalescer_cancel_drops_pending_write():
+    async def _run():
+        hass = fake_hass.FakeHass()
+        writes = []
+        coalescer = TrailingCoalescer(hass, WINDOW, lambda: writes.append(1))
+        coalescer.async_schedule()
+        coalescer.async_cancel()
+        await asyncio.sleep(WINDOW * 3)
+        return writes
+
+    assert asyncio.run(_run()) == []
@@ -0,0 +1,66 @@
+"""ExpiryWheel: Fristen laufen in Reihenfolge ab, Resets verschieben sie."""
+
+import asyncio
+
+import fake_hass
+
+from custom_components.light_group_dimmer.expiry import ExpiryWheel
+
+STEP = 0.05
+
+
+async def _async_run(scenario):
+    hass = fake_hass.FakeHass()
+    wheel = ExpiryWheel(hass)
+    expired = []
+
+    def action(key):
+        return lambda: expired.append(key)
+
+    await scenario(wheel, action, expired)
+    wheel.async_shutdown()
+    return expired, wheel.stats()
+
+
+def test_deadlines_expire_in_order():
+    async def scenario(wheel, action, expired):
+        wheel.async_schedule("late", 3 * STEP, action("late"))
+        wheel.async_schedule("early", STEP, action("early"))
+        wheel.async_schedule("middle", 2 * STEP, action("middle"))
+        await asyncio.sleep(4 * STEP)
+
+    expired, stats = asyncio.run(_async_run(scenario))
+    assert expired == ["early", "middle", "late"]
+    assert stats["expirations"] == 3
+    assert stats["live"] == 0
+
+
+def test_reset_postpones_and_cancel_drops_deadline():
+    async def scenario(wheel, action, expired):
+        wheel.async_schedule("slider", 2 * STEP, action("slider"))
+        wheel.async_schedule("gone", STEP, action("gone"))
+        wheel.async_cancel("gone")
+        await asyncio.sleep(STEP)
+        # Slider bewegt: Frist wird verschoben, nicht verdoppelt
+        wheel.async_schedule("slider", 3 * STEP, action("slider"))
+        await asyncio.sleep(2 * STEP)
+        assert expired == []
+        assert 0 < wheel.remaining("slider") < 2 * STEP
+        await asyncio.sleep(2 * STEP)
+
+    expired, stats = asyncio.run(_async_run(scenario))
+    assert expired == ["slider"]
+    assert stats["resets"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_earlier_reset_rearms_the_single_timer():
+    async def scenario(wheel, action, expired):
+        wheel.async_schedule("a", 10 * STEP, action("a"))
+        wheel.async_schedule("a", STEP, action("a"))
+        await asyncio.sleep(2 * STEP)
+        assert expired == ["a"]
+        assert wheel.remaining("a") is None
+
+    expired, _ = asyncio.run(_async_run(scenario))
+    assert expired == ["a"]
@@ -0,0 +1,46 @@
+"""Geschriebener Gruppenzustand nach Befehlen und Bestätigungen der Lampen."""
+
+import asyncio
+
+import fake_hass
+
+# Abgeleitete Farbwerte, die eine Hue-Bridge zu color_temp mitliefert
+DERIVED_COLOR = {"xy_color": (0.4578, 0.41), "hs_color": (30.0, 55.0)}
+# Die Bestätigung kommt erst nach dem Befehl (wie bei einer echten Bridge)
+CONFIRM_DELAY = 0.05
+
+
+async def _async_color_temp_echo():
+    hass = fake_hass.FakeHass()
+    await fake_hass.async_setup_integration(hass, solver="scaling", update_window=0.01)
+
+    def _confirm(data):
+        # Ein state_changed pro Lampe: gesendete plus abgeleitete Werte
+        changes = {key: value for key, value in data.items() if key != "entity_id"}
+        entity_ids = data["entity_id"]
+        for entity_id in [entity_ids] if isinstance(entity_ids, str) else entity_ids:
+            state = hass.states.get(entity_id)
+            hass.states.async_set(entity_id, "on", {**state.attributes, **changes, **DERIVED_COLOR})
+
+    async def _handle(call):
+        hass.loop.call_later(CONFIRM_DELAY, _confirm, dict(call.data))
+
+    hass.services.async_register("light", "turn_on", _handle)
+    entity_ids = fake_hass.add_lamps(hass, [120, 120])
+    for entity_id in entity_ids:
+        state = hass.states.get(entity_id)
+        hass.states.async_set(entity_id, "on", {**state.attributes, "color_temp": 370})
+    group = await fake_hass.async_add_group(hass, "Farbe", entity_ids)
+
+    await group.async_turn_on(color_temp_kelvin=3000)
+    await asyncio.sleep(CONFIRM_DELAY + 0.1)
+    await hass.async_block_till_done()
+    written = hass.states.get(group.entity_id)
+    await group.async_remove()
+    return written
+
+
+def test_bridge_echo_with_derived_attributes_is_written():
+    written = asyncio.run(_async_color_temp_echo())
+    assert written.state == "on"
+    assert written.attributes.get("hs_color") == DERIVED_COLOR["hs_color"]
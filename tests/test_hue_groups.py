@@ -0,0 +1,62 @@
+"""HueGroupIndex: Befehle gehen nur an Räume, die die Gruppe komplett abdeckt."""
+
+import asyncio
+
+import fake_hass
+
+from custom_components.light_group_dimmer.hue_groups import HueGroupIndex
+
+LAMPS = ["light.a", "light.b", "light.c", "light.d", "light.e"]
+
+
+def _room(hass, entity_id, members, bridge_lights=None):
+    hass.states.async_set(entity_id, "on", {
+        "is_hue_group": True,
+        "lights": bridge_lights if bridge_lights is not None else [m.split(".")[1] for m in members],
+        "entity_id": members,
+    })
+
+
+async def _async_offload(data, rooms):
+    hass = fake_hass.FakeHass()
+    for entity_id in LAMPS:
+        hass.states.async_set(entity_id, "on", {"brightness": 100})
+    for room in rooms:
+        _room(hass, *room)
+    index = HueGroupIndex(hass)
+    return index.offload(data), index.stats()
+
+
+def _offload(data, rooms):
+    return asyncio.run(_async_offload(data, rooms))
+
+
+def test_fully_covered_room_replaces_its_lamps():
+    data = {"entity_id": ["light.a", "light.b", "light.c"], "brightness": 80}
+    result, stats = _offload(data, [("light.raum", ["light.a", "light.b"])])
+    assert result == {"entity_id": ["light.raum", "light.c"], "brightness": 80}
+    assert stats["saved_lamp_calls"] == 1
+
+
+def test_partially_covered_room_is_not_used():
+    data = {"entity_id": ["light.a", "light.b"], "brightness": 80}
+    result, stats = _offload(data, [("light.raum", ["light.a", "light.b", "light.d"])])
+    assert result is data
+    assert stats["offloaded_calls"] == 0
+
+
+def test_largest_room_wins_and_rooms_do_not_overlap():
+    data = {"entity_id": LAMPS, "brightness": 80}
+    result, _ = _offload(data, [
+        ("light.zone", ["light.a", "light.b", "light.c"]),
+        ("light.raum", ["light.b", "light.c"]),
+        ("light.flur", ["light.d", "light.e"]),
+    ])
+    assert sorted(result["entity_id"]) == ["light.flur", "light.zone"]
+
+
+def test_room_with_lamp_unknown_to_home_assistant_is_not_used():
+    data = {"entity_id": ["light.a", "light.b"], "brightness": 80}
+    # Die Bridge kennt eine dritte Lampe, für die es keine HA-Entity gibt
+    result, _ = _offload(data, [("light.raum", ["light.a", "light.b"], ["a", "b", "Stehlampe"])])
+    assert result is data
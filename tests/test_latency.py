@@ -0,0 +1,62 @@
+"""LatencyTracker: gemessen wird der Befehl, den die Lampe tatsächlich meldet."""
+
+from types import SimpleNamespace
+
+from custom_components.light_group_dimmer import latency
+from custom_components.light_group_dimmer.latency import LatencyTracker
+
+
+def _on(brightness):
+    return SimpleNamespace(state="on", attributes={"brightness": brightness})
+
+
+def _turn_on(tracker, brightness, entity_ids=("light.a", "light.b")):
+    tracker.expect("gruppe", "turn_on", [
+        {"entity_id": entity_id, "brightness": brightness} for entity_id in entity_ids
+    ])
+
+
+def test_older_command_is_measured_when_newer_one_is_still_in_flight(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(latency.time, "monotonic", lambda: now[0])
+    tracker = LatencyTracker()
+    _turn_on(tracker, 100)
+    now[0] = 0.1
+    _turn_on(tracker, 150)
+
+    # Die Bridge meldet zuerst den alten Befehl (auf Prozent gerundet) ...
+    now[0] = 0.4
+    tracker.confirm("light.a", _on(99))
+    tracker.confirm("light.b", _on(102))
+    summary = tracker.group_summary("gruppe")
+    assert summary["samples"] == 1
+    assert summary["p50"] == 400.0
+
+    # ... und danach den neuen
+    now[0] = 0.6
+    tracker.confirm("light.a", _on(150))
+    tracker.confirm("light.b", _on(150))
+    summary = tracker.group_summary("gruppe")
+    assert summary["samples"] == 2
+    assert summary["unmeasured"] == 0
+    assert tracker.stats()["pending"] == 0
+
+
+def test_skipped_command_counts_as_unmeasured(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(latency.time, "monotonic", lambda: now[0])
+    tracker = LatencyTracker()
+    _turn_on(tracker, 100)
+    now[0] = 0.1
+    _turn_on(tracker, 150)
+
+    # light.a meldet nur noch den neuen Wert: der alte Gruppenbefehl ist überholt
+    now[0] = 0.5
+    tracker.confirm("light.a", _on(150))
+    tracker.confirm("light.b", _on(150))
+    summary = tracker.group_summary("gruppe", ("light.a",))
+    assert summary["samples"] == 1
+    assert summary["p50"] == 400.0
+    assert summary["unmeasured"] == 1
+    assert summary["lamps"]["light.a"]["samples"] == 1
+    assert tracker.superseded == 2
@@ -0,0 +1,68 @@
+"""OutboundLimiter: Kosten pro Bridge-Anfrage und Vorrang für turn_off."""
+
+import asyncio
+
+import fake_hass
+
+from custom_components.light_group_dimmer.ratelimit import (
+    PRIORITY_TURN_OFF,
+    PRIORITY_TURN_ON,
+    OutboundLimiter,
+)
+
+BACKEND = ("hue", "bridge_1")
+
+
+async def _async_priority_order():
+    limiter = OutboundLimiter({"hue": 50}, burst=1)
+    await limiter.async_acquire(BACKEND)  # Bucket leer
+    order = []
+
+    async def _acquire(name, priority):
+        await limiter.async_acquire(BACKEND, 1, priority)
+        order.append(name)
+
+    turn_on = asyncio.ensure_future(_acquire("turn_on", PRIORITY_TURN_ON))
+    await asyncio.sleep(0)
+    turn_off = asyncio.ensure_future(_acquire("turn_off", PRIORITY_TURN_OFF))
+    await asyncio.gather(turn_on, turn_off)
+    return order
+
+
+def test_turn_off_overtakes_waiting_turn_on():
+    assert asyncio.run(_async_priority_order()) == ["turn_off", "turn_on"]
+
+
+def test_unconfigured_backend_is_not_limited():
+    async def _run():
+        limiter = OutboundLimiter({})
+        for _ in range(100):
+            await limiter.async_acquire(BACKEND, 50)
+        return limiter.stats()
+
+    assert asyncio.run(_run()) == {}
+
+
+async def _async_tokens_for_offloaded_turn_off():
+    hass = fake_hass.FakeHass()
+    await fake_hass.async_setup_integration(hass, rate_limits={"hue": 1}, rate_burst=100)
+    fake_hass.register_instant_lights(hass)
+    entity_ids = fake_hass.add_lamps(hass, [120] * 5, platform=BACKEND)
+    room = entity_ids[:4]
+    hass.states.async_set("light.raum", "on", {
+        "is_hue_group": True, "lights": [e.split(".")[1] for e in room], "entity_id": room,
+    })
+    hass.entity_registry.register("light.raum", *BACKEND)
+    group = await fake_hass.async_add_group(hass, "Raum", entity_ids)
+
+    await group.async_turn_off()
+    await hass.async_block_till_done()
+    stats = hass.data["light_group_dimmer"]["limiter"].stats()["hue:bridge_1"]
+    await group.async_remove()
+    return stats
+
+
+def test_offloaded_room_costs_one_token():
+    stats = asyncio.run(_async_tokens_for_offloaded_turn_off())
+    # Raum + eine einzelne Lampe = zwei Bridge-Anfragen statt fünf
+    assert 97.9 <= stats["tokens"] <= 98.1
@@ -0,0 +1,60 @@
+"""SentStateTable: gesendete Werte gelten bis zu ihrer Bestätigung oder bis zum Ablauf."""
+
+from types import SimpleNamespace
+
+from custom_components.light_group_dimmer import dispatch
+from custom_components.light_group_dimmer.dispatch import SentStateTable
+
+
+def _on(entity_id, brightness):
+    return {"entity_id": entity_id, "brightness": brightness}
+
+
+def _state(brightness):
+    return SimpleNamespace(state="on", attributes={"brightness": brightness})
+
+
+def test_unconfirmed_value_is_suppressed_until_it_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(dispatch.time, "monotonic", lambda: now[0])
+    table = SentStateTable(ttl=30.0)
+    table.record("turn_on", [_on("light.a", 255)])
+    assert table.filter([_on("light.a", 255)]) == []
+    assert table.suppressed == 1
+
+    # Bridge hat den Befehl verworfen: nach Ablauf wird wieder gesendet
+    now[0] += 31.0
+    assert table.filter([_on("light.a", 255)]) == [_on("light.a", 255)]
+    assert table.expired == 1
+
+
+def test_confirmed_state_replaces_sent_value():
+    table = SentStateTable()
+    table.record("turn_on", [_on("light.a", 127)])
+    # Auf Prozent gerundete Bestätigung
+    table.confirm("light.a", _state(128))
+    assert table.stats()["unconfirmed"] == 0
+    assert table.filter([_on("light.a", 128)]) == []
+    assert table.filter([_on("light.a", 200)]) == [_on("light.a", 200)]
+
+
+def test_late_confirmation_of_older_command_keeps_newer_one():
+    table = SentStateTable()
+    table.record("turn_on", [_on("light.a", 150)])
+    table.record("turn_on", [_on("light.a", 200)])
+    # Die Bridge bestätigt 150 erst, nachdem 200 schon unterwegs ist
+    table.confirm("light.a", _state(150))
+    assert table.stats()["unconfirmed"] == 1
+    # Zurück auf 150 muss gesendet werden, sonst bleibt die Lampe auf 200
+    assert table.filter([_on("light.a", 150)]) == [_on("light.a", 150)]
+    table.confirm("light.a", _state(200))
+    assert table.stats()["unconfirmed"] == 0
+    assert table.filter([_on("light.a", 200)]) == []
+
+
+def test_failed_call_is_discarded():
+    table = SentStateTable()
+    sent_at = table.record("turn_on", [{"entity_id": ["light.a", "light.b"], "brightness": 90}])
+    table.discard([{"entity_id": ["light.a", "light.b"], "brightness": 90}], sent_at)
+    assert table.filter([_on("light.a", 90)]) == [_on("light.a", 90)]
+    assert table.stats()["unconfirmed"] == 0
@@ -0,0 +1,52 @@
+"""Bestätigung von Schatten-Zuständen durch die echten States der Lampen."""
+
+from types import SimpleNamespace
+
+from custom_components.light_group_dimmer import shadow
+from custom_components.light_group_dimmer.shadow import ShadowStates
+
+
+def _state(state="on", **attributes):
+    return SimpleNamespace(state=state, attributes=attributes)
+
+
+def test_rounded_brightness_confirms_shadow():
+    shadows = ShadowStates()
+    shadows.set("light.a", _state(brightness=40), {"brightness": 127})
+    # Hue meldet ganze Prozent: 127 -> 50 % -> 128
+    assert shadows.resolve("light.a", _state(brightness=128))
+    assert shadows.confirmed == 1
+
+
+def test_only_changed_attributes_are_compared():
+    shadows = ShadowStates()
+    shadows.set("light.a", _state(brightness=40, color_temp=300), {"brightness": 200})
+    # Die Bridge liefert zusätzlich abgeleitete Farbwerte mit
+    assert shadows.resolve("light.a", _state(brightness=201, color_temp=300, xy_color=[0.45, 0.41]))
+
+
+def test_different_value_supersedes_shadow():
+    shadows = ShadowStates()
+    shadows.set("light.a", _state(brightness=40), {"brightness": 200, "color_temp": 250})
+    assert not shadows.resolve("light.a", _state(brightness=190, color_temp=250))
+    shadows.set("light.a", _state(brightness=40), {"brightness": 200, "color_temp": 250})
+    assert not shadows.resolve("light.a", _state(brightness=200, color_temp=370))
+    shadows.set("light.a", _state(brightness=40), {"brightness": 200})
+    assert not shadows.resolve("light.a", _state("off"))
+    assert shadows.superseded == 3
+
+
+def test_next_expiry_follows_oldest_remaining_shadow(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(shadow.time, "monotonic", lambda: now[0])
+    shadows = ShadowStates(ttl=10.0)
+    assert shadows.next_expiry() is None
+    shadows.set("light.a", _state(brightness=40), {"brightness": 100})
+    now[0] = 6.0
+    shadows.set("light.b", _state(brightness=40), {"brightness": 100})
+    assert shadows.next_expiry() == 4.0
+
+    now[0] = 10.5
+    assert shadows.pop_expired() == ["light.a"]
+    # light.b läuft 10 s nach seinem Setzen ab, nicht 10 s nach diesem Lauf
+    assert shadows.next_expiry() == 5.5
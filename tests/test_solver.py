@@ -0,0 +1,134 @@
+"""Vergleich der Solver: scaling gegen die iterative Schleife."""
+
+import asyncio
+import logging
+import math
+import random
+
+import fake_hass
+
+from custom_components.light_group_dimmer.solver import MAX_BRIGHTNESS, active_brightnesses, solve_scaling
+
+# Zufällige kleine Gruppen (2–8 Lampen), bei denen der iterative Solver konvergiert
+CASES = 300
+# Große Gruppen: die Schleife schafft die Toleranz hier in 150 Iterationen nicht
+LARGE_GROUP_SIZES = (50, 100, 150, 200)
+LARGE_CASES = 8
+MAX_ITERATIONS = 150
+TOLERANCE = 0.01
+
+
+def _derived_bound(lamps, target):
+    """
+    Obere Schranke für den relativen Unterschied |iterativ - scaling| / scaling
+    je Lampe (beim Aufhellen bezogen auf den Abstand zu 255), oder None, wenn
+    die Herleitung nicht greift.
+
+    Herleitung (Abdunkeln; Aufhellen ist dasselbe mit u = 255 - v):
+    Durchlauf p verschiebt jede Lampe um v * d_p / S, d_p = T - M_p ist die
+    Mittelwert-Differenz zu Beginn des Durchlaufs und S die Summe der Lampen
+    zum Zeitpunkt ihrer Teilgruppe. Jede Lampe wird also mit einem Faktor
+    (1 + d_p / S) multipliziert, und S liegt zwischen S_p und S_p+1. Über alle
+    Durchläufe liegt jeder Gesamtfaktor K_i in [K_lo, K_hi] mit
+
+        log(K_hi / K_lo) <= sum_p |d_p| (1/S_p+1 - 1/S_p) / (1 - r)
+                         <= (M_0 - T)^2 / (n T M_0 (1 - r)),   r = (M_0 - T) / (n T)
+
+    (|d_p| <= |d_0|, die Summe teleskopiert, S_end = n T). scaling nutzt den
+    einen Faktor k = T / M_0, der bei Konvergenz ein gewichteter Mittelwert
+    der K_i ist, also ebenfalls in [K_lo, K_hi] liegt. Für r >= 1 kann ein
+    einzelner Schritt über das Ziel hinausschießen oder bei 0 abschneiden;
+    dann gilt die Abschätzung nicht. Die Schranke fällt mit 1/n.
+    """
+    active = active_brightnesses(lamps)
+    count = len(active)
+    start = sum(active.values()) / count
+    if target >= MAX_BRIGHTNESS:
+        return None
+    if target > start:
+        start, end = MAX_BRIGHTNESS - start, MAX_BRIGHTNESS - target - TOLERANCE
+    else:
+        end = target - TOLERANCE
+    if end <= 0:
+        return None
+    ratio = (start - end) / (count * end)
+    if ratio >= 1:
+        return None
+    return math.expm1((start - end) ** 2 / (count * end * start) / (1 - ratio))
+
+
+async def _async_compare(sizes, cases, seed, converged_only):
+    hass = fake_hass.FakeHass()
+    await fake_hass.async_setup_integration(hass)
+    entity_ids = fake_hass.add_lamps(hass, [128] * max(sizes))
+    group = await fake_hass.async_add_group(hass, "Solver", entity_ids)
+    rng = random.Random(seed)
+    results = []
+    while len(results) < cases:
+        count = rng.choice(sizes)
+        lamps = {entity_ids[index]: rng.randint(1, 255) for index in range(count)}
+        target = rng.randint(1, 254)
+        iterative = await group.adjust_brightness_until_match(dict(lamps), target)
+        iterations = group._last_solve_iterations
+        if converged_only and iterations >= MAX_ITERATIONS:
+            continue  # nicht konvergiert => kein Referenzwert
+        results.append((lamps, target, iterative, solve_scaling(lamps, target), iterations))
+    await group.async_remove()
+    hass.data[fake_hass.DOMAIN]["cache_expiry"].async_shutdown()
+    return results
+
+
+def _mean(result):
+    return sum(result.values()) / len(result)
+
+
+def _assert_order_kept(lamps, result):
+    ordered = sorted(lamps, key=lamps.get)
+    for darker, brighter in zip(ordered, ordered[1:]):
+        assert result[darker] <= result[brighter]
+
+
+def test_scaling_matches_iterative_within_derived_bound(caplog):
+    caplog.set_level(logging.ERROR)
+    results = asyncio.run(_async_compare(range(2, 9), CASES, seed=1, converged_only=True))
+
+    checked = 0
+    for lamps, target, iterative, scaling, _ in results:
+        assert iterative.keys() == scaling.keys() == lamps.keys()
+        # Beide treffen das Gruppenziel (bis auf die Rundung der Einzelwerte)
+        assert abs(_mean(iterative) - target) <= 1
+        assert abs(_mean(scaling) - target) <= 0.5
+        _assert_order_kept(lamps, scaling)
+
+        bound = _derived_bound(lamps, target)
+        if bound is None:
+            continue
+        checked += 1
+        dimming_up = target > _mean(lamps)
+        for lamp, value in scaling.items():
+            base = MAX_BRIGHTNESS - value if dimming_up else value
+            # +1: beide Ergebnisse werden unabhängig auf int gerundet
+            assert abs(iterative[lamp] - value) <= base * bound + 1
+    # Die Schranke soll den Großteil der Fälle abdecken, nicht nur Randfälle
+    assert checked >= CASES * 3 // 4
+
+
+def test_scaling_in_large_groups(caplog):
+    caplog.set_level(logging.ERROR)
+    results = asyncio.run(_async_compare(LARGE_GROUP_SIZES, LARGE_CASES, seed=2, converged_only=False))
+
+    assert any(iterations >= MAX_ITERATIONS for *_, iterations in results)
+    for lamps, target, iterative, scaling, _ in results:
+        assert scaling.keys() == lamps.keys()
+        assert abs(_mean(scaling) - target) <= 0.5
+        _assert_order_kept(lamps, scaling)
+        # Wo die Schleife abbricht, liegt scaling mindestens so nah am Ziel
+        assert abs(_mean(scaling) - target) <= abs(_mean(iterative) - target) + 0.5
+
+
+def test_scaling_keeps_order_of_lamps():
+    lamps = {"light.a": 23, "light.b": 132, "light.c": 0}
+    for target in (5, 60, 128, 217, 254):
+        result = solve_scaling(lamps, target)
+        assert "light.c" not in result
+        assert result["light.a"] <= result["light.b"]